@@ -18,14 +18,79 @@ def main():
         default='sequential',
         help='The type of pipeline to run (sequential or parallel)'
     )
+    parser.add_argument(
+        '--classification-mode',
+        type=str,
+        choices=['exhaustive', 'fast'],
+        default='exhaustive',
+        help='exhaustive: every label through NLI; fast: embedding shortlist, then NLI on the top labels'
+    )
+    parser.add_argument(
+        '--async-fetch',
+        action='store_true',
+        help='Fetch feeds and pages with the asyncio engine (per-host limits, token-bucket rate limiting)'
+    )
+    parser.add_argument(
+        '--execution',
+        type=str,
+        choices=['threads', 'processes'],
+        default='threads',
+        help='Parallel pipeline only: run inference in threads or in a pool of worker processes'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=None,
+        help='Worker processes for --execution processes (default: CPU cores // --torch-threads)'
+    )
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=4,
+        help='torch intra-op threads per worker process'
+    )
+    parser.add_argument(
+        '--inference-backend',
+        type=str,
+        choices=['pytorch', 'quantized', 'onnx'],
+        default='pytorch',
+        help='pytorch: checkpoint as published; quantized: int8 dynamic quantization (CPU); onnx: ONNX Runtime (CPU)'
+    )
+    parser.add_argument(
+        '--summary-mode',
+        type=str,
+        choices=['abstractive', 'tiered'],
+        default='abstractive',
+        help='abstractive: BART for every article; tiered: extractive for concise texts, compressed input for long ones'
+    )
+    parser.add_argument(
+        '--no-clustering',
+        action='store_true',
+        help='Run every article through the models instead of one per near-duplicate story cluster'
+    )
     args = parser.parse_args()
 
     logging.info(f"Starting DevPulse News Pipeline (type: {args.pipeline})...")
 
     if args.pipeline == 'sequential':
-        run_sequential_pipeline()
+        run_sequential_pipeline(
+            classification_mode=args.classification_mode,
+            async_fetch=args.async_fetch,
+            inference_backend=args.inference_backend,
+            summary_mode=args.summary_mode,
+            cluster_stories=not args.no_clustering
+        )
     else:
-        run_parallel_pipeline()
+        run_parallel_pipeline(
+            classification_mode=args.classification_mode,
+            async_fetch=args.async_fetch,
+            execution=args.execution,
+            num_processes=args.processes,
+            torch_threads=args.torch_threads,
+            inference_backend=args.inference_backend,
+            summary_mode=args.summary_mode,
+            cluster_stories=not args.no_clustering
+        )
 
     logging.info("DevPulse Pipeline finished successfully.")
 
@@ -7,9 +7,9 @@ This package contains:
 """
 
 from .agents import run_sequential_pipeline, run_parallel_pipeline, filter_articles_batch, summarize_articles_batch
-from .fetcher import Fetcher
+from .fetcher import Fetcher, AsyncFetcher
 from .db import init_db, save_articles_to_db
-from .models import load_summarizer, load_embeddings, load_zero_shot_classifier, load_models
+from .models import load_summarizer, load_embeddings, load_zero_shot_classifier, load_models, unload_models, model_stats
 
 __all__ = [
     "run_sequential_pipeline",
@@ -17,10 +17,13 @@ __all__ = [
     "filter_articles_batch",
     "summarize_articles_batch",
     "Fetcher",
+    "AsyncFetcher",
     "init_db",
     "save_articles_to_db",
     "load_summarizer",
     "load_embeddings",
     "load_zero_shot_classifier",
-    "load_models"
+    "load_models",
+    "unload_models",
+    "model_stats"
 ]
\ No newline at end of file
@@ -5,64 +5,142 @@ Orchestrates the news processing pipeline, offering both sequential and parallel
 
 import logging
 from ..fetcher.fetcher import Fetcher
+from ..fetcher.async_fetcher import AsyncFetcher
 from .filter import filter_articles_batch
-from .summarizer import summarize_articles_batch
-from ..db.db import init_db, save_articles_to_db
+from .summarizer import summarize_articles_batch, tier_report
+from .clustering import StoryClusterer
+from ..db.db import init_db, save_articles_to_db, get_article_writer
+from ..db.cache import get_inference_cache
+from ..db.dedup import SeenIndex
 from .parallel_pipeline import run_parallel_pipeline as run_parallel_pipeline_impl
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-def run_sequential_pipeline():
+def _finish_run(seen, stages, fetcher):
+    """Saves the processed-id index and logs how many articles were dropped at each stage."""
+    get_article_writer().on_saved = None
+    if seen is not None:
+        seen.save()
+    # Feeds with unsaved articles keep their old watermark and are read again next run
+    stages["feeds_held_back"] = len(fetcher.pending_polls())
+    logging.info("Stage report: %s", stages)
+
+
+def run_sequential_pipeline(
+    classification_mode: str = "exhaustive",
+    skip_known: bool = True,
+    async_fetch: bool = False,
+    inference_backend: str = None,
+    summary_mode: str = "abstractive",
+    cluster_stories: bool = True
+):
     """
     Runs the news processing pipeline sequentially.
-    1. Fetch news
-    2. Filter news by category
-    3. Summarize filtered news
-    4. Save to db
+    1. Fetch news (skipping articles processed in earlier runs)
+    2. Group near-duplicate stories (see clustering.py)
+    3. Filter news by category
+    4. Summarize filtered news
+    5. Save to db
     """
     logging.info("Starting SEQUENTIAL News Pipeline...")
 
     init_db()
+    seen = SeenIndex() if skip_known else None
+    fetcher = AsyncFetcher(known_ids=seen) if async_fetch else Fetcher(known_ids=seen)
+
+    # Articles count as processed only once saved; failures are retried next run
+    def on_saved(ids):
+        if seen is not None:
+            seen.add_many(ids)
+        fetcher.mark_processed(ids)
+    get_article_writer().on_saved = on_saved
 
     # 1. Fetch
-    fetcher = Fetcher()
     articles = fetcher.fetch(limit=30)
     logging.info("Fetched %d articles", len(articles))
+    stages = {
+        "feed_entries": fetcher.stats["entries"],
+        "skipped_known": fetcher.stats["skipped_known"],
+        "below_watermark": fetcher.stats["below_watermark"],
+        "feeds_not_due": fetcher.stats["feeds_not_due"],
+        "fetched": len(articles),
+    }
     
     if not articles:
         logging.info("No articles fetched. Pipeline finished.")
+        _finish_run(seen, stages, fetcher)
         return
 
-    # 2. Filter
-    filtered_articles = filter_articles_batch(articles, threshold=0.5)
+    # 2. Cluster: only one representative per story goes through the models
+    clusterer = StoryClusterer() if cluster_stories else None
+    representatives = clusterer.add_many(articles) if clusterer else articles
+    if clusterer:
+        stages["near_duplicates"] = len(articles) - len(representatives)
+        logging.info("Story clusters: %s", clusterer.stats())
+
+    # 3. Filter
+    filtered_articles = filter_articles_batch(representatives, mode=classification_mode,
+                                               backend=inference_backend)
     logging.info("%d articles after filtering", len(filtered_articles))
+    stages["rejected_by_filter"] = len(representatives) - len(filtered_articles)
+    # Rejections are final, for the held-back duplicates of a rejected story too
+    kept_ids = {a["id"] for a in filtered_articles}
+    rejected = [a["id"] for a in representatives if a["id"] not in kept_ids]
+    fetcher.mark_processed(rejected + (clusterer.member_ids(rejected) if clusterer else []))
 
     if not filtered_articles:
         logging.info("No articles passed the filter. Pipeline finished.")
+        _finish_run(seen, stages, fetcher)
         return
 
-    # 3. Summarize
-    summarized_articles = summarize_articles_batch(filtered_articles, max_length=150)
+    # 4. Summarize
+    summarized_articles = summarize_articles_batch(filtered_articles, max_length=150, backend=inference_backend,
+                                                   mode=summary_mode)
     logging.info("%d articles after summarization", len(summarized_articles))
+    if clusterer:
+        # Duplicates inherit their representative's categories and summary
+        summarized_articles = summarized_articles + clusterer.expand()
 
-    # 4. Save to DB
+    # 5. Save to DB
     if summarized_articles:
         save_articles_to_db(summarized_articles)
+    stages["saved"] = len(summarized_articles)
     
+    _finish_run(seen, stages, fetcher)
+    logging.info("Inference cache: %s", get_inference_cache().stats())
+    if summary_mode == "tiered":
+        logging.info("Tiered summarization: %s", tier_report())
     logging.info("SEQUENTIAL Pipeline finished successfully.")
 
 
 def run_parallel_pipeline(
     fetch_limit: int = 30,
     num_filter_workers: int = 5,
-    num_summarizer_workers: int = 2
+    num_summarizer_workers: int = 2,
+    filter_batch_size: int = 8,
+    summarizer_batch_size: int = 4,
+    max_batch_wait: float = 0.5,
+    classification_mode: str = "exhaustive",
+    skip_known: bool = True,
+    async_fetch: bool = False,
+    **kwargs
 ):
     """
     Runs the news processing pipeline in parallel using threads and queues.
+    Extra keyword arguments (queue sizes, metrics interval, execution, inference
+    backend, summary mode and story clustering) are passed through
+    to parallel_pipeline.run_parallel_pipeline.
     """
     run_parallel_pipeline_impl(
         fetch_limit=fetch_limit,
         num_filter_workers=num_filter_workers,
-        num_summarizer_workers=num_summarizer_workers
+        num_summarizer_workers=num_summarizer_workers,
+        filter_batch_size=filter_batch_size,
+        summarizer_batch_size=summarizer_batch_size,
+        max_batch_wait=max_batch_wait,
+        classification_mode=classification_mode,
+        skip_known=skip_known,
+        async_fetch=async_fetch,
+        **kwargs
     )
\ No newline at end of file
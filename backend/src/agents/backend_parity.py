@@ -0,0 +1,160 @@
+"""
+backend_parity.py
+Checks a quantized or ONNX Runtime backend against the fp32 PyTorch models on
+the same articles: label agreement for the classifier, ROUGE for the summarizer,
+and the speedup of each.
+
+Usage (from backend/):
+    python -m src.agents.backend_parity --backend quantized --limit 40
+    python -m src.agents.backend_parity --backend onnx --limit 40
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import time
+from typing import Dict, List
+
+from ..db.db import DB_PATH
+from ..models import load_summarizer, load_zero_shot_classifier
+from .filter import CANDIDATE_LABELS, _classify_texts, _select_labels
+from .summarizer import summarize_articles_batch
+
+logger = logging.getLogger(__name__)
+
+
+def load_sample(limit: int = 40, db_path: str = DB_PATH) -> List[Dict]:
+    """Most recent articles with text from the local DB."""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT id, title, text FROM articles WHERE text IS NOT NULL AND length(text) > 200 "
+            "ORDER BY published_ts DESC, id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{"id": r[0], "title": r[1], "text": r[2]} for r in rows]
+
+
+def _tokens(text: str) -> List[str]:
+    return [w.strip(".,;:!?\"'()[]").lower() for w in (text or "").split() if w.strip(".,;:!?\"'()[]")]
+
+
+def _f1(overlap: int, ref_len: int, hyp_len: int) -> float:
+    if not overlap or not ref_len or not hyp_len:
+        return 0.0
+    precision, recall = overlap / hyp_len, overlap / ref_len
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_1(reference: str, hypothesis: str) -> float:
+    """Unigram-overlap F1."""
+    ref, hyp = _tokens(reference), _tokens(hypothesis)
+    counts = {}
+    for w in ref:
+        counts[w] = counts.get(w, 0) + 1
+    overlap = 0
+    for w in hyp:
+        if counts.get(w, 0) > 0:
+            counts[w] -= 1
+            overlap += 1
+    return _f1(overlap, len(ref), len(hyp))
+
+
+def rouge_l(reference: str, hypothesis: str) -> float:
+    """Longest-common-subsequence F1."""
+    ref, hyp = _tokens(reference), _tokens(hypothesis)
+    prev = [0] * (len(hyp) + 1)
+    for r in ref:
+        cur = [0]
+        for j, h in enumerate(hyp):
+            cur.append(prev[j] + 1 if r == h else max(prev[j + 1], cur[j]))
+        prev = cur
+    return _f1(prev[-1], len(ref), len(hyp))
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def compare_backends(
+    articles,
+    backend: str = "quantized",
+    threshold: float = 0.5,
+    candidate_labels = CANDIDATE_LABELS,
+    max_length: int = 100,
+    min_length: int = 30
+) -> Dict:
+    """
+    Runs classification and summarization on fp32 PyTorch and on `backend`.
+    Models are loaded before timing and the inference cache is bypassed.
+
+    Args:
+        articles (list): Article dicts with 'text'. They are not modified.
+        backend (str): "quantized" or "onnx".
+        threshold (float): Acceptance threshold for the accepted-label comparison.
+        candidate_labels (list): Labels to classify against.
+        max_length (int): Max summary length.
+        min_length (int): Min summary length.
+
+    Returns:
+        dict: classifier label agreement, summary ROUGE-1/ROUGE-L and speedups
+    """
+    texts = [a.get("text", "")[:1000] for a in articles if len(a.get("text", "").strip()) > 50]
+    if not texts:
+        raise ValueError("No articles with enough text to compare")
+
+    report = {"articles": len(texts), "backend": backend}
+
+    # Classifier
+    for b in ("pytorch", backend):
+        load_zero_shot_classifier(backend=b)
+    base, base_s = _timed(_classify_texts, texts, candidate_labels, backend="pytorch")
+    ours, ours_s = _timed(_classify_texts, texts, candidate_labels, backend=backend)
+    top1 = sum(b["labels"][0] == o["labels"][0] for b, o in zip(base, ours))
+    accepted = sum(set(_select_labels(b, threshold)) == set(_select_labels(o, threshold)) for b, o in zip(base, ours))
+    max_delta = max(
+        abs(score - dict(zip(o["labels"], o["scores"]))[label])
+        for b, o in zip(base, ours) for label, score in zip(b["labels"], b["scores"])
+    )
+    report["classifier"] = {
+        "top1_agreement": round(top1 / len(texts), 3),
+        "accepted_agreement": round(accepted / len(texts), 3),
+        "max_score_delta": round(max_delta, 4),
+        "pytorch_s": round(base_s, 2),
+        f"{backend}_s": round(ours_s, 2),
+        "speedup": round(base_s / ours_s, 2) if ours_s else None,
+    }
+
+    # Summarizer
+    for b in ("pytorch", backend):
+        load_summarizer(backend=b)
+    runs = {}
+    for b in ("pytorch", backend):
+        copies = [dict(a) for a in articles]
+        runs[b] = _timed(summarize_articles_batch, copies, max_length=max_length, min_length=min_length,
+                         use_cache=False, backend=b)
+    (base, base_s), (ours, ours_s) = runs["pytorch"], runs[backend]
+    pairs = [(b["summary"], o["summary"]) for b, o in zip(base, ours) if b.get("summary")]
+    report["summarizer"] = {
+        "rouge1": round(sum(rouge_1(b, o) for b, o in pairs) / len(pairs), 3) if pairs else None,
+        "rougeL": round(sum(rouge_l(b, o) for b, o in pairs) / len(pairs), 3) if pairs else None,
+        "identical": round(sum(b == o for b, o in pairs) / len(pairs), 3) if pairs else None,
+        "pytorch_s": round(base_s, 2),
+        f"{backend}_s": round(ours_s, 2),
+        "speedup": round(base_s / ours_s, 2) if ours_s else None,
+    }
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Compare an inference backend against fp32 PyTorch")
+    parser.add_argument("--backend", choices=["quantized", "onnx"], default="quantized")
+    parser.add_argument("--limit", type=int, default=40, help="Articles to sample from the local DB")
+    args = parser.parse_args()
+
+    sample = load_sample(args.limit)
+    print(json.dumps(compare_backends(sample, backend=args.backend), indent=2))
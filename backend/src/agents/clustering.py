@@ -0,0 +1,155 @@
+"""
+clustering.py
+Groups near-duplicate articles (the same story from several feeds) into story
+clusters before inference, so only one representative per cluster is classified
+and summarized. Members inherit the representative's categories and summary.
+
+Articles are embedded with MiniLM (title + lead) and indexed with random-hyperplane
+LSH; candidates from the index are confirmed by exact cosine similarity.
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from ..models import load_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity of title+lead embeddings above which two articles are the same story
+STORY_SIMILARITY = 0.8
+LEAD_CHARS = 500
+
+# 16 tables of 6 hyperplanes: pairs at cosine 0.8 share a bucket in >99% of cases
+LSH_TABLES = 16
+LSH_BITS = 6
+
+
+class StoryClusterer:
+    """
+    Online leader clustering: each article joins the most similar existing
+    representative above `threshold`, or becomes the representative of a new cluster.
+
+    Every article gets a "cluster_id", the id of its cluster's representative.
+
+    Args:
+        threshold (float): Minimum cosine similarity to join a cluster.
+        num_tables (int): LSH hash tables.
+        num_bits (int): Hyperplanes per table.
+        seed (int): Seed for the hyperplanes.
+    """
+
+    def __init__(self, threshold: float = STORY_SIMILARITY, num_tables: int = LSH_TABLES,
+                 num_bits: int = LSH_BITS, seed: int = 0):
+        self.threshold = threshold
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self._rng = np.random.default_rng(seed)
+        self._planes = None  # (tables, bits, dim), created once the embedding size is known
+        self._buckets = [{} for _ in range(num_tables)]
+        self._vectors: List[np.ndarray] = []  # representative embeddings, by cluster index
+        self._reps: List[Dict] = []
+        self._members: List[List[Dict]] = []
+        self._by_id: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _story_text(article: Dict) -> str:
+        return f"{article.get('title') or ''}. {(article.get('text') or '')[:LEAD_CHARS]}"
+
+    def _embed(self, articles: List[Dict]) -> np.ndarray:
+        embedder = load_embeddings()
+        return embedder.encode([self._story_text(a) for a in articles], normalize_embeddings=True,
+                               convert_to_numpy=True, batch_size=32)
+
+    def _hash(self, vector: np.ndarray):
+        if self._planes is None:
+            self._planes = self._rng.standard_normal((self.num_tables, self.num_bits, vector.shape[0]))
+        bits = (self._planes @ vector) > 0
+        return (bits @ (1 << np.arange(self.num_bits))).tolist()
+
+    def _assign(self, article: Dict, vector: np.ndarray) -> bool:
+        keys = self._hash(vector)
+        candidates = set()
+        for table, key in zip(self._buckets, keys):
+            candidates.update(table.get(key, ()))
+
+        best, best_sim = None, self.threshold
+        for idx in candidates:
+            sim = float(self._vectors[idx] @ vector)
+            if sim >= best_sim:
+                best, best_sim = idx, sim
+
+        if best is not None:
+            article["cluster_id"] = self._reps[best]["id"]
+            self._members[best].append(article)
+            return False
+
+        idx = len(self._reps)
+        article["cluster_id"] = article["id"]
+        self._vectors.append(vector)
+        self._reps.append(article)
+        self._members.append([])
+        self._by_id[article["id"]] = idx
+        for table, key in zip(self._buckets, keys):
+            table.setdefault(key, []).append(idx)
+        return True
+
+    def add(self, article: Dict) -> bool:
+        """Clusters one article. Returns True if it is a new representative (send it to the models)."""
+        vector = self._embed([article])[0]
+        with self._lock:
+            return self._assign(article, vector)
+
+    def add_many(self, articles: List[Dict]) -> List[Dict]:
+        """Clusters a batch of articles. Returns the new representatives, in input order."""
+        if not articles:
+            return []
+        vectors = self._embed(articles)
+        with self._lock:
+            return [a for a, v in zip(articles, vectors) if self._assign(a, v)]
+
+    def record_results(self, articles: List[Dict]):
+        """
+        Copies inference results back onto the stored representatives.
+        Needed when representatives were processed as copies (e.g. in other processes).
+        """
+        with self._lock:
+            for art in articles:
+                idx = self._by_id.get(art.get("id"))
+                if idx is not None:
+                    self._reps[idx].update(categories=art.get("categories"), summary=art.get("summary"))
+
+    def expand(self) -> List[Dict]:
+        """
+        Members of clusters whose representative passed the filter and was summarized,
+        with the representative's categories and summary. Call after inference finishes.
+        """
+        expanded = []
+        with self._lock:
+            for rep, members in zip(self._reps, self._members):
+                if not members or not rep.get("categories") or not rep.get("summary"):
+                    continue
+                for member in members:
+                    member["categories"] = list(rep["categories"])
+                    member["summary"] = rep["summary"]
+                    expanded.append(member)
+        return expanded
+
+    def member_ids(self, rep_ids) -> List[str]:
+        """Ids of the duplicates held back under the given representatives."""
+        with self._lock:
+            return [m["id"] for rep_id in rep_ids if rep_id in self._by_id
+                    for m in self._members[self._by_id[rep_id]]]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            duplicates = sum(len(m) for m in self._members)
+            return {
+                "articles": len(self._reps) + duplicates,
+                "clusters": len(self._reps),
+                "duplicates": duplicates,
+                "largest_cluster": max((len(m) + 1 for m in self._members), default=0),
+            }
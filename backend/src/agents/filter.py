@@ -6,9 +6,11 @@ Output : same list with 'categories' field populated
 """
 
 # from transformers import pipeline
-from ..models import load_zero_shot_classifier
+from ..models import load_zero_shot_classifier, load_embeddings, backend_model_id, CLASSIFIER_MODEL_ID
+from ..db.cache import get_inference_cache, make_cache_key
 import logging
 import threading
+import time
 
 # Initialse looging
 logger = logging.getLogger(__name__)
@@ -52,22 +54,164 @@ CANDIDATE_LABELS = [
 ]
 
 
-def filter_articles_batch(articles, threshold: float = 0.5, candidate_labels = CANDIDATE_LABELS, batch_size: int = 8):
+# Default acceptance thresholds. The scores differ per mode: "exhaustive"
+# softmaxes entailment over the whole label set, while "fast" scores each
+# shortlisted label on its own (multi_label), so a label's score does not
+# depend on which other labels made the shortlist. Independent entailment
+# probabilities run higher, hence the stricter cut-off; retune it against
+# compare_classification_modes()' accepted_agreement.
+MODE_THRESHOLDS = {"exhaustive": 0.5, "fast": 0.8}
+
+
+def default_threshold(mode: str) -> float:
+    if mode not in MODE_THRESHOLDS:
+        raise ValueError(f"Invalid classification mode: {mode}. Use 'exhaustive' or 'fast'.")
+    return MODE_THRESHOLDS[mode]
+
+
+# Same template the zero-shot pipeline uses, so the embedding pass
+# compares articles against the hypotheses NLI will actually see
+HYPOTHESIS_TEMPLATE = "This example is {}."
+
+# Label hypotheses encoded once per label set
+_label_embeddings = {}
+_label_embeddings_lock = threading.Lock()
+
+
+def _get_label_embeddings(embedder, candidate_labels):
+    """Returns normalized embeddings of the label hypotheses, encoding them on first use."""
+    key = tuple(candidate_labels)
+    with _label_embeddings_lock:
+        if key not in _label_embeddings:
+            hypotheses = [HYPOTHESIS_TEMPLATE.format(label) for label in candidate_labels]
+            _label_embeddings[key] = embedder.encode(
+                hypotheses, normalize_embeddings=True, convert_to_numpy=True
+            )
+        return _label_embeddings[key]
+
+
+def shortlist_labels(texts, candidate_labels = CANDIDATE_LABELS, top_k: int = 5):
+    """
+    Ranks labels for each text by MiniLM cosine similarity and keeps the top_k.
+
+    Args:
+        texts (list): Article texts.
+        candidate_labels (list): Full label set.
+        top_k (int): Labels kept per text.
+
+    Returns:
+        list: one list of labels per text, most similar first
+    """
+    import numpy as np
+
+    embedder = load_embeddings()
+    label_emb = _get_label_embeddings(embedder, candidate_labels)
+    text_emb = embedder.encode(texts, normalize_embeddings=True, convert_to_numpy=True, batch_size=32)
+    sims = text_emb @ label_emb.T
+    top_k = min(top_k, len(candidate_labels))
+    top = np.argsort(-sims, axis=1)[:, :top_k]
+    return [[candidate_labels[j] for j in row] for row in top]
+
+
+def _classify_texts(texts, candidate_labels, mode: str = "exhaustive", top_k: int = 5, backend: str = None):
+    """
+    Runs zero-shot classification and returns one {"labels", "scores"} result per text.
+
+    "exhaustive" scores every text against every label. "fast" first shortlists
+    top_k labels per text with embeddings, then scores the whole batch in one
+    classifier call over the union of the shortlists, each label independently
+    (multi_label, see MODE_THRESHOLDS), and keeps only each text's own shortlist.
+    """
+    classifier = load_zero_shot_classifier(backend=backend)
+    if mode == "exhaustive":
+        with _classifier_lock:
+            results = classifier(texts, candidate_labels=candidate_labels)
+        return results if isinstance(results, list) else [results]
+
+    if mode != "fast":
+        raise ValueError(f"Invalid classification mode: {mode}. Use 'exhaustive' or 'fast'.")
+
+    shortlists = shortlist_labels(texts, candidate_labels, top_k)
+    union = [label for label in candidate_labels if any(label in labels for labels in shortlists)]
+    with _classifier_lock:
+        batch_results = classifier(texts, candidate_labels=union, multi_label=True)
+    if not isinstance(batch_results, list):
+        batch_results = [batch_results]
+
+    results = []
+    for labels, result in zip(shortlists, batch_results):
+        # multi_label scores don't depend on the other labels, so dropping some is exact
+        keep = set(labels)
+        pairs = [(label, score) for label, score in zip(result["labels"], result["scores"]) if label in keep]
+        results.append({"labels": [l for l, _ in pairs], "scores": [sc for _, sc in pairs]})
+    return results
+
+
+def _classify_with_cache(texts, candidate_labels, mode: str, top_k: int, use_cache: bool = True, backend: str = None):
+    """
+    Same as _classify_texts, but reuses category scores from the inference cache
+    and only sends uncached texts to the model. The threshold is applied to the
+    cached scores afterwards, so it is not part of the key.
+    """
+    if not use_cache:
+        return _classify_texts(texts, candidate_labels, mode=mode, top_k=top_k, backend=backend)
+
+    cache = get_inference_cache()
+    params = {"candidate_labels": list(candidate_labels), "mode": mode, "top_k": top_k if mode == "fast" else None}
+    if mode == "fast":
+        params["multi_label"] = True
+    model_id = backend_model_id(CLASSIFIER_MODEL_ID, backend)
+    keys = [make_cache_key("classification", text, model_id, params) for text in texts]
+    cached = cache.get_many("classification", keys)
+
+    results = [cached.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        fresh = _classify_texts([texts[i] for i in missing], candidate_labels, mode=mode, top_k=top_k, backend=backend)
+        to_store = {}
+        for i, result in zip(missing, fresh):
+            results[i] = {"labels": list(result["labels"]), "scores": [float(s) for s in result["scores"]]}
+            to_store[keys[i]] = results[i]
+        cache.put_many("classification", to_store)
+    return results
+
+
+def _select_labels(result, threshold: float):
+    return [
+        label for label, score in zip(result["labels"], result["scores"])
+        if score >= threshold
+    ]
+
+
+def filter_articles_batch(
+    articles,
+    threshold: float = None,
+    candidate_labels = CANDIDATE_LABELS,
+    batch_size: int = 8,
+    mode: str = "exhaustive",
+    top_k: int = 5,
+    use_cache: bool = True,
+    backend: str = None
+):
     """
     Filters a batch of articles and assigns categories using batch processing for better performance.
 
     Args:
         articles (list): List of articles dicts (should have 'text' field)
-        threshold (float): Minimum confidence to accept a category.
+        threshold (float): Minimum confidence to accept a category (default: MODE_THRESHOLDS[mode])
         candidate_labels(list): category labels to classify against
         batch_size (int): Number of articles to process in each batch
-    
+        mode (str): "exhaustive" (every label through NLI) or "fast" (embedding shortlist, then NLI)
+        top_k (int): Labels per article sent to NLI in "fast" mode
+        use_cache (bool): Reuse cached category scores for articles seen before
+        backend (str): Inference backend, None/"pytorch", "quantized" or "onnx" (see models.py)
+
     Returns 
         List: filtered articles with 'categories' field populated 
     """
-    
-    classifier = load_zero_shot_classifier()
-    logger.info("Filtering %d articles using zero-shot classifier (batch_size=%d)...", len(articles), batch_size)
+    if threshold is None:
+        threshold = default_threshold(mode)
+    logger.info("Filtering %d articles using zero-shot classifier (batch_size=%d, mode=%s)...", len(articles), batch_size, mode)
     
     filtered_articles = []
     
@@ -90,21 +234,12 @@ def filter_articles_batch(articles, threshold: float = 0.5, candidate_labels = C
         try:
             # Process batch at once for GPU efficiency
             # The pipeline will handle batching internally
-            with _classifier_lock:
-                # Process all texts in the batch at once
-                results = classifier(texts, candidate_labels=candidate_labels)
-            
-            # Handle both single result and batch results
-            if not isinstance(results, list):
-                results = [results]
+            results = _classify_with_cache(texts, candidate_labels, mode, top_k, use_cache=use_cache, backend=backend)
             
             # Process results
             for result, art in zip(results, batch_articles):
                 try:
-                    selected_labels = [
-                        label for label, score in zip(result["labels"], result["scores"])
-                        if score >= threshold
-                    ]
+                    selected_labels = _select_labels(result, threshold)
                     art["categories"] = selected_labels
                     
                     if selected_labels:
@@ -118,11 +253,8 @@ def filter_articles_batch(articles, threshold: float = 0.5, candidate_labels = C
             for art in batch_articles:
                 try:
                     text = art.get("text", "")[:1000]
-                    result = classifier(text, candidate_labels=candidate_labels)
-                    selected_labels = [
-                        label for label, score in zip(result["labels"], result["scores"])
-                        if score >= threshold
-                    ]
+                    result = _classify_with_cache([text], candidate_labels, mode, top_k, use_cache=use_cache, backend=backend)[0]
+                    selected_labels = _select_labels(result, threshold)
                     art["categories"] = selected_labels
                     if selected_labels:
                         filtered_articles.append(art)
@@ -131,5 +263,55 @@ def filter_articles_batch(articles, threshold: float = 0.5, candidate_labels = C
             
     logger.info("Filtering complete. %d articles passed threshold %.2f", len(filtered_articles), threshold)
     return filtered_articles
-    
-    
\ No newline at end of file
+
+
+def compare_classification_modes(articles, threshold: float = None, candidate_labels = CANDIDATE_LABELS, top_k: int = 5):
+    """
+    Runs "exhaustive" and "fast" classification on the same articles and reports
+    how closely the fast mode tracks the exhaustive one and how much faster it is.
+
+    Args:
+        articles (list): Article dicts with 'text'. They are not modified.
+        threshold (float): Acceptance threshold for both modes in the accepted-label
+            comparison. By default each mode uses its own (MODE_THRESHOLDS), as in production.
+        candidate_labels (list): Labels to classify against.
+        top_k (int): Shortlist size for the fast mode.
+
+    Returns:
+        dict: top-1 agreement, accepted-label agreement, shortlist recall and timings
+    """
+    texts = [a.get("text", "")[:1000] for a in articles if len(a.get("text", "").strip()) > 50]
+    if not texts:
+        return {"articles": 0}
+
+    start = time.perf_counter()
+    exhaustive = _classify_texts(texts, candidate_labels, mode="exhaustive")
+    exhaustive_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = _classify_texts(texts, candidate_labels, mode="fast", top_k=top_k)
+    fast_s = time.perf_counter() - start
+
+    top1 = sum(e["labels"][0] == f["labels"][0] for e, f in zip(exhaustive, fast))
+    exhaustive_threshold = threshold if threshold is not None else default_threshold("exhaustive")
+    fast_threshold = threshold if threshold is not None else default_threshold("fast")
+    same_accepted = sum(
+        set(_select_labels(e, exhaustive_threshold)) == set(_select_labels(f, fast_threshold))
+        for e, f in zip(exhaustive, fast)
+    )
+    # How often the exhaustive winner survived the embedding shortlist
+    shortlist_recall = sum(e["labels"][0] in f["labels"] for e, f in zip(exhaustive, fast))
+
+    report = {
+        "articles": len(texts),
+        "top_k": top_k,
+        "thresholds": {"exhaustive": exhaustive_threshold, "fast": fast_threshold},
+        "top1_agreement": round(top1 / len(texts), 3),
+        "accepted_agreement": round(same_accepted / len(texts), 3),
+        "shortlist_recall": round(shortlist_recall / len(texts), 3),
+        "exhaustive_s": round(exhaustive_s, 2),
+        "fast_s": round(fast_s, 2),
+        "speedup": round(exhaustive_s / fast_s, 2) if fast_s else None,
+    }
+    logger.info("Classification mode comparison: %s", report)
+    return report
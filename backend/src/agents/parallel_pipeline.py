@@ -4,130 +4,563 @@ Orchestrates a parallel news processing pipeline using queues and threads.
 """
 
 import logging
+import time
+from collections import Counter
 from queue import Queue, Empty
-from threading import Thread
-from typing import List, Dict, Optional
+from threading import Thread, Lock, Event, current_thread
+from typing import Callable, List, Dict, Optional
 
 from ..fetcher.fetcher import Fetcher
+from ..fetcher.async_fetcher import AsyncFetcher
 from .filter import filter_articles_batch
-from .summarizer import summarize_articles_batch
-from ..db.db import init_db, save_articles_to_db
+from .summarizer import summarize_articles_batch, tier_report
+from .clustering import StoryClusterer
+from ..db.db import init_db, save_articles_to_db, get_article_writer
+from ..db.cache import get_inference_cache
+from ..db.dedup import SeenIndex
+from ..models import model_stats
+from .process_pool import run_process_pipeline
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(threadName)s - %(message)s')
 
 # Sentinel value to signal the end of the queue
 STOP_SIGNAL = object()
 
-def fetcher_worker(fetch_queue: Queue, limit: int = 10):
+def fetcher_worker(
+    fetch_queue: Queue,
+    limit: int = 10,
+    seen: Optional[SeenIndex] = None,
+    stages: Optional[Dict] = None,
+    async_fetch: bool = False,
+    num_consumers: int = 1,
+    metrics: Optional["StageMetrics"] = None,
+    clusterer: Optional[StoryClusterer] = None,
+    fetcher=None
+):
     """
-    Worker to fetch articles and put them into a queue.
+    Worker to stream articles into a queue as soon as each one is fetched,
+    so filtering overlaps with network I/O. Blocks when the queue is full.
+    Articles whose ids are already in `seen` are skipped before content extraction
+    (ids are added to it by the DB writer once an article is saved).
+    With a clusterer, near-duplicates of an earlier article are held back and only
+    cluster representatives are queued.
+    Pass `fetcher` to report processed articles to it (see Fetcher.mark_processed).
+    Puts one STOP_SIGNAL per consumer when done.
     """
     logging.info("Fetcher worker started.")
-    fetcher = Fetcher()
-    articles = fetcher.fetch(limit=limit, parallel=True)
-    for article in articles:
-        fetch_queue.put(article)
-    fetch_queue.put(STOP_SIGNAL)  # Signal that fetching is done
-    logging.info(f"Fetcher worker finished. Fetched {len(articles)} articles.")
+    metrics = metrics or StageMetrics("fetch")
+    metrics.worker_started()
+    if fetcher is None:
+        fetcher = AsyncFetcher(known_ids=seen) if async_fetch else Fetcher(known_ids=seen)
+    start = time.perf_counter()
+    count = 0
+    try:
+        for article in fetcher.iter_fetch(limit=limit, parallel=True):
+            if count == 0:
+                logging.info(f"First article fetched after {time.perf_counter() - start:.2f}s.")
+            count += 1
+            if clusterer is not None and not clusterer.add(article):
+                continue
+            metrics.timed_put(fetch_queue, article)
+            metrics.add_items(1)
+    except Exception as e:
+        logging.error(f"Error in fetcher worker: {e}")
+    finally:
+        # Everything that wasn't spent blocked on a full queue was fetching
+        metrics.add_busy(time.perf_counter() - start - metrics.wait[current_thread().name])
+        metrics.worker_done()
+        for _ in range(num_consumers):
+            fetch_queue.put(STOP_SIGNAL)  # Signal that fetching is done
+    if stages is not None:
+        stages["feed_entries"] = fetcher.stats["entries"]
+        stages["skipped_known"] = fetcher.stats["skipped_known"]
+        stages["below_watermark"] = fetcher.stats["below_watermark"]
+        stages["feeds_not_due"] = fetcher.stats["feeds_not_due"]
+        stages["fetched"] = count
+    logging.info(f"Fetcher worker finished. Fetched {count} articles in {time.perf_counter() - start:.1f}s.")
 
-def filter_worker(fetch_queue: Queue, summarize_queue: Queue, threshold: float = 0.5):
+class StageMetrics:
     """
-    Worker to filter articles from a queue and put them into another queue.
+    Thread-safe per-stage counters: items processed, busy and wait time per worker,
+    and samples of the stage's input queue depth.
+
+    Also acts as a countdown of the stage's running workers, so that only the last
+    worker to finish passes STOP_SIGNALs downstream.
     """
-    logging.info("Filter worker started.")
-    while True:
-        try:
-            # Use a timeout to avoid blocking indefinitely
-            article = fetch_queue.get(timeout=1)
-            if article is STOP_SIGNAL:
-                summarize_queue.put(STOP_SIGNAL)  # Pass the signal on
-                break
 
-            # We process one article at a time here, but the batching is in the function
-            filtered_articles = filter_articles_batch([article], threshold=threshold)
-            if filtered_articles:
-                summarize_queue.put(filtered_articles[0])
+    def __init__(self, stage: str, queue: Optional[Queue] = None, workers: int = 1):
+        self.stage = stage
+        self.queue = queue
+        self.workers = workers
+        self.items = 0
+        self.busy = Counter()
+        self.wait = Counter()
+        self.depth_samples = []
+        self._running = workers
+        self._started = None
+        self._finished = None
+        self._lock = Lock()
+
+    def worker_started(self):
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+
+    def worker_done(self) -> bool:
+        """Marks one worker finished. Returns True for the last one."""
+        with self._lock:
+            self._running -= 1
+            if self._running == 0:
+                self._finished = time.monotonic()
+                return True
+            return False
+
+    def add_items(self, n: int):
+        with self._lock:
+            self.items += n
+
+    def add_busy(self, seconds: float):
+        with self._lock:
+            self.busy[current_thread().name] += seconds
+
+    def add_wait(self, seconds: float):
+        with self._lock:
+            self.wait[current_thread().name] += seconds
+
+    def timed_put(self, queue: Queue, item):
+        """Blocking put; time spent waiting for space counts as wait time (backpressure)."""
+        start = time.perf_counter()
+        queue.put(item)
+        self.add_wait(time.perf_counter() - start)
+
+    def sample(self):
+        if self.queue is not None:
+            with self._lock:
+                self.depth_samples.append(self.queue.qsize())
+
+    def summary(self) -> Dict:
+        with self._lock:
+            end = self._finished or time.monotonic()
+            elapsed = end - self._started if self._started else 0.0
+            busy = sum(self.busy.values())
+            wait = sum(self.wait.values())
+            summary = {
+                "stage": self.stage,
+                "workers": self.workers,
+                "items": self.items,
+                "elapsed_s": round(elapsed, 2),
+                "items_per_s": round(self.items / elapsed, 2) if elapsed else None,
+                "busy_s": round(busy, 2),
+                "wait_s": round(wait, 2),
+                "utilization": round(busy / (busy + wait), 3) if busy + wait else None,
+                "per_worker": {
+                    name: {"busy_s": round(self.busy[name], 2), "wait_s": round(self.wait[name], 2)}
+                    for name in sorted(set(self.busy) | set(self.wait))
+                },
+            }
+            if self.queue is not None:
+                samples = self.depth_samples or [self.queue.qsize()]
+                summary["queue"] = {
+                    "capacity": self.queue.maxsize,
+                    "depth_max": max(samples),
+                    "depth_mean": round(sum(samples) / len(samples), 1),
+                }
+        return summary
+
+
+class MetricsSampler(Thread):
+    """
+    Background thread that samples queue depths every `interval` seconds and logs
+    a one-line snapshot of every stage.
+    """
+
+    def __init__(self, metrics: List[StageMetrics], interval: float = 10.0):
+        super().__init__(name="Metrics", daemon=True)
+        self.metrics = metrics
+        self.interval = interval
+        self._stop_event = Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            snapshot = []
+            for m in self.metrics:
+                m.sample()
+                depth = m.queue.qsize() if m.queue is not None else "-"
+                snapshot.append(f"{m.stage}: queue={depth} items={m.items}")
+            logging.info("Pipeline metrics | " + " | ".join(snapshot))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class BatchStats:
+    """
+    Thread-safe record of the batches a stage sent to its model.
+    Keeps a batch-size histogram and per-batch latencies for throughput/latency tuning.
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.histogram = Counter()
+        self.latencies = []
+        self.dropped = 0
+        self._lock = Lock()
+
+    def record(self, size: int, seconds: float, dropped: int = 0):
+        with self._lock:
+            self.histogram[size] += 1
+            self.latencies.append(seconds)
+            self.dropped += dropped
+
+    def summary(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            histogram = dict(sorted(self.histogram.items()))
+        if not latencies:
+            return {"stage": self.stage, "batches": 0}
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        items = sum(size * count for size, count in histogram.items())
+        return {
+            "stage": self.stage,
+            "batches": len(latencies),
+            "items": items,
+            "mean_batch_size": round(items / len(latencies), 2),
+            "batch_size_histogram": histogram,
+            "latency_p50_s": pct(0.50),
+            "latency_p95_s": pct(0.95),
+            "latency_max_s": round(latencies[-1], 3),
+            "items_per_s": round(items / sum(latencies), 2) if sum(latencies) else None,
+        }
+
+    def log(self):
+        logging.info(f"Batch stats: {self.summary()}")
+
+
+def collect_batch(queue: Queue, max_batch_size: int, max_wait: float, poll_timeout: Optional[float] = None):
+    """
+    Drains up to max_batch_size items from a queue.
+
+    Blocks (indefinitely unless poll_timeout is given) for the first item, then keeps
+    taking items until the batch is full or max_wait seconds have passed since the
+    first one arrived.
+
+    Returns:
+        tuple: (list of items, True if STOP_SIGNAL was seen)
+    """
+    batch = []
+    try:
+        item = queue.get(timeout=poll_timeout)
+    except Empty:
+        return batch, False
+    if item is STOP_SIGNAL:
+        return batch, True
+    batch.append(item)
+
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_batch_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = queue.get(timeout=remaining)
         except Empty:
-            continue
-        except Exception as e:
-            logging.error(f"Error in filter worker: {e}")
+            break
+        if item is STOP_SIGNAL:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+def filter_worker(
+    fetch_queue: Queue,
+    summarize_queue: Queue,
+    threshold: Optional[float] = None,
+    batch_size: int = 8,
+    max_wait: float = 0.5,
+    stats: Optional[BatchStats] = None,
+    mode: str = "exhaustive",
+    metrics: Optional[StageMetrics] = None,
+    num_consumers: int = 1,
+    backend: Optional[str] = None,
+    on_rejected: Optional[Callable[[List[str]], None]] = None
+):
+    """
+    Worker to filter articles from a queue in micro-batches and put them into another queue.
+    `on_rejected` is called with the ids of each batch's articles that didn't pass.
+    Exits on its own STOP_SIGNAL; the last filter worker to exit puts one STOP_SIGNAL per consumer.
+    """
+    logging.info("Filter worker started.")
+    metrics = metrics or StageMetrics("filter")
+    metrics.worker_started()
+    while True:
+        start = time.perf_counter()
+        batch, stop = collect_batch(fetch_queue, batch_size, max_wait)
+        metrics.add_wait(time.perf_counter() - start)
+        if batch:
+            try:
+                start = time.perf_counter()
+                filtered_articles = filter_articles_batch(batch, threshold=threshold, batch_size=len(batch), mode=mode,
+                                                          backend=backend)
+                elapsed = time.perf_counter() - start
+                metrics.add_busy(elapsed)
+                metrics.add_items(len(batch))
+                if stats:
+                    stats.record(len(batch), elapsed, dropped=len(batch) - len(filtered_articles))
+                if on_rejected is not None:
+                    kept_ids = {a["id"] for a in filtered_articles}
+                    on_rejected([a["id"] for a in batch if a["id"] not in kept_ids])
+                for article in filtered_articles:
+                    metrics.timed_put(summarize_queue, article)
+            except Exception as e:
+                logging.error(f"Error in filter worker: {e}")
+        if stop:
+            break
+    if metrics.worker_done():
+        for _ in range(num_consumers):
+            summarize_queue.put(STOP_SIGNAL)  # Pass the signal on
     logging.info("Filter worker finished.")
 
-def summarizer_worker(summarize_queue: Queue, db_queue: Queue, max_length: int = 150):
+def summarizer_worker(
+    summarize_queue: Queue,
+    db_queue: Queue,
+    max_length: int = 150,
+    batch_size: int = 4,
+    max_wait: float = 1.0,
+    stats: Optional[BatchStats] = None,
+    metrics: Optional[StageMetrics] = None,
+    backend: Optional[str] = None,
+    summary_mode: str = "abstractive"
+):
     """
-    Worker to summarize articles from a queue and put them into another queue.
+    Worker to summarize articles from a queue in micro-batches and put them into another queue.
+    Exits on its own STOP_SIGNAL; the last summarizer to exit passes one STOP_SIGNAL to the DB writer.
     """
     logging.info("Summarizer worker started.")
+    metrics = metrics or StageMetrics("summarizer")
+    metrics.worker_started()
     while True:
-        try:
-            article = summarize_queue.get(timeout=1)
-            if article is STOP_SIGNAL:
-                db_queue.put(STOP_SIGNAL)  # Pass the signal on
-                break
-            
-            summarized_articles = summarize_articles_batch([article], max_length=max_length)
-            if summarized_articles:
-                db_queue.put(summarized_articles[0])
-        except Empty:
-            continue
-        except Exception as e:
-            logging.error(f"Error in summarizer worker: {e}")
+        start = time.perf_counter()
+        batch, stop = collect_batch(summarize_queue, batch_size, max_wait)
+        metrics.add_wait(time.perf_counter() - start)
+        if batch:
+            try:
+                start = time.perf_counter()
+                summarized_articles = summarize_articles_batch(batch, max_length=max_length, backend=backend,
+                                                               mode=summary_mode)
+                elapsed = time.perf_counter() - start
+                metrics.add_busy(elapsed)
+                metrics.add_items(len(batch))
+                if stats:
+                    stats.record(len(batch), elapsed)
+                for article in summarized_articles:
+                    metrics.timed_put(db_queue, article)
+            except Exception as e:
+                logging.error(f"Error in summarizer worker: {e}")
+        if stop:
+            break
+    if metrics.worker_done():
+        db_queue.put(STOP_SIGNAL)  # Pass the signal on
     logging.info("Summarizer worker finished.")
 
-def db_writer_worker(db_queue: Queue):
+def db_writer_worker(
+    db_queue: Queue,
+    stages: Optional[Dict] = None,
+    metrics: Optional[StageMetrics] = None,
+    flush_every: int = 50,
+    flush_interval: float = 5.0
+):
     """
-    Worker to save all articles from a queue to the database in a single batch at the end.
+    Worker to save articles from a queue to the database as they arrive.
+    Articles are flushed every `flush_every` articles or `flush_interval` seconds,
+    so results are durable mid-run; the rest is flushed on STOP_SIGNAL.
     """
     logging.info("DB writer worker started.")
-    articles_to_save = []
+    metrics = metrics or StageMetrics("db_writer")
+    metrics.worker_started()
+    writer = get_article_writer()
+    writer.flush_every = flush_every
+    writer.flush_interval = flush_interval
+    saved = 0
     while True:
         try:
-            article = db_queue.get(timeout=1)
+            start = time.perf_counter()
+            try:
+                article = db_queue.get(timeout=flush_interval)
+            except Empty:
+                # Idle: don't let a partial buffer wait for the next article
+                metrics.add_wait(time.perf_counter() - start)
+                start = time.perf_counter()
+                writer.flush_if_due()
+                metrics.add_busy(time.perf_counter() - start)
+                continue
+            metrics.add_wait(time.perf_counter() - start)
+            start = time.perf_counter()
             if article is STOP_SIGNAL:
-                if articles_to_save:
-                    save_articles_to_db(articles_to_save)
-                    logging.info(f"Saved a final batch of {len(articles_to_save)} articles to DB.")
+                writer.flush()
+                metrics.add_busy(time.perf_counter() - start)
                 break
-            articles_to_save.append(article)
-        except Empty:
-            continue
+            writer.write([article])
+            saved += 1
+            metrics.add_busy(time.perf_counter() - start)
+            metrics.add_items(1)
         except Exception as e:
             logging.error(f"Error in DB writer worker: {e}")
-    logging.info("DB writer worker finished.")
+    if stages is not None:
+        stages["saved"] = saved
+    metrics.worker_done()
+    logging.info(f"DB writer worker finished. Saved {saved} articles ({writer.stats()}).")
 
 
 def run_parallel_pipeline(
     fetch_limit: int = 25,
     num_filter_workers: int = 5,
-    num_summarizer_workers: int = 2
+    num_summarizer_workers: int = 2,
+    filter_batch_size: int = 8,
+    summarizer_batch_size: int = 4,
+    max_batch_wait: float = 0.5,
+    classification_mode: str = "exhaustive",
+    skip_known: bool = True,
+    async_fetch: bool = False,
+    fetch_queue_size: int = 64,
+    summarize_queue_size: int = 32,
+    db_queue_size: int = 64,
+    metrics_interval: float = 10.0,
+    execution: str = "threads",
+    num_processes: Optional[int] = None,
+    torch_threads: int = 4,
+    inference_backend: Optional[str] = None,
+    summary_mode: str = "abstractive",
+    cluster_stories: bool = True,
+    db_flush_every: int = 50,
+    db_flush_interval: float = 5.0
 ):
     """
     Runs the parallel news processing pipeline.
+
+    Args:
+        fetch_limit (int): Articles per feed.
+        num_filter_workers (int): Filter threads.
+        num_summarizer_workers (int): Summarizer threads.
+        filter_batch_size (int): Max articles per classifier call.
+        summarizer_batch_size (int): Max articles per summarizer call.
+        max_batch_wait (float): Seconds a worker waits to fill a batch before sending it.
+        classification_mode (str): "exhaustive" or "fast" (see filter.py).
+        skip_known (bool): Skip articles already processed in earlier runs.
+        async_fetch (bool): Use the asyncio fetch engine instead of the thread-pool Fetcher.
+        fetch_queue_size (int): Capacity of the fetch -> filter queue.
+        summarize_queue_size (int): Capacity of the filter -> summarizer queue.
+        db_queue_size (int): Capacity of the summarizer -> DB writer queue.
+        metrics_interval (float): Seconds between queue-depth samples / metric log lines.
+        execution (str): "threads" (this module) or "processes" (see process_pool.py).
+        num_processes (int): Worker processes in "processes" mode (default: cores // torch_threads).
+        torch_threads (int): torch intra-op threads per worker process in "processes" mode.
+        inference_backend (str): Model backend, None/"pytorch", "quantized" or "onnx" (see models.py).
+        summary_mode (str): "abstractive" or "tiered" (see summarizer.py).
+        cluster_stories (bool): Send only one article per near-duplicate story through the models.
+        db_flush_every (int): The DB writer commits after this many articles ...
+        db_flush_interval (float): ... or after this many seconds, whichever comes first.
     """
+    if execution == "processes":
+        run_process_pipeline(
+            fetch_limit=fetch_limit,
+            num_processes=num_processes,
+            torch_threads=torch_threads,
+            shard_size=filter_batch_size,
+            classification_mode=classification_mode,
+            skip_known=skip_known,
+            async_fetch=async_fetch,
+            inference_backend=inference_backend,
+            summary_mode=summary_mode,
+            cluster_stories=cluster_stories,
+            save_every=db_flush_every
+        )
+        return
+    if execution != "threads":
+        raise ValueError(f"Invalid execution mode: {execution}. Use 'threads' or 'processes'.")
+
     logging.info("Starting PARALLEL News Pipeline...")
 
     init_db()
+    seen = SeenIndex() if skip_known else None
+    feed_fetcher = AsyncFetcher(known_ids=seen) if async_fetch else Fetcher(known_ids=seen)
+
+    # Articles count as processed only once saved; failures are retried next run
+    def on_saved(ids):
+        if seen is not None:
+            seen.add_many(ids)
+        feed_fetcher.mark_processed(ids)
+    get_article_writer().on_saved = on_saved
 
-    fetch_queue = Queue()
-    summarize_queue = Queue()
-    db_queue = Queue()
+    # Rejections are final; their held-back duplicates are released after the run
+    rejected = []
+
+    def on_rejected(ids):
+        rejected.extend(ids)
+        feed_fetcher.mark_processed(ids)
+
+    clusterer = StoryClusterer() if cluster_stories else None
+    stages = {}
+
+    # Bounded queues: a full queue blocks the upstream stage (backpressure)
+    fetch_queue = Queue(maxsize=fetch_queue_size)
+    summarize_queue = Queue(maxsize=summarize_queue_size)
+    db_queue = Queue(maxsize=db_queue_size)
+
+    filter_stats = BatchStats("filter")
+    summarizer_stats = BatchStats("summarizer")
+
+    fetch_metrics = StageMetrics("fetch")
+    filter_metrics = StageMetrics("filter", fetch_queue, workers=num_filter_workers)
+    summarizer_metrics = StageMetrics("summarizer", summarize_queue, workers=num_summarizer_workers)
+    db_metrics = StageMetrics("db_writer", db_queue)
+    all_metrics = [fetch_metrics, filter_metrics, summarizer_metrics, db_metrics]
+    sampler = MetricsSampler(all_metrics, interval=metrics_interval)
 
     # Start the workers
-    fetcher = Thread(target=fetcher_worker, args=(fetch_queue, fetch_limit), name="Fetcher")
+    fetcher = Thread(
+        target=fetcher_worker,
+        args=(fetch_queue, fetch_limit, seen, stages, async_fetch),
+        kwargs={"num_consumers": num_filter_workers, "metrics": fetch_metrics, "clusterer": clusterer,
+                "fetcher": feed_fetcher},
+        name="Fetcher"
+    )
     
     filter_workers = [
-        Thread(target=filter_worker, args=(fetch_queue, summarize_queue), name=f"Filterer-{i+1}")
+        Thread(
+            target=filter_worker,
+            args=(fetch_queue, summarize_queue),
+            kwargs={"batch_size": filter_batch_size, "max_wait": max_batch_wait, "stats": filter_stats,
+                    "mode": classification_mode, "metrics": filter_metrics,
+                    "num_consumers": num_summarizer_workers, "backend": inference_backend,
+                    "on_rejected": on_rejected},
+            name=f"Filterer-{i+1}"
+        )
         for i in range(num_filter_workers)
     ]
     
     summarizer_workers = [
-        Thread(target=summarizer_worker, args=(summarize_queue, db_queue), name=f"Summarizer-{i+1}")
+        Thread(
+            target=summarizer_worker,
+            args=(summarize_queue, db_queue),
+            kwargs={"batch_size": summarizer_batch_size, "max_wait": max_batch_wait, "stats": summarizer_stats,
+                    "metrics": summarizer_metrics, "backend": inference_backend, "summary_mode": summary_mode},
+            name=f"Summarizer-{i+1}"
+        )
         for i in range(num_summarizer_workers)
     ]
 
-    db_writer = Thread(target=db_writer_worker, args=(db_queue,), name="DB-Writer")
+    db_writer = Thread(
+        target=db_writer_worker,
+        args=(db_queue, stages, db_metrics),
+        kwargs={"flush_every": db_flush_every, "flush_interval": db_flush_interval},
+        name="DB-Writer"
+    )
 
     # Start all threads
+    sampler.start()
     fetcher.start()
     for w in filter_workers:
         w.start()
@@ -142,5 +575,34 @@ def run_parallel_pipeline(
     for w in summarizer_workers:
         w.join()
     db_writer.join()
+    sampler.stop()
+
+    if clusterer is not None:
+        # Duplicates inherit their representative's categories and summary
+        duplicates = clusterer.expand()
+        if duplicates:
+            save_articles_to_db(duplicates)
+        stages["near_duplicates"] = clusterer.stats()["duplicates"]
+        stages["saved_duplicates"] = len(duplicates)
+        feed_fetcher.mark_processed(clusterer.member_ids(rejected))
+        logging.info(f"Story clusters: {clusterer.stats()}")
+
+    get_article_writer().on_saved = None
+    if seen is not None:
+        seen.save()
+    # Feeds with unsaved articles keep their old watermark and are read again next run
+    stages["feeds_held_back"] = len(feed_fetcher.pending_polls())
+    stages["rejected_by_filter"] = filter_stats.dropped
+    logging.info(f"Stage report: {stages}")
+
+    for metrics in all_metrics:
+        logging.info(f"Stage metrics: {metrics.summary()}")
+    filter_stats.log()
+    summarizer_stats.log()
+    for stats in model_stats():
+        logging.info(f"Model stats: {stats}")
+    logging.info(f"Inference cache: {get_inference_cache().stats()}")
+    if summary_mode == "tiered":
+        logging.info(f"Tiered summarization: {tier_report()}")
 
     logging.info("PARALLEL Pipeline finished successfully.")
@@ -0,0 +1,270 @@
+"""
+process_pool.py
+Multi-process execution mode for the parallel pipeline.
+Each worker process holds its own classifier and summarizer with a fixed torch
+intra-op thread count, and fetched articles are sharded across the workers, so
+CPU-only nodes use all of their cores instead of one classifier lock.
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import time
+from queue import Empty
+from threading import Thread
+from typing import Dict, List, Optional
+
+from ..fetcher.fetcher import Fetcher
+from ..fetcher.async_fetcher import AsyncFetcher
+from ..db.db import init_db, get_article_writer
+from ..db.dedup import SeenIndex
+from .clustering import StoryClusterer
+
+# Shards and results cross process boundaries, so the stop marker must survive pickling
+STOP = None
+
+
+def inference_worker(
+    worker_id: int,
+    in_queue,
+    out_queue,
+    torch_threads: int,
+    threshold: Optional[float] = None,
+    max_length: int = 150,
+    classification_mode: str = "exhaustive",
+    inference_backend: Optional[str] = None,
+    summary_mode: str = "abstractive"
+):
+    """
+    Worker process: classifies and summarizes shards until it receives its STOP.
+    Models are loaded once per process on the first shard. Each shard's results
+    come back as ("rejected", ids) once it is filtered, then ("articles", kept).
+    """
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Already set in this process
+
+    from .filter import filter_articles_batch
+    from .summarizer import summarize_articles_batch, tier_report
+
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s - Inference-{worker_id} - %(message)s')
+    stats = {"worker": worker_id, "shards": 0, "articles": 0, "kept": 0, "busy_s": 0.0, "wait_s": 0.0}
+
+    while True:
+        start = time.perf_counter()
+        shard = in_queue.get()
+        stats["wait_s"] += time.perf_counter() - start
+        if shard is STOP:
+            break
+
+        start = time.perf_counter()
+        kept = []
+        try:
+            kept = filter_articles_batch(shard, threshold=threshold, batch_size=len(shard),
+                                         mode=classification_mode, backend=inference_backend)
+            kept_ids = {a["id"] for a in kept}
+            out_queue.put(("rejected", [a["id"] for a in shard if a["id"] not in kept_ids]))
+            if kept:
+                kept = summarize_articles_batch(kept, max_length=max_length, backend=inference_backend,
+                                                mode=summary_mode)
+        except Exception as e:
+            logging.error(f"Error processing shard: {e}")
+        stats["busy_s"] += time.perf_counter() - start
+        stats["shards"] += 1
+        stats["articles"] += len(shard)
+        stats["kept"] += len(kept)
+        out_queue.put(("articles", kept))
+
+    if summary_mode == "tiered":
+        stats["tiers"] = tier_report()
+    out_queue.put(("done", stats))
+
+
+def _feed_shards(fetcher, in_queue, limit: int, shard_size: int, num_workers: int, stages: Dict,
+                 clusterer: Optional[StoryClusterer] = None):
+    """
+    Streams fetched articles into shards of `shard_size`, then sends one STOP per worker.
+    With a clusterer, only cluster representatives are sharded.
+    """
+    shard = []
+    count = 0
+    try:
+        for article in fetcher.iter_fetch(limit=limit, parallel=True):
+            count += 1
+            if clusterer is not None and not clusterer.add(article):
+                continue
+            shard.append(article)
+            if len(shard) >= shard_size:
+                in_queue.put(shard)
+                shard = []
+        if shard:
+            in_queue.put(shard)
+    except Exception as e:
+        logging.error(f"Error in fetcher: {e}")
+    finally:
+        for _ in range(num_workers):
+            in_queue.put(STOP)
+        stages["feed_entries"] = fetcher.stats["entries"]
+        stages["skipped_known"] = fetcher.stats["skipped_known"]
+        stages["below_watermark"] = fetcher.stats["below_watermark"]
+        stages["feeds_not_due"] = fetcher.stats["feeds_not_due"]
+        stages["fetched"] = count
+
+
+def run_process_pipeline(
+    fetch_limit: int = 25,
+    num_processes: Optional[int] = None,
+    torch_threads: int = 4,
+    shard_size: int = 8,
+    threshold: Optional[float] = None,
+    max_length: int = 150,
+    classification_mode: str = "exhaustive",
+    skip_known: bool = True,
+    async_fetch: bool = False,
+    save_every: int = 50,
+    inference_backend: Optional[str] = None,
+    summary_mode: str = "abstractive",
+    cluster_stories: bool = True
+):
+    """
+    Runs fetch -> (filter + summarize in worker processes) -> DB.
+
+    Args:
+        fetch_limit (int): Articles per feed.
+        num_processes (int): Worker processes. Defaults to cpu_count // torch_threads.
+        torch_threads (int): torch intra-op threads per worker process.
+        shard_size (int): Articles per shard sent to a worker.
+        threshold (float): Classification threshold (default: per mode, see filter.MODE_THRESHOLDS).
+        max_length (int): Max summary length.
+        classification_mode (str): "exhaustive" or "fast" (see filter.py).
+        skip_known (bool): Skip articles already processed in earlier runs.
+        async_fetch (bool): Use the asyncio fetch engine.
+        save_every (int): The DB writer commits after this many results (or its flush interval).
+        inference_backend (str): Model backend, None/"pytorch", "quantized" or "onnx" (see models.py).
+        summary_mode (str): "abstractive" or "tiered" (see summarizer.py).
+        cluster_stories (bool): Send only one article per near-duplicate story to the workers.
+
+    Returns:
+        dict: run report with articles/sec overall, per worker and per core
+    """
+    cores = os.cpu_count() or 1
+    num_processes = num_processes or max(1, cores // torch_threads)
+    logging.info(f"Starting PROCESS-POOL News Pipeline ({num_processes} workers x {torch_threads} torch threads)...")
+
+    init_db()
+    seen = SeenIndex() if skip_known else None
+    fetcher = AsyncFetcher(known_ids=seen) if async_fetch else Fetcher(known_ids=seen)
+    clusterer = StoryClusterer() if cluster_stories else None
+    stages = {}
+
+    # spawn: forked children would inherit torch/thread state from this process
+    ctx = mp.get_context("spawn")
+    in_queue = ctx.Queue(maxsize=num_processes * 2)
+    out_queue = ctx.Queue()
+
+    workers = [
+        ctx.Process(
+            target=inference_worker,
+            args=(i + 1, in_queue, out_queue, torch_threads, threshold, max_length, classification_mode,
+                  inference_backend, summary_mode),
+            name=f"Inference-{i+1}"
+        )
+        for i in range(num_processes)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+
+    feeder = Thread(
+        target=_feed_shards,
+        args=(fetcher, in_queue, fetch_limit, shard_size, num_processes, stages, clusterer),
+        name="Fetcher",
+        daemon=True  # may be blocked on a full queue if every worker crashed
+    )
+    feeder.start()
+
+    # Collect results until every worker has reported done (or died)
+    worker_stats: List[Dict] = []
+    writer = get_article_writer()
+    writer.flush_every = save_every
+    # Articles count as processed only once saved; failures are retried next run
+    def on_saved(ids):
+        if seen is not None:
+            seen.add_many(ids)
+        fetcher.mark_processed(ids)
+    writer.on_saved = on_saved
+    saved = 0
+    rejected = []
+    finished = 0
+    while finished < num_processes:
+        try:
+            kind, payload = out_queue.get(timeout=5)
+        except Empty:
+            writer.flush_if_due()
+            crashed = [w for w in workers if not w.is_alive() and w.exitcode not in (0, None)]
+            if len(crashed) + finished >= num_processes:
+                logging.error(f"{len(crashed)} inference worker(s) exited abnormally")
+                break
+            continue
+        if kind == "done":
+            finished += 1
+            worker_stats.append(payload)
+            continue
+        if kind == "rejected":
+            # Rejections are final; their held-back duplicates are released after the run
+            rejected.extend(payload)
+            fetcher.mark_processed(payload)
+            continue
+        if clusterer is not None:
+            clusterer.record_results(payload)
+        writer.write(payload)
+        saved += len(payload)
+
+    if clusterer is not None:
+        # Duplicates inherit their representative's categories and summary
+        duplicates = clusterer.expand()
+        writer.write(duplicates)
+        saved += len(duplicates)
+        stages["near_duplicates"] = clusterer.stats()["duplicates"]
+    writer.flush()
+    if clusterer is not None:
+        fetcher.mark_processed(clusterer.member_ids(rejected))
+
+    feeder.join(timeout=5)
+    for w in workers:
+        w.join(timeout=30)
+        if w.is_alive():
+            w.terminate()
+    elapsed = time.perf_counter() - start
+
+    writer.on_saved = None
+    if seen is not None:
+        seen.save()
+    # Feeds with unsaved articles keep their old watermark and are read again next run
+    stages["feeds_held_back"] = len(fetcher.pending_polls())
+    stages["saved"] = saved
+    stages["rejected_by_filter"] = sum(s["articles"] - s["kept"] for s in worker_stats)
+
+    processed = sum(s["articles"] for s in worker_stats)
+    used_cores = min(cores, num_processes * torch_threads)
+    report = {
+        "workers": num_processes,
+        "torch_threads": torch_threads,
+        "cores_used": used_cores,
+        "elapsed_s": round(elapsed, 2),
+        "articles": processed,
+        "articles_per_s": round(processed / elapsed, 3) if elapsed else None,
+        "articles_per_s_per_core": round(processed / elapsed / used_cores, 4) if elapsed else None,
+        "per_worker": [
+            dict(s, busy_s=round(s["busy_s"], 2), wait_s=round(s["wait_s"], 2),
+                 articles_per_busy_s=round(s["articles"] / s["busy_s"], 3) if s["busy_s"] else None)
+            for s in sorted(worker_stats, key=lambda s: s["worker"])
+        ],
+    }
+    logging.info(f"Stage report: {stages}")
+    logging.info(f"Process pool report: {report}")
+    logging.info("PROCESS-POOL Pipeline finished successfully.")
+    return report
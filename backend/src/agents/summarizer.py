@@ -5,14 +5,250 @@ Input : List of articles dicts(must have 'text')
 Output : same list with 'summary' field populated
 """
 
+import bisect
 import logging
-from ..models import load_summarizer
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from ..models import load_summarizer, backend_model_id, SUMMARIZER_MODEL_ID
+from ..db.cache import get_inference_cache, make_cache_key
 
 # Initialises logging
 logger = logging.getLogger(__name__)
 
 
-def summarize_articles_batch(articles, max_length = 100, min_length = 30, llm_choice: str = "huggingface"):
+# BART's encoder takes 1024 positions including the <s> and </s> tokens
+MAX_INPUT_TOKENS = 1022
+# Padded tokens (batch size x longest input) allowed in one generate() call
+TOKENS_PER_BATCH = 4096
+MAX_BATCH_SIZE = 16
+# A batch's longest input may be at most this many times its shortest (short inputs count as 64 tokens)
+BUCKET_RATIO = 2.0
+
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]?(?=\s)')
+# A sentence boundary is only used as the cut if it keeps at least this share of the token budget
+SENTENCE_CUT_MIN_SHARE = 0.8
+
+# Tiered mode (see summarize_articles_batch)
+CONCISE_WORDS = 150     # texts up to this long are summarized extractively, no BART
+LONG_WORDS = 600        # texts longer than this are compressed before BART ...
+COMPRESSED_WORDS = 400  # ... to their most salient sentences, this many words at most
+WORDS_PER_TOKEN = 0.75  # converts the token-based max_length into a word budget
+
+_SPLIT_SENTENCES = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r"[a-z0-9][a-z0-9'-]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his i in into is it its of on or our "
+    "she so than that the their them they this to was we were which will with you your".split()
+)
+
+# Process-wide counters for the tiered mode, reported by tier_report()
+_tier_stats = Counter()
+_tier_lock = threading.Lock()
+
+
+def _split_sentences(text: str):
+    return [s for s in _SPLIT_SENTENCES.split(' '.join(text.split())) if s]
+
+
+def _sentence_scores(sentences) -> np.ndarray:
+    """
+    TextRank over TF-IDF sentence vectors: a sentence scores high when it is
+    similar to many other high-scoring sentences.
+    """
+    n = len(sentences)
+    if n < 3:
+        return np.ones(n)
+    tokens = [[w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+    vocab = {w: j for j, w in enumerate({w for ts in tokens for w in ts})}
+    if not vocab:
+        return np.ones(n)
+
+    tf = np.zeros((n, len(vocab)))
+    for i, ts in enumerate(tokens):
+        for w in ts:
+            tf[i, vocab[w]] += 1
+    idf = np.log((1 + n) / (1 + np.count_nonzero(tf, axis=0))) + 1
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1, norms)
+
+    sim = vectors @ vectors.T
+    np.fill_diagonal(sim, 0)
+    row_sums = sim.sum(axis=1, keepdims=True)
+    transition = np.divide(sim, row_sums, out=np.full_like(sim, 1 / n), where=row_sums > 0)
+
+    scores = np.full(n, 1 / n)
+    for _ in range(30):
+        updated = 0.15 / n + 0.85 * transition.T @ scores
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
+
+
+def extractive_summary(text: str, max_words: int) -> str:
+    """
+    The highest-scoring sentences of `text` that fit in `max_words`, in their
+    original order. Texts already within the budget are returned whole.
+    """
+    sentences = _split_sentences(text)
+    lengths = [len(s.split()) for s in sentences]
+    if sum(lengths) <= max_words:
+        return ' '.join(sentences)
+
+    chosen, used = [], 0
+    for i in np.argsort(-_sentence_scores(sentences), kind="stable"):
+        if used + lengths[i] <= max_words:
+            chosen.append(i)
+            used += lengths[i]
+    if not chosen:
+        # Even the best sentence is over budget: keep its first max_words words
+        best = int(np.argmax(_sentence_scores(sentences)))
+        return ' '.join(sentences[best].split()[:max_words])
+    return ' '.join(sentences[i] for i in sorted(chosen))
+
+
+def tier_report() -> dict:
+    """Share of articles per tiered-mode path and the estimated generation time saved."""
+    with _tier_lock:
+        stats = dict(_tier_stats)
+    total = stats.get("extractive", 0) + stats.get("compressed", 0) + stats.get("abstractive", 0)
+    if not total:
+        return {}
+    bart_articles = stats.get("compressed", 0) + stats.get("abstractive", 0)
+    per_article = stats.get("bart_s", 0.0) / bart_articles if bart_articles else None
+    report = {
+        path: {"articles": stats.get(path, 0), "fraction": round(stats.get(path, 0) / total, 3)}
+        for path in ("extractive", "compressed", "abstractive")
+    }
+    report["words_removed_by_compression"] = stats.get("words_removed", 0)
+    report["extractive_s"] = round(stats.get("extractive_s", 0.0), 3)
+    report["bart_s"] = round(stats.get("bart_s", 0.0), 2)
+    if per_article is not None:
+        # Each extractive article would otherwise have cost one average BART article
+        report["estimated_saved_s"] = round(stats.get("extractive", 0) * per_article - stats.get("extractive_s", 0.0), 2)
+    return report
+
+
+def _truncate_chars(text: str, max_input_length: int = 4000) -> str:
+    """Character-based truncation, used when no tokenizer is available (OpenAI)."""
+    # Rough estimate: 1 token ≈ 4 characters, so 4000 chars ≈ 1000 tokens
+    if len(text) > max_input_length:
+        # Try to truncate at sentence boundary
+        truncated = text[:max_input_length]
+        last_period = truncated.rfind('.')
+        if last_period > max_input_length * 0.8:  # If we found a period in last 20%
+            return truncated[:last_period + 1]
+        return truncated
+    return text
+
+
+def _truncate_to_tokens(tokenizer, texts, max_tokens: int = MAX_INPUT_TOKENS):
+    """
+    Cuts every text to at most `max_tokens` BART tokens, at the last sentence
+    boundary inside the budget when it falls in the budget's last 20%
+    (SENTENCE_CUT_MIN_SHARE), else at the token boundary.
+
+    All texts are tokenized in one call; the character offsets of the tokens give
+    the exact cut position, so nothing is re-tokenized.
+
+    Returns:
+        (texts, token_counts)
+    """
+    encoded = tokenizer(list(texts), add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+    out_texts, counts = [], []
+    for text, ids, offsets in zip(texts, encoded["input_ids"], encoded["offset_mapping"]):
+        if len(ids) <= max_tokens:
+            out_texts.append(text)
+            counts.append(len(ids))
+            continue
+        cut = offsets[max_tokens - 1][1]
+        floor = offsets[int(max_tokens * SENTENCE_CUT_MIN_SHARE)][0]
+        boundary = None
+        for match in _SENTENCE_END.finditer(text, floor, cut + 1):
+            boundary = match.end()
+        if boundary is None:
+            boundary = cut  # No sentence end near the limit: cut at the token boundary
+        # Count the tokens that survive the cut (offsets are sorted)
+        kept = bisect.bisect_right([end for _, end in offsets[:max_tokens]], boundary)
+        out_texts.append(text[:boundary])
+        counts.append(kept)
+    return out_texts, counts
+
+
+def _length_buckets(token_counts, tokens_per_batch: int = TOKENS_PER_BATCH, max_batch_size: int = MAX_BATCH_SIZE):
+    """
+    Groups inputs of similar length into batches that fit a padded-token budget.
+
+    Indices are sorted by length, so each batch is padded only to its own longest
+    input; short texts form large batches and long texts small ones.
+
+    Returns:
+        list of index lists
+    """
+    order = sorted(range(len(token_counts)), key=lambda i: token_counts[i])
+    batches, batch = [], []
+    for i in order:
+        longest = max(token_counts[i], 1)  # ascending: the newcomer is the longest
+        if batch and ((len(batch) + 1) * longest > tokens_per_batch
+                      or len(batch) >= max_batch_size
+                      or longest > BUCKET_RATIO * max(token_counts[batch[0]], 64)):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _route_tiers(texts, articles, summary_words: int):
+    """
+    Tiered mode: summarizes concise texts extractively and compresses long ones.
+
+    Returns:
+        (texts, articles) still needing BART, long texts replaced by their compressed form
+    """
+    start = time.perf_counter()
+    remaining_texts, remaining_articles = [], []
+    counts = Counter()
+    for text, art in zip(texts, articles):
+        words = len(text.split())
+        if words <= CONCISE_WORDS:
+            art["summary"] = extractive_summary(text, summary_words)
+            counts["extractive"] += 1
+            continue
+        if words > LONG_WORDS:
+            text = extractive_summary(text, COMPRESSED_WORDS)
+            counts["compressed"] += 1
+            counts["words_removed"] += words - len(text.split())
+        else:
+            counts["abstractive"] += 1
+        remaining_texts.append(text)
+        remaining_articles.append(art)
+    counts["extractive_s"] = time.perf_counter() - start
+    with _tier_lock:
+        _tier_stats.update(counts)
+    logger.info("Tiered routing: %d extractive, %d compressed, %d abstractive",
+                counts["extractive"], counts["compressed"], counts["abstractive"])
+    return remaining_texts, remaining_articles
+
+
+def summarize_articles_batch(
+    articles,
+    max_length = 100,
+    min_length = 30,
+    llm_choice: str = "huggingface",
+    use_cache: bool = True,
+    backend: str = None,
+    max_input_tokens: int = MAX_INPUT_TOKENS,
+    tokens_per_batch: int = TOKENS_PER_BATCH,
+    mode: str = "abstractive"
+):
     """
     Summarizes a batch of articles with improved text handling.
 
@@ -21,11 +257,17 @@ def summarize_articles_batch(articles, max_length = 100, min_length = 30, llm_ch
         max_length (int): Max tokens/words in summary.
         min_length (int): Min tokens/words in summary.
         llm_choice (str): "huggingface" or "openai"
+        use_cache (bool): Reuse cached summaries for articles seen before
+        backend (str): Inference backend, None/"pytorch", "quantized" or "onnx" (see models.py)
+        max_input_tokens (int): Input budget per article in BART tokens
+        tokens_per_batch (int): Padded input tokens per generation batch
+        mode (str): "abstractive" (BART for every article) or "tiered": texts of up to
+            CONCISE_WORDS words get an extractive summary without BART, texts over
+            LONG_WORDS are cut to their most salient sentences before BART
 
     Returns:
         list: articles with summary field filled
     """
-    summarizer = load_summarizer(model_choice=llm_choice)
     logger.info("Summarizing %d articles using %s...", len(articles), llm_choice)
 
     # Prepare texts for batch processing
@@ -37,27 +279,61 @@ def summarize_articles_batch(articles, max_length = 100, min_length = 30, llm_ch
         if not text or len(text.strip()) < 100:
             art["summary"] = ""
             continue  # Skip articles with no content, we'll add them back later
-        
-        # Truncate text to avoid token limits (BART models have 1024 token limit)
-        # Rough estimate: 1 token ≈ 4 characters, so 4000 chars ≈ 1000 tokens
-        max_input_length = 4000
-        if len(text) > max_input_length:
-            # Try to truncate at sentence boundary
-            truncated = text[:max_input_length]
-            last_period = truncated.rfind('.')
-            if last_period > max_input_length * 0.8:  # If we found a period in last 20%
-                text = truncated[:last_period + 1]
-            else:
-                text = truncated
-        
         texts_to_summarize.append(text)
         articles_to_process.append(art)
     
-    # Process in batches for GPU efficiency
-    batch_size = 4  # Process 4 articles at a time
-    for i in range(0, len(texts_to_summarize), batch_size):
-        batch_texts = texts_to_summarize[i:i + batch_size]
-        batch_articles = articles_to_process[i:i + batch_size]
+    if mode == "tiered":
+        texts_to_summarize, articles_to_process = _route_tiers(
+            texts_to_summarize, articles_to_process, int(max_length * WORDS_PER_TOKEN)
+        )
+    elif mode != "abstractive":
+        raise ValueError(f"Invalid summarization mode: {mode}. Use 'abstractive' or 'tiered'.")
+    
+    # Reuse summaries of unchanged articles and only generate the rest.
+    # Keys use the full text; truncation is deterministic for a given budget.
+    cache_keys = []
+    if use_cache and llm_choice == "huggingface" and texts_to_summarize:
+        cache = get_inference_cache()
+        params = {"max_length": max_length, "min_length": min_length, "max_input_tokens": max_input_tokens}
+        model_id = backend_model_id(SUMMARIZER_MODEL_ID, backend)
+        keys = [make_cache_key("summary", text, model_id, params) for text in texts_to_summarize]
+        cached = cache.get_many("summary", keys)
+        pending = []
+        for text, art, key in zip(texts_to_summarize, articles_to_process, keys):
+            if key in cached:
+                art["summary"] = cached[key]
+            else:
+                pending.append((text, art, key))
+        texts_to_summarize = [p[0] for p in pending]
+        articles_to_process = [p[1] for p in pending]
+        cache_keys = [p[2] for p in pending]
+        if cached:
+            logger.info("Reused %d cached summaries", len(cached))
+    
+    if not texts_to_summarize:
+        logger.info("Summarization complete")
+        return articles
+    
+    summarizer = load_summarizer(model_choice=llm_choice, backend=backend)
+    
+    tokenizer = getattr(summarizer, "tokenizer", None)
+    if llm_choice == "huggingface" and tokenizer is not None:
+        # Exact token budget, then batches of similar length sized by padded tokens
+        texts_to_summarize, token_counts = _truncate_to_tokens(tokenizer, texts_to_summarize, max_input_tokens)
+        batches = _length_buckets(token_counts, tokens_per_batch)
+        padded = sum(len(b) * max(token_counts[i] for i in b) for b in batches)
+        logger.info("Summarizing in %d length-bucketed batches (%d tokens, %.0f%% padding)",
+                    len(batches), sum(token_counts), 100 * (1 - sum(token_counts) / padded) if padded else 0)
+    else:
+        texts_to_summarize = [_truncate_chars(text) for text in texts_to_summarize]
+        batch_size = 4  # Process 4 articles at a time
+        batches = [list(range(i, min(i + batch_size, len(texts_to_summarize))))
+                   for i in range(0, len(texts_to_summarize), batch_size)]
+    
+    bart_start = time.perf_counter()
+    for indices in batches:
+        batch_texts = [texts_to_summarize[i] for i in indices]
+        batch_articles = [articles_to_process[i] for i in indices]
         
         try:
             if llm_choice == "huggingface":
@@ -66,7 +342,9 @@ def summarize_articles_batch(articles, max_length = 100, min_length = 30, llm_ch
                     batch_texts, 
                     max_length=max_length,
                     min_length=min_length,
-                    do_sample=False  # Deterministic summaries
+                    do_sample=False,  # Deterministic summaries
+                    truncation=True,
+                    batch_size=len(batch_texts)  # Batches are already sized by token budget
                 )
                 
                 # Handle results (can be list of dicts or list of lists)
@@ -118,7 +396,8 @@ def summarize_articles_batch(articles, max_length = 100, min_length = 30, llm_ch
                         text,
                         max_length=max_length,
                         min_length=min_length,
-                        do_sample=False
+                        do_sample=False,
+                        truncation=True
                     )
                     if isinstance(result, list) and len(result) > 0:
                         summary = result[0].get("summary_text", result[0].get("generated_text", ""))
@@ -129,6 +408,16 @@ def summarize_articles_batch(articles, max_length = 100, min_length = 30, llm_ch
                     logger.error("Failed to summarise article '%s': %s", art.get("title", ""), e2)
                     art["summary"] = ""
             
+    if mode == "tiered" and llm_choice == "huggingface":
+        with _tier_lock:
+            _tier_stats["bart_s"] += time.perf_counter() - bart_start
+        logger.info("Tiered summarization: %s", tier_report())
+            
+    if cache_keys:
+        get_inference_cache().put_many("summary", {
+            key: art["summary"] for key, art in zip(cache_keys, articles_to_process) if art.get("summary")
+        })
+    
     # Return all articles (both processed and skipped ones)
     logger.info("Summarization complete")
     return articles
@@ -0,0 +1,237 @@
+"""
+database.py
+Async Postgres access for the API: a bounded asyncpg connection pool with
+prepared (cached) statements, health-checked connections and pool saturation
+metrics.
+
+The schema is created by src/db/migrations.py (run by sync_to_supabase.py).
+For offline load tests, point DATABASE_URL at a local Postgres and load it with
+    SUPABASE_DB_URL=postgresql://localhost/devpulse python sync_to_supabase.py
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+# Seconds a request waits for a free connection before failing
+ACQUIRE_TIMEOUT_S = 5.0
+COMMAND_TIMEOUT_S = 10.0
+# Connections idle longer than this are pinged before use
+HEALTHCHECK_IDLE_S = 30.0
+# Idle connections above min_size are closed after this many seconds
+MAX_INACTIVE_LIFETIME_S = 300.0
+# asyncpg prepares and caches every statement per connection; set to 0 behind a
+# transaction-mode pgbouncer (e.g. the Supabase pooler on port 6543)
+STATEMENT_CACHE_SIZE = 100
+
+CARD_COLUMNS = "id, title, summary, source, categories, link, published, published_ts"
+EXPORT_COLUMNS = f"{CARD_COLUMNS}, text, cluster_id"
+
+
+def _keyset_queries(columns: str) -> Dict[str, str]:
+    """
+    Keyset page queries in ORDER BY published_ts DESC NULLS LAST, id DESC. Dated rows
+    are served by a row comparison on idx_articles_published_ts, then undated ones by id.
+    """
+    return {
+        "first": f"""
+            SELECT {columns} FROM articles
+            WHERE published_ts IS NOT NULL
+            ORDER BY published_ts DESC NULLS LAST, id DESC LIMIT $1
+        """,
+        "after": f"""
+            SELECT {columns} FROM articles
+            WHERE (published_ts, id) < ($1, $2)
+            ORDER BY published_ts DESC NULLS LAST, id DESC LIMIT $3
+        """,
+        "undated": f"""
+            SELECT {columns} FROM articles
+            WHERE published_ts IS NULL AND ($1::text IS NULL OR id < $1)
+            ORDER BY id DESC LIMIT $2
+        """,
+    }
+
+
+CARD_QUERIES = _keyset_queries(CARD_COLUMNS)
+EXPORT_QUERIES = _keyset_queries(EXPORT_COLUMNS)
+OFFSET_SQL = f"""
+    SELECT {CARD_COLUMNS} FROM articles
+    ORDER BY published_ts DESC NULLS LAST, id DESC LIMIT $1 OFFSET $2
+"""
+ARTICLE_SQL = f"SELECT {EXPORT_COLUMNS} FROM articles WHERE id = $1"
+SEARCH_SQL = "SELECT * FROM search_articles($1, $2, $3, $4, $5, $6)"
+
+
+class Database:
+    """
+    Connection pool plus the API's queries.
+
+    Args:
+        dsn (str): Postgres connection URL.
+        min_size (int): Connections kept open.
+        max_size (int): Upper bound on open connections.
+        acquire_timeout (float): Seconds to wait for a free connection.
+        statement_cache_size (int): Prepared statements cached per connection (0 disables).
+    """
+
+    def __init__(self, dsn: str, min_size: int = POOL_MIN_SIZE, max_size: int = POOL_MAX_SIZE,
+                 acquire_timeout: float = ACQUIRE_TIMEOUT_S,
+                 statement_cache_size: int = STATEMENT_CACHE_SIZE):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.statement_cache_size = statement_cache_size
+        self._pool: Optional[asyncpg.Pool] = None
+        self._last_used: Dict[int, float] = {}  # server pid -> monotonic time of last release
+        self._waiting = 0
+        self._stats = {"acquires": 0, "acquire_timeouts": 0, "acquire_wait_s": 0.0, "max_acquire_wait_s": 0.0,
+                       "max_waiting": 0, "healthchecks": 0, "replaced_connections": 0}
+
+    async def connect(self):
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            command_timeout=COMMAND_TIMEOUT_S,
+            max_inactive_connection_lifetime=MAX_INACTIVE_LIFETIME_S,
+            statement_cache_size=self.statement_cache_size,
+        )
+        logger.info("Postgres pool ready (min=%d, max=%d)", self.min_size, self.max_size)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Yields a pooled connection. Connections idle for over HEALTHCHECK_IDLE_S
+        are pinged first, and replaced once if the ping fails.
+        """
+        if self._pool is None:
+            raise RuntimeError("Database pool is not connected")
+        self._waiting += 1
+        self._stats["max_waiting"] = max(self._stats["max_waiting"], self._waiting)
+        start = time.monotonic()
+        try:
+            conn = await self._pool.acquire(timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats["acquire_timeouts"] += 1
+            raise
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - start
+        self._stats["acquires"] += 1
+        self._stats["acquire_wait_s"] += waited
+        self._stats["max_acquire_wait_s"] = max(self._stats["max_acquire_wait_s"], waited)
+
+        conn = await self._healthy(conn)
+        try:
+            yield conn
+        finally:
+            self._mark_used(conn.get_server_pid())
+            await self._pool.release(conn)
+
+    def _mark_used(self, pid: int):
+        now = time.monotonic()
+        self._last_used[pid] = now
+        if len(self._last_used) > 4 * self.max_size:
+            # Forget connections the pool has closed for inactivity
+            self._last_used = {p: t for p, t in self._last_used.items() if now - t < MAX_INACTIVE_LIFETIME_S}
+
+    async def _healthy(self, conn):
+        """Returns `conn`, or a replacement if it fails its ping. Never leaves a connection checked out on error."""
+        pid = conn.get_server_pid()
+        if time.monotonic() - self._last_used.get(pid, 0.0) < HEALTHCHECK_IDLE_S:
+            return conn
+        self._stats["healthchecks"] += 1
+        try:
+            await conn.fetchval("SELECT 1", timeout=2)
+            return conn
+        except Exception as e:
+            logger.warning("Dropping unhealthy connection (pid %d): %s", pid, e)
+            self._stats["replaced_connections"] += 1
+            self._last_used.pop(pid, None)
+            conn.terminate()
+            await self._pool.release(conn)
+        return await self._pool.acquire(timeout=self.acquire_timeout)
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+
+    async def _keyset_page(self, queries: Dict[str, str], limit: int, after_ts: Optional[int],
+                           after_id: Optional[str]) -> List[Dict]:
+        async with self.acquire() as conn:
+            rows = []
+            if after_id is None:
+                rows = await conn.fetch(queries["first"], limit)
+            elif after_ts is not None:
+                rows = await conn.fetch(queries["after"], after_ts, after_id, limit)
+            if len(rows) < limit:
+                # Dated rows are exhausted; continue with undated ones
+                undated_after = after_id if (after_id is not None and after_ts is None) else None
+                rows = list(rows) + list(await conn.fetch(queries["undated"], undated_after, limit - len(rows)))
+        return [dict(r) for r in rows]
+
+    async def article_cards(self, limit: int, after_ts: Optional[int] = None, after_id: Optional[str] = None,
+                            offset: Optional[int] = None) -> List[Dict]:
+        """Newest-first cards after the (after_ts, after_id) keyset position, or at `offset`."""
+        if offset:
+            async with self.acquire() as conn:
+                return [dict(r) for r in await conn.fetch(OFFSET_SQL, limit, offset)]
+        return await self._keyset_page(CARD_QUERIES, limit, after_ts, after_id)
+
+    async def export_pages(self, page_size: int = 500) -> AsyncIterator[List[Dict]]:
+        """
+        Every article with its text, newest first, in keyset pages. A connection
+        is held only while a page is fetched, so memory and pool use stay bounded.
+        """
+        after_ts = after_id = None
+        while True:
+            rows = await self._keyset_page(EXPORT_QUERIES, page_size, after_ts, after_id)
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            after_ts, after_id = rows[-1]["published_ts"], rows[-1]["id"]
+
+    async def article(self, article_id: str) -> Optional[Dict]:
+        async with self.acquire() as conn:
+            row = await conn.fetchrow(ARTICLE_SQL, article_id)
+        return dict(row) if row else None
+
+    async def search(self, query: str, category: Optional[str], since: Optional[int], until: Optional[int],
+                     limit: int, offset: int) -> List[Dict]:
+        async with self.acquire() as conn:
+            rows = await conn.fetch(SEARCH_SQL, query, category, since, until, limit, offset)
+        return [dict(r) for r in rows]
+
+    async def ping(self) -> float:
+        """Round-trip time of SELECT 1 in seconds."""
+        start = time.perf_counter()
+        async with self.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+        return time.perf_counter() - start
+
+    def stats(self) -> Dict:
+        """Pool size and saturation: connections in use, requests waiting and acquire wait times."""
+        s = dict(self._stats)
+        if self._pool is not None:
+            size, idle = self._pool.get_size(), self._pool.get_idle_size()
+            s.update(size=size, idle=idle, in_use=size - idle, max_size=self.max_size,
+                     saturation=round((size - idle) / self.max_size, 3))
+        s["waiting"] = self._waiting
+        s["avg_acquire_wait_ms"] = round(1000 * s["acquire_wait_s"] / s["acquires"], 2) if s["acquires"] else None
+        s["max_acquire_wait_ms"] = round(1000 * s.pop("max_acquire_wait_s"), 2)
+        s.pop("acquire_wait_s")
+        return s
@@ -68,34 +68,63 @@
 
 
 # backend/src/api/main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
-from supabase import create_client, Client
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timezone
+from contextlib import asynccontextmanager
+import asyncio
 import os
+import json
+import base64
+import hmac
+import zlib
+import orjson
 from dotenv import load_dotenv
 import logging
 
+from database import Database, POOL_MAX_SIZE, POOL_MIN_SIZE, STATEMENT_CACHE_SIZE
+from response_cache import CachedResponse, ResponseCache, brotli, choose_encoding
+from snapshot_store import SnapshotStore
+
 # ---------------------------------------------------------------------
 # Load environment variables
 # ---------------------------------------------------------------------
 load_dotenv()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+# Direct Postgres connection (Supabase or a local Postgres)
+DATABASE_URL = os.getenv("DATABASE_URL") or os.getenv("SUPABASE_DB_URL")
 
 # Validate env setup
-if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-    raise RuntimeError("❌ Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY in environment variables")
+if not DATABASE_URL:
+    raise RuntimeError("❌ Missing DATABASE_URL or SUPABASE_DB_URL in environment variables")
+
+db = Database(
+    DATABASE_URL,
+    min_size=int(os.getenv("DB_POOL_MIN", POOL_MIN_SIZE)),
+    max_size=int(os.getenv("DB_POOL_MAX", POOL_MAX_SIZE)),
+    statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE", STATEMENT_CACHE_SIZE)),
+)
+
+# Responses are cached in-process; sync_to_supabase.py invalidates them after a sync
+response_cache = ResponseCache(ttl=float(os.getenv("API_CACHE_TTL", "60")))
+CACHE_INVALIDATE_TOKEN = os.getenv("CACHE_INVALIDATE_TOKEN")
 
-# Initialize Supabase client (via HTTPS)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+# Precomputed first pages written after each sync (src/db/snapshots.py)
+snapshots = SnapshotStore()
 
 # ---------------------------------------------------------------------
 # FastAPI App Setup
 # ---------------------------------------------------------------------
-app = FastAPI(title="DevPulse API (Supabase HTTPS)")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db.connect()
+    yield
+    await db.close()
+
+app = FastAPI(title="DevPulse API (Postgres)", lifespan=lifespan)
 
 # Allow your frontends
 app.add_middleware(
@@ -108,56 +137,274 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Legacy ?page= requests are served by offset only this deep; use ?cursor= beyond it
+MAX_OFFSET = 1000
+
+SEARCH_MAX_LIMIT = 50
+
+EXPORT_PAGE_SIZE = 500
+
+
 class Article(BaseModel):
     id: str
     title: str
     link: str
     text: str
     published: str
+    published_ts: Optional[int] = None
     source: Optional[str] = None
     categories: Optional[str] = None
     summary: Optional[str] = None
 
 
-# Routes
-@app.get("/")
-def root():
-    return {"message": "✅ DevPulse API connected to Supabase via HTTPS"}
+class ArticleCard(BaseModel):
+    id: str
+    title: str
+    link: str
+    published: str
+    published_ts: Optional[int] = None
+    source: Optional[str] = None
+    categories: Optional[str] = None
+    summary: Optional[str] = None
+
+
+class SearchResult(ArticleCard):
+    snippet: Optional[str] = None
+    rank: Optional[float] = None
 
-@app.get("/articles", response_model=List[Article])
-def get_articles(limit: int = 20, page: int = 1):
+
+def encode_cursor(row: dict) -> str:
+    """Opaque keyset cursor for the position after `row`."""
+    raw = json.dumps([row.get("published_ts"), row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[int], str]:
+    """(published_ts, id) from a cursor; raises HTTP 400 if it is malformed."""
     try:
-        start = (page - 1) * limit
-        end = start + limit - 1
-        logger.info(f"Fetching articles page={page}, limit={limit} (range {start}-{end})")
-
-        response = (
-            supabase.table("articles")
-            .select("*")
-            .order("published", desc=True)
-            .range(start, end)
-            .execute()
-        )
-
-        # ✅ If no data found for this page, fall back to all articles
-        if not response.data:
-            logger.warning(f"No data for page={page} — returning all articles instead.")
-            all_articles = (
-                supabase.table("articles")
-                .select("*")
-                .order("published", desc=True)
-                .execute()
-            )
-            return all_articles.data or []
-
-        return response.data
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published_ts, article_id = json.loads(raw)
+        valid_ts = published_ts is None or (isinstance(published_ts, int) and not isinstance(published_ts, bool))
+        if not isinstance(article_id, str) or not valid_ts:
+            raise ValueError(cursor)
+        return published_ts, article_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _cached_response(request: Request, key, loader) -> Response:
+    """
+    Serves `key` from the response cache (loading it on a miss) with a strong
+    ETag; answers a matching If-None-Match with 304 Not Modified.
+    """
+    entry = await response_cache.get_or_load(key, loader)
+    return _send(request, entry)
+
+
+# Content-addressed snapshot files never change
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _send(request: Request, entry: CachedResponse, cache_control: str = "no-cache",
+          extra_headers: Optional[dict] = None) -> Response:
+    body, encoding, etag = entry.representation(request.headers.get("accept-encoding", ""))
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding",
+               **entry.headers, **(extra_headers or {})}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
+def _json_bytes(data) -> bytes:
+    # Rows come straight from the database with known column types; no model round-trip
+    return orjson.dumps(data)
+
+
+async def _query(description: str, coro):
+    """Awaits a database call, mapping failures to HTTP errors."""
+    try:
+        return await coro
+    except asyncio.TimeoutError:
+        logger.error("Timed out waiting for the database (%s); pool: %s", description, db.stats())
+        raise HTTPException(status_code=503, detail="Database busy")
     except Exception as e:
-        logger.error("Error fetching paginated articles: %s", e)
+        logger.error("Error %s: %s", description, e)
         raise HTTPException(status_code=500, detail="Database error")
+
+
+async def _load_article_cards(limit: int, cursor: Optional[str], page: Optional[int]) -> CachedResponse:
+    logger.info(f"Fetching articles cursor={cursor}, page={page}, limit={limit}")
+    if cursor:
+        after_ts, after_id = decode_cursor(cursor)
+        rows = await _query("fetching paginated articles", db.article_cards(limit, after_ts, after_id))
+    elif page and page > 1:
+        start = (page - 1) * limit
+        if start >= MAX_OFFSET:
+            logger.warning(f"page={page} is beyond the offset limit; use cursor pagination")
+            return CachedResponse(_json_bytes([]))
+        rows = await _query("fetching paginated articles", db.article_cards(limit, offset=start))
+    else:
+        rows = await _query("fetching paginated articles", db.article_cards(limit))
+
+    # A short page is the last one; past the end is just an empty page
+    headers = {"X-Next-Cursor": encode_cursor(rows[-1])} if len(rows) == limit else {}
+    return CachedResponse(_json_bytes(rows), headers)
+
+
+async def _load_article(article_id: str) -> CachedResponse:
+    row = await _query(f"fetching article {article_id}", db.article(article_id))
+    if not row:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return CachedResponse(_json_bytes(row))
+
+
+def _day_epoch(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+async def _load_search(q: str, category: Optional[str], since: Optional[date], until: Optional[date],
+                       limit: int, page: int) -> CachedResponse:
+    logger.info(f"Searching q={q!r} category={category} since={since} until={until} page={page}")
+    rows = await _query("searching articles", db.search(
+        q, category,
+        _day_epoch(since) if since else None,
+        _day_epoch(until) + 86400 if until else None,  # inclusive end date
+        limit, (page - 1) * limit,
+    ))
+    return CachedResponse(_json_bytes(rows))
+
+
+# Routes
+@app.get("/")
+async def root():
+    return {"message": "✅ DevPulse API connected to Postgres"}
+
+@app.get("/health")
+async def health():
+    """Database round-trip and connection pool saturation."""
+    try:
+        latency = await asyncio.wait_for(db.ping(), timeout=5)
+    except Exception as e:
+        logger.error("Health check failed: %s", e)
+        return Response(status_code=503, content=_json_bytes({"status": "unavailable", "pool": db.stats()}),
+                        media_type="application/json")
+    return {"status": "ok", "db_latency_ms": round(latency * 1000, 2), "pool": db.stats()}
+
+@app.get("/articles", response_model=List[ArticleCard])
+async def get_articles(request: Request, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None,
+                       page: Optional[int] = None):
+    """
+    Newest-first article cards, paginated by keyset on (published_ts, id).
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page;
+    it is absent on the last page.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    page = None if cursor else page
+    if not cursor and (page or 1) == 1:
+        snapshot = snapshots.page("all", 1, limit)
+        if snapshot is not None:
+            entry, last = snapshot
+            headers = {"X-Next-Cursor": encode_cursor({"published_ts": last[0], "id": last[1]})} if last else {}
+            return _send(request, entry, extra_headers=headers)
+    return await _cached_response(request, ("articles", limit, cursor, page),
+                                  lambda: _load_article_cards(limit, cursor, page))
+
+@app.get("/articles/{article_id}", response_model=Article)
+async def get_article(request: Request, article_id: str):
+    """Full article, including text."""
+    return await _cached_response(request, ("article", article_id), lambda: _load_article(article_id))
+
+@app.get("/search", response_model=List[SearchResult])
+async def search(request: Request, q: str, category: Optional[str] = None, since: Optional[date] = None,
+                 until: Optional[date] = None, limit: int = DEFAULT_LIMIT, page: int = 1):
+    """
+    Ranked full-text search over title, summary and text, with <mark>-highlighted
+    snippets. Optional category and published date range (YYYY-MM-DD, inclusive).
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Empty query")
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    page = max(1, page)
+    if (page - 1) * limit >= MAX_OFFSET:
+        return Response(content=_json_bytes([]), media_type="application/json")
+    key = ("search", q, category, since, until, limit, page)
+    return await _cached_response(request, key, lambda: _load_search(q, category, since, until, limit, page))
+
+@app.get("/export.ndjson")
+async def export_ndjson(request: Request):
+    """
+    Every article, full text included, as newline-delimited JSON, newest first.
+    Streamed page by page from the database (memory stays bounded) and
+    compressed on the fly if the client accepts it.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+
+    async def lines():
+        compressor = None
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=4)
+        elif encoding == "gzip":
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        exported = 0
+        async for rows in db.export_pages(EXPORT_PAGE_SIZE):
+            chunk = b"".join(orjson.dumps(row) + b"\n" for row in rows)
+            exported += len(rows)
+            if compressor is None:
+                yield chunk
+            else:
+                out = compressor.process(chunk) if encoding == "br" else compressor.compress(chunk)
+                if out:
+                    yield out
+        if compressor is not None:
+            yield compressor.finish() if encoding == "br" else compressor.flush()
+        logger.info("Exported %d articles as NDJSON", exported)
+
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-store"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=headers)
+
+@app.get("/snapshots/manifest.json")
+async def snapshot_manifest(request: Request):
+    """Current snapshot version and the content-hashed page files of every view."""
+    entry = snapshots.manifest()
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No snapshots yet")
+    return _send(request, entry)
+
+@app.get("/snapshots/{name}")
+async def snapshot_file(request: Request, name: str):
+    """A snapshot page; immutable, as its name carries its content hash."""
+    entry, path = snapshots.file(name)
+    if entry is not None:
+        return _send(request, entry, cache_control=IMMUTABLE)
+    if path is not None:
+        # Older snapshot still on disk: let the server sendfile it
+        return FileResponse(path, media_type="application/json", headers={"Cache-Control": IMMUTABLE})
+    raise HTTPException(status_code=404, detail="Snapshot not found")
+
+@app.post("/cache/invalidate")
+async def invalidate_cache(x_cache_token: Optional[str] = Header(default=None)):
+    """Drops cached responses; called by sync_to_supabase.py after new rows are synced."""
+    if not CACHE_INVALIDATE_TOKEN or not hmac.compare_digest(x_cache_token or "", CACHE_INVALIDATE_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    response_cache.invalidate()
+    logger.info("Response cache invalidated")
+    return {"invalidated": True}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return response_cache.stats()
@@ -0,0 +1,153 @@
+"""
+response_cache.py
+In-process read-through cache for API responses.
+Entries expire after a TTL and are dropped together by invalidate() (called when
+a sync completes). Concurrent misses on the same key share a single load, so a
+burst of identical requests costs one database query; requests arriving after an
+invalidation never join a load that started before it.
+Bodies above COMPRESS_MIN_BYTES are compressed once per encoding (brotli or
+gzip) and the compressed bytes are cached alongside the original.
+"""
+import asyncio
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+DEFAULT_TTL_S = 60.0
+MAX_ENTRIES = 512
+
+# Smaller bodies aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Content codings the client accepts (q=0 excluded)."""
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding for an Accept-Encoding header: br, then gzip, else None."""
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CachedResponse:
+    """Serialized response body with its strong ETag and extra headers."""
+
+    __slots__ = ("body", "etag", "headers", "_encoded")
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.headers = headers or {}
+        self._encoded: Dict[str, bytes] = {}
+
+    def representation(self, accept_encoding: str) -> Tuple[bytes, Optional[str], str]:
+        """
+        (body, content coding or None, ETag) to send for an Accept-Encoding header.
+        Each coding gets its own strong ETag, as its bytes differ.
+        """
+        encoding = choose_encoding(accept_encoding) if len(self.body) >= COMPRESS_MIN_BYTES else None
+        if encoding is None:
+            return self.body, None, self.etag
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding)
+        return self._encoded[encoding], encoding, self.etag[:-1] + "-" + encoding + '"'
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of CachedResponse objects with request coalescing.
+    Used from a single event loop (the API's), so no locking is needed.
+
+    Args:
+        ttl (float): Seconds an entry stays fresh.
+        max_entries (int): Entries kept before the least recently used are evicted.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_S, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse]]" = OrderedDict()
+        # In-flight loads by (key, generation)
+        self._loading: Dict[Tuple[Hashable, int], asyncio.Task] = {}
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        """
+        Returns the fresh entry for `key`, or awaits `loader` once for all
+        concurrent callers. Errors raised by the loader reach every waiter and
+        are not cached.
+        """
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+        flight = (key, self._generation)
+        task = self._loading.get(flight)
+        if task is None:
+            self._stats["misses"] += 1
+            task = self._loading[flight] = asyncio.ensure_future(self._load(key, loader, self._generation))
+        else:
+            self._stats["coalesced"] += 1
+        # shield: a cancelled (disconnected) request doesn't cancel the shared load
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader, generation: int) -> CachedResponse:
+        try:
+            value = await loader()
+        finally:
+            self._loading.pop((key, generation), None)
+        # Don't store a result that was loaded before an invalidation
+        if generation == self._generation:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        """Drops every entry; loads already in flight won't be stored."""
+        self._entries.clear()
+        self._generation += 1
+        self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict:
+        s = dict(self._stats, entries=len(self._entries), ttl_s=self.ttl)
+        lookups = s["hits"] + s["misses"] + s["coalesced"]
+        s["hit_rate"] = round((s["hits"] + s["coalesced"]) / lookups, 3) if lookups else None
+        return s
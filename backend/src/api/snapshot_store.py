@@ -0,0 +1,107 @@
+"""
+snapshot_store.py
+Serves the feed snapshots written after each sync (see src/db/snapshots.py) from
+memory. The manifest is re-checked every few seconds and, when it changes, the
+pages it references are loaded; hot first-page reads never touch the database.
+"""
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+from response_cache import CachedResponse
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "snapshots"
+)
+MANIFEST_NAME = "manifest.json"
+CHECK_INTERVAL_S = 2.0
+
+# Only content-addressed page files are served: <view>-p<n>.<hash>.json
+SNAPSHOT_FILE = re.compile(r"^[a-z0-9-]+-p\d+\.[0-9a-f]{16}\.json$")
+
+
+class SnapshotStore:
+    """
+    In-memory copy of the current snapshot manifest and its page files.
+
+    Args:
+        directory (str): Snapshot directory written by the pipeline.
+        check_interval (float): Seconds between manifest mtime checks.
+    """
+
+    def __init__(self, directory: str = SNAPSHOT_DIR, check_interval: float = CHECK_INTERVAL_S):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._manifest: Optional[Dict] = None
+        self._manifest_response: Optional[CachedResponse] = None
+        self._files: Dict[str, CachedResponse] = {}
+        self._mtime_ns: Optional[int] = None
+        self._checked = 0.0
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            manifest = json.loads(raw)
+            files = {}
+            for entries in manifest["views"].values():
+                for entry in entries:
+                    name = entry["file"]
+                    files[name] = self._files.get(name) or CachedResponse(self._read(name))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not load snapshots from %s: %s", self.directory, e)
+            return
+        self._manifest, self._manifest_response, self._files = manifest, CachedResponse(raw), files
+        self._mtime_ns = mtime_ns
+        logger.info("Loaded snapshot v%s (%d files)", manifest.get("version"), len(files))
+
+    def _read(self, name: str) -> bytes:
+        with open(os.path.join(self.directory, name), "rb") as f:
+            return f.read()
+
+    def manifest(self) -> Optional[CachedResponse]:
+        self._refresh()
+        return self._manifest_response
+
+    def file(self, name: str) -> Tuple[Optional[CachedResponse], Optional[str]]:
+        """
+        (in-memory response, None) for a file of the current snapshot, or
+        (None, path) for an older one still on disk (to send as a file).
+        """
+        self._refresh()
+        if name in self._files:
+            return self._files[name], None
+        path = os.path.join(self.directory, name)
+        if SNAPSHOT_FILE.match(name) and os.path.isfile(path):
+            return None, path
+        return None, None
+
+    def page(self, view: str, number: int, page_size: int) -> Optional[Tuple[CachedResponse, Optional[list]]]:
+        """
+        (page response, keyset position after it) for `view` page `number`, if the
+        current snapshot has it with this page size.
+        """
+        self._refresh()
+        if not self._manifest or self._manifest.get("page_size") != page_size:
+            return None
+        entries = self._manifest["views"].get(view) or []
+        if not 1 <= number <= len(entries):
+            return None
+        entry = entries[number - 1]
+        return self._files[entry["file"]], entry.get("last")
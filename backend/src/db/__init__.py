@@ -3,6 +3,9 @@ This package handles database operations for news pipeline,
 including initialistion and saving articles.
 """
 
-from .db import init_db, save_articles_to_db
+from .db import init_db, save_articles_to_db, search_articles, ArticleWriter, get_article_writer
+from .migrations import migrate_sqlite, migrate_postgres, published_to_epoch
+from .cache import InferenceCache, get_inference_cache
+from .dedup import SeenIndex
 
-__all__ = ["init_db", "save_articles_to_db"]
\ No newline at end of file
+__all__ = ["init_db", "save_articles_to_db", "search_articles", "ArticleWriter", "get_article_writer", "migrate_sqlite", "migrate_postgres", "published_to_epoch", "InferenceCache", "get_inference_cache", "SeenIndex"]
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+cache.py
+Persistent, content-addressed cache for model outputs (category scores and summaries).
+Entries are keyed on a hash of the input text, the model id and the parameters that
+affect the output, so an unchanged article is never classified or summarized twice.
+"""
+import sqlite3
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), "inference_cache.db")
+
+# Every inference worker process writes to the same file; wait this long for
+# another writer's lock before giving up
+BUSY_TIMEOUT_S = 30.0
+
+
+def make_cache_key(kind: str, text: str, model_id: str, params: dict) -> str:
+    """sha256 over the text, model id and the (sorted) parameters."""
+    payload = json.dumps(
+        {"kind": kind, "model": model_id, "params": params, "text": text},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InferenceCache:
+    """
+    SQLite-backed LRU cache of model outputs.
+
+    The cache is an optimization: if the database stays locked past
+    BUSY_TIMEOUT_S (or fails otherwise), lookups count as misses and stores are
+    skipped, so the article is still classified/summarized rather than dropped.
+
+    Args:
+        path (str): SQLite file to store entries in.
+        max_entries (int): Entries kept before the least recently used are evicted.
+    """
+
+    def __init__(self, path: str = CACHE_DB_PATH, max_entries: int = 50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_S, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_S * 1000)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS inference_cache(
+                key TEXT PRIMARY KEY,
+                kind TEXT,
+                value TEXT,
+                last_used REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_used ON inference_cache(last_used)")
+        self._conn.commit()
+
+    def get_many(self, kind: str, keys: list) -> dict:
+        """
+        Looks up several keys at once.
+
+        Returns:
+            dict: {key: value} for the keys that were found
+        """
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            try:
+                for i in range(0, len(keys), 500):  # stay under SQLite's variable limit
+                    chunk = keys[i:i + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, value FROM inference_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    found.update((k, json.loads(v)) for k, v in rows)
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE inference_cache SET last_used = ? WHERE key = ?",
+                        [(now, k) for k in found]
+                    )
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                # The last_used bump is best-effort; keep whatever was read
+                self._conn.rollback()
+                self.errors += 1
+                logger.warning("Inference cache lookup failed (%s); %d of %d keys found", e, len(found), len(keys))
+            self.hits[kind] += len(found)
+            self.misses[kind] += len(keys) - len(found)
+        return found
+
+    def get(self, kind: str, key: str):
+        return self.get_many(kind, [key]).get(key)
+
+    def put_many(self, kind: str, items: dict):
+        """Stores {key: value} pairs and evicts the oldest entries if over capacity."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO inference_cache(key, kind, value, last_used) VALUES (?, ?, ?, ?)",
+                    [(k, kind, json.dumps(v), now) for k, v in items.items()]
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM inference_cache").fetchone()[0]
+                excess = max(0, count - self.max_entries)
+                if excess:
+                    self._conn.execute(
+                        "DELETE FROM inference_cache WHERE key IN "
+                        "(SELECT key FROM inference_cache ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                self._conn.commit()
+                self.evictions += excess
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                self.errors += 1
+                logger.warning("Inference cache store failed (%s); %d %s results not cached", e, len(items), kind)
+
+    def put(self, kind: str, key: str, value):
+        self.put_many(kind, {key: value})
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM inference_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters per kind plus the current size."""
+        with self._lock:
+            try:
+                size = self._conn.execute("SELECT COUNT(*) FROM inference_cache").fetchone()[0]
+            except sqlite3.Error:
+                size = None
+        stats = {"size": size, "max_entries": self.max_entries, "evictions": self.evictions, "errors": self.errors}
+        for kind in set(self.hits) | set(self.misses):
+            total = self.hits[kind] + self.misses[kind]
+            stats[kind] = {
+                "hits": self.hits[kind],
+                "misses": self.misses[kind],
+                "hit_rate": round(self.hits[kind] / total, 3) if total else 0.0,
+            }
+        return stats
+
+
+_inference_cache = None
+_inference_cache_lock = threading.Lock()
+
+def get_inference_cache() -> InferenceCache:
+    """Returns the process-wide inference cache, opening it on first use."""
+    global _inference_cache
+    with _inference_cache_lock:
+        if _inference_cache is None:
+            _inference_cache = InferenceCache()
+    return _inference_cache
@@ -1,76 +1,311 @@
 """
 db.py
-Handles database initialisation and saving of articles
+Handles database initialisation and saving of articles.
+Writes go through a persistent ArticleWriter: one WAL-mode connection, rows
+buffered and inserted with executemany in chunked transactions.
 """
 import sqlite3
 import os
+import time
 import logging
 import json
 import hashlib
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .migrations import migrate_sqlite, published_to_epoch
 
 # DB helper function
 DB_PATH = os.path.join(os.path.dirname(__file__), "articles.db")
 
+# Connection settings for every articles.db connection.
+# WAL lets readers (API, sync, view_articles) run while the pipeline writes;
+# synchronous=NORMAL is durable across application crashes in WAL mode.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,        # 64 MB page cache (negative = KiB)
+    "mmap_size": 268435456,      # 256 MB memory-mapped reads
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,        # ms to wait for another writer's lock
+}
+
+ARTICLE_COLUMNS = ["id", "title", "link", "text", "published", "published_ts", "source", "categories",
+                   "summary", "cluster_id"]
+
+INSERT_ARTICLE_SQL = f"""
+    INSERT OR IGNORE INTO articles ({', '.join(ARTICLE_COLUMNS)})
+    VALUES ({', '.join('?' for _ in ARTICLE_COLUMNS)})
+"""
+
+INSERT_CATEGORY_SQL = "INSERT OR IGNORE INTO article_categories (article_id, category) VALUES (?, ?)"
+
+
+def connect(path: Optional[str] = None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Opens articles.db (or `path`) with the tuned PRAGMAS applied."""
+    conn = sqlite3.connect(path or DB_PATH, check_same_thread=check_same_thread)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
 def init_db():
-    """Initialize SQLite DB and create table if not exists."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""              
-        CREATE TABLE IF NOT EXISTS articles(
-            id TEXT PRIMARY KEY,
-            title TEXT,
-            link TEXT,
-            text TEXT,
-            published TEXT,
-            source TEXT,
-            categories TEXT,
-            summary TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
-    logging.info("Database initialised at %s", DB_PATH)
-    
-    
+    """Initialize SQLite DB and bring its schema up to date (see migrations.py)."""
+    conn = connect()
+    try:
+        version = migrate_sqlite(conn)
+    finally:
+        conn.close()
+    logging.info("Database initialised at %s (schema v%d)", DB_PATH, version)
+
+
 def _generate_id(article):
     """Generate uid from link_published if not provided."""
     base = (article.get("link", "") + article.get("published", "")).encode("utf-8")
     return hashlib.md5(base).hexdigest()
 
+
+def _article_row(art) -> Tuple[tuple, List[tuple]]:
+    """
+    Converts an article dict into a row for INSERT_ARTICLE_SQL plus its
+    rows for INSERT_CATEGORY_SQL.
+    """
+    article_id = art.get("id") or _generate_id(art)
+    categories = art.get("categories", [])
+    category_rows = [(article_id, c) for c in categories if isinstance(c, str)] if isinstance(categories, list) else []
+    if isinstance(categories, (list, dict)):
+        categories = json.dumps(categories)
+    elif categories == None:
+        categories = "[]"
+    row = (
+        article_id,
+        art.get("title"),
+        art.get("link"),
+        art.get("text"),
+        art.get("published"),
+        published_to_epoch(art.get("published")),
+        art.get("source"),
+        categories,
+        art.get("summary"),
+        art.get("cluster_id"),
+    )
+    return row, category_rows
+
+
+class ArticleWriter:
+    """
+    Buffered, transactional writer for the articles table.
+
+    Articles passed to write() are buffered and flushed when `flush_every` are
+    pending or `flush_interval` seconds have passed since the last flush. A flush
+    inserts the buffer with executemany, `chunk_size` articles (and their
+    article_categories rows) per transaction. If a chunk fails it is retried
+    article by article, so one bad article doesn't drop its neighbours.
+
+    If `on_saved` is set, it is called with the ids of each chunk once the chunk
+    is committed (the pipelines use it to mark articles as processed only after
+    they are durably saved).
+
+    Args:
+        path (str): SQLite file (default DB_PATH).
+        flush_every (int): Pending articles that trigger a flush.
+        flush_interval (float): Seconds after which pending articles are flushed.
+        chunk_size (int): Rows per transaction.
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_every: int = 50, flush_interval: float = 5.0,
+                 chunk_size: int = 500):
+        self.path = path or DB_PATH
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+        self._pending: List[Tuple[tuple, List[tuple]]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = connect(self.path, check_same_thread=False)
+        self.on_saved: Optional[Callable[[List[str]], None]] = None
+        self._stats = {"written": 0, "inserted": 0, "failed": 0, "flushes": 0, "seconds": 0.0}
+
+    def write(self, articles: List[Dict]):
+        """Buffers articles, flushing if the size or time threshold is reached."""
+        rows = []
+        for art in articles:
+            try:
+                rows.append(_article_row(art))
+            except Exception as e:
+                logging.error("Failed to save article '%s':%s", art.get("title"), e)
+        with self._lock:
+            self._pending.extend(rows)
+            if self._due():
+                self._flush_locked()
+
+    def _due(self) -> bool:
+        return bool(self._pending) and (
+            len(self._pending) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush_if_due(self):
+        """Flushes if the time threshold has passed; for callers that are idle between writes."""
+        with self._lock:
+            if self._due():
+                self._flush_locked()
+
+    def flush(self) -> int:
+        """Writes every pending article. Returns the number of new rows inserted."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        pending, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        start = time.perf_counter()
+        inserted = 0
+        for i in range(0, len(pending), self.chunk_size):
+            chunk = pending[i:i + self.chunk_size]
+            try:
+                with self._conn:  # one transaction per chunk
+                    inserted += self._insert(chunk)
+                self._saved(chunk)
+            except sqlite3.Error as e:
+                logging.error("Chunk insert failed (%s); retrying %d rows one by one", e, len(chunk))
+                for entry in chunk:
+                    try:
+                        with self._conn:
+                            inserted += self._insert([entry])
+                        self._saved([entry])
+                    except sqlite3.Error as e2:
+                        self._stats["failed"] += 1
+                        logging.error("Failed to save article '%s':%s", entry[0][1], e2)
+
+        self._stats["written"] += len(pending)
+        self._stats["inserted"] += inserted
+        self._stats["flushes"] += 1
+        self._stats["seconds"] += time.perf_counter() - start
+        logging.info("Saved %d articles to DB (%d new)", len(pending), inserted)
+        return inserted
+
+    def _saved(self, entries: List[Tuple[tuple, List[tuple]]]):
+        if self.on_saved is not None:
+            self.on_saved([row[0] for row, _ in entries])
+
+    def _insert(self, entries: List[Tuple[tuple, List[tuple]]]) -> int:
+        """
+        Inserts the articles that aren't stored yet, with their categories; returns
+        how many were new. Existing articles (and their categories) are left as is.
+        """
+        ids = [row[0] for row, _ in entries]
+        known = set()
+        for i in range(0, len(ids), 500):  # stay under SQLite's variable limit
+            chunk = ids[i:i + 500]
+            known.update(r[0] for r in self._conn.execute(
+                f"SELECT id FROM articles WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        new_entries = []
+        for entry in entries:
+            if entry[0][0] not in known:  # also keeps only the first of repeated ids
+                known.add(entry[0][0])
+                new_entries.append(entry)
+        self._conn.executemany(INSERT_ARTICLE_SQL, [row for row, _ in new_entries])
+        self._conn.executemany(INSERT_CATEGORY_SQL, [c for _, cats in new_entries for c in cats])
+        return len(new_entries)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            s = dict(self._stats)
+        s["rows_per_s"] = round(s["written"] / s["seconds"], 1) if s["seconds"] else None
+        s["seconds"] = round(s["seconds"], 3)
+        return s
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_article_writer: Optional[ArticleWriter] = None
+_article_writer_lock = threading.Lock()
+
+def get_article_writer() -> ArticleWriter:
+    """Returns the process-wide article writer, opening it on first use."""
+    global _article_writer
+    with _article_writer_lock:
+        if _article_writer is None:
+            _article_writer = ArticleWriter()
+    return _article_writer
+
+
 def save_articles_to_db(articles):
-    """Insert articles into the DB, ignoring duplicates."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    for art in articles:
-        try:
-            art_id = art.get("id") or _generate_id(art)
-            
-            categories = art.get("categories", [])
-            if isinstance(categories, (list, dict)):
-                categories = json.dumps(categories)
-            elif categories == None:
-                categories = "[]"
-                
-            c.execute(""" 
-                INSERT OR IGNORE INTO articles
-                (id, title, link, text, published, source, categories, summary)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,(
-            art_id,
-            art.get("title"),
-            art.get("link"),
-            art.get("text"),
-            art.get("published"),
-            art.get("source"),
-            categories,
-            art.get("summary"),
-        ))
-            
-        except Exception as e:
-            logging.error("Failed to save article '%s':%s", art.get("title"), e)
-    
-    conn.commit()
-    conn.close()
-    logging.info("Saved %d articles to DB", len(articles))
-    
-    
\ No newline at end of file
+    """Insert articles into the DB, ignoring duplicates. Written immediately."""
+    writer = get_article_writer()
+    writer.write(articles)
+    writer.flush()
+
+
+# bm25 column weights for (title, summary, text)
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(query: str) -> str:
+    """Turns free text into an FTS5 query: every word must match (prefix match on the last)."""
+    terms = _SEARCH_TERM.findall(query or "")
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_articles(query: str, category: Optional[str] = None, since: Optional[int] = None,
+                    until: Optional[int] = None, limit: int = 20, offset: int = 0,
+                    path: Optional[str] = None) -> List[Dict]:
+    """
+    Ranked full-text search over title, summary and text.
+
+    Args:
+        query (str): Free-text query
+        category (str): Only articles with this category
+        since (int): Only articles published at or after this epoch second
+        until (int): Only articles published before this epoch second
+        limit (int): Results per page
+        offset (int): Results to skip
+        path (str): SQLite file (default DB_PATH)
+
+    Returns:
+        list[dict]: card fields plus a highlighted `snippet` and bm25 `rank` (lower is better)
+    """
+    fts = _fts_query(query)
+    if not fts:
+        return []
+    sql = f"""
+        SELECT a.id, a.title, a.summary, a.source, a.categories, a.link, a.published, a.published_ts,
+               snippet(articles_fts, -1, '<mark>', '</mark>', '…', 24) AS snippet,
+               bm25(articles_fts, {', '.join(str(w) for w in SEARCH_WEIGHTS)}) AS rank
+        FROM articles_fts JOIN articles a ON a.seq = articles_fts.rowid
+        WHERE articles_fts MATCH ?
+          AND (? IS NULL OR EXISTS (
+              SELECT 1 FROM article_categories c WHERE c.article_id = a.id AND c.category = ?))
+          AND (? IS NULL OR a.published_ts >= ?)
+          AND (? IS NULL OR a.published_ts < ?)
+        ORDER BY rank, a.published_ts DESC, a.id DESC
+        LIMIT ? OFFSET ?
+    """
+    conn = connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(sql, (fts, category, category, since, since, until, until, limit, offset)).fetchall()
+    finally:
+        conn.close()
+    return [dict(r) for r in rows]
@@ -0,0 +1,136 @@
+"""
+dedup.py
+Index of article ids the pipeline has already processed.
+Backed by an on-disk Bloom filter so it survives the local DB being cleared
+after a sync, and so checking tens of thousands of ids costs microseconds each.
+"""
+import os
+import math
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from .db import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+SEEN_IDS_PATH = os.path.join(os.path.dirname(__file__), "seen_ids.bloom")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Args:
+        capacity (int): Expected number of items.
+        error_rate (float): Target false-positive rate at capacity.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def save(self, path: str):
+        """Writes the filter to disk atomically."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            header = f"{self.capacity} {self.error_rate} {self.count}\n".encode("ascii")
+            f.write(header)
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as f:
+            capacity, error_rate, count = f.readline().decode("ascii").split()
+            bloom = cls(int(capacity), float(error_rate))
+            bloom.bits = bytearray(f.read())
+            bloom.count = int(count)
+        if len(bloom.bits) != (bloom.num_bits + 7) // 8:
+            raise ValueError(f"Corrupt Bloom filter file: {path}")
+        return bloom
+
+
+class SeenIndex:
+    """
+    Thread-safe set-like index of processed article ids.
+
+    On first use (no file on disk yet) it is seeded from the ids already in
+    the articles table.
+
+    Args:
+        path (str): Bloom filter file.
+        db_path (str): SQLite DB used to seed a fresh index.
+        capacity (int): Expected number of ids.
+        error_rate (float): False-positive rate (a false positive skips a new article).
+    """
+
+    def __init__(self, path: str = SEEN_IDS_PATH, db_path: str = DB_PATH,
+                 capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.bloom = None
+        if os.path.exists(path):
+            try:
+                self.bloom = BloomFilter.load(path)
+            except Exception as e:
+                logger.error("Could not load seen-id index %s, rebuilding: %s", path, e)
+        if self.bloom is None:
+            self.bloom = BloomFilter(capacity, error_rate)
+            self._seed_from_db(db_path)
+        if self.bloom.count > self.bloom.capacity:
+            logger.warning("Seen-id index holds %d ids (capacity %d); false-positive rate is rising",
+                           self.bloom.count, self.bloom.capacity)
+
+    def _seed_from_db(self, db_path: str):
+        if not os.path.exists(db_path):
+            return
+        try:
+            conn = sqlite3.connect(db_path)
+            seeded = 0
+            for (art_id,) in conn.execute("SELECT id FROM articles"):
+                self.bloom.add(art_id)
+                seeded += 1
+            conn.close()
+            self._dirty = seeded > 0
+            logger.info("Seeded seen-id index with %d ids from DB", seeded)
+        except sqlite3.Error as e:
+            logger.warning("Could not seed seen-id index from DB: %s", e)
+
+    def __contains__(self, art_id: str) -> bool:
+        return art_id in self.bloom
+
+    def add_many(self, ids):
+        with self._lock:
+            for art_id in ids:
+                if art_id and art_id not in self.bloom:
+                    self.bloom.add(art_id)
+                    self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                self.bloom.save(self.path)
+                self._dirty = False
+                logger.info("Saved seen-id index (%d ids) to %s", self.bloom.count, self.path)
@@ -0,0 +1,424 @@
+"""
+migrations.py
+Versioned schema migrations for the local SQLite articles.db and the Postgres
+(Supabase) mirror. Both targets get the same layout:
+- articles, with a normalized epoch `published_ts` (indexed with id for newest-first paging)
+- article_categories(article_id, category), indexed by category
+- indexes on articles.source and articles.cluster_id
+- full-text search over title, summary and text (FTS5 locally, a GIN-indexed
+  tsvector plus a search_articles() function in Postgres)
+Locally, articles.synced_at additionally tracks which rows still need syncing (with
+articles.revision counting changes, so a row edited mid-sync is not marked synced),
+and articles.seq is an explicit rowid alias so the FTS5 index survives VACUUM.
+
+SQLite records the applied version in PRAGMA user_version, Postgres in a
+schema_migrations table. Each migration runs in its own transaction.
+"""
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Step = Union[str, Callable]
+Migration = Tuple[int, str, List[Step]]
+
+# Article columns mirrored to Postgres; a local change to any of them marks the row for sync
+SYNCED_COLUMNS = ["id", "title", "link", "text", "published", "published_ts", "source", "categories",
+                  "summary", "cluster_id"]
+
+
+def published_to_epoch(value) -> Optional[int]:
+    """
+    Parses an RSS/Atom publish date (RFC 822 or ISO 8601) to UTC epoch seconds.
+    Naive timestamps are taken as UTC. Returns None if the value can't be parsed.
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+# ---------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------
+
+def _sqlite_add_cluster_id(conn):
+    # Tables created before story clustering lack the column
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+    if "cluster_id" not in columns:
+        conn.execute("ALTER TABLE articles ADD COLUMN cluster_id TEXT")
+
+
+def _sqlite_backfill_published_ts(conn):
+    conn.create_function("published_to_epoch", 1, published_to_epoch, deterministic=True)
+    conn.execute("UPDATE articles SET published_ts = published_to_epoch(published) WHERE published_ts IS NULL")
+
+
+SQLITE_MIGRATIONS: List[Migration] = [
+    (1, "articles table", [
+        """
+        CREATE TABLE IF NOT EXISTS articles(
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            link TEXT,
+            text TEXT,
+            published TEXT,
+            source TEXT,
+            categories TEXT,
+            summary TEXT,
+            cluster_id TEXT
+        )
+        """,
+        _sqlite_add_cluster_id,
+    ]),
+    (2, "published_ts epoch column", [
+        "ALTER TABLE articles ADD COLUMN published_ts INTEGER",
+        _sqlite_backfill_published_ts,
+        "CREATE INDEX IF NOT EXISTS idx_articles_published_ts ON articles(published_ts DESC, id DESC)",
+    ]),
+    (3, "article_categories join table", [
+        """
+        CREATE TABLE IF NOT EXISTS article_categories(
+            article_id TEXT NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+            category TEXT NOT NULL,
+            PRIMARY KEY (article_id, category)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_article_categories_category ON article_categories(category, article_id)",
+        # Foreign keys are off by default in SQLite; keep the join table clean regardless
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_delete_categories AFTER DELETE ON articles
+        BEGIN
+            DELETE FROM article_categories WHERE article_id = OLD.id;
+        END
+        """,
+        """
+        INSERT OR IGNORE INTO article_categories(article_id, category)
+        SELECT a.id, j.value FROM articles a, json_each(a.categories) j
+        WHERE json_valid(a.categories) AND json_type(a.categories) = 'array'
+        """,
+    ]),
+    (4, "source and cluster indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_cluster_id ON articles(cluster_id)",
+    ]),
+    (5, "sync change tracking", [
+        # NULL = not yet in Postgres (new or changed since the last sync)
+        "ALTER TABLE articles ADD COLUMN synced_at REAL",
+        "CREATE INDEX IF NOT EXISTS idx_articles_unsynced ON articles(synced_at) WHERE synced_at IS NULL",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_articles_dirty
+        AFTER UPDATE OF {', '.join(SYNCED_COLUMNS)} ON articles
+        BEGIN
+            UPDATE articles SET synced_at = NULL WHERE id = NEW.id;
+        END
+        """,
+    ]),
+    (6, "full-text search", [
+        # External-content FTS5 index over articles, kept in sync by triggers
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, text,
+            content='articles', content_rowid='rowid', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_fts_insert AFTER INSERT ON articles
+        BEGIN
+            INSERT INTO articles_fts(rowid, title, summary, text) VALUES (NEW.rowid, NEW.title, NEW.summary, NEW.text);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete AFTER DELETE ON articles
+        BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, text)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.summary, OLD.text);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_articles_fts_update AFTER UPDATE OF title, summary, text ON articles
+        BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, text)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.summary, OLD.text);
+            INSERT INTO articles_fts(rowid, title, summary, text) VALUES (NEW.rowid, NEW.title, NEW.summary, NEW.text);
+        END
+        """,
+        "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+    ]),
+    (7, "explicit rowid alias for articles", [
+        # articles_fts is keyed on the implicit rowid of an `id TEXT PRIMARY KEY` table,
+        # which VACUUM may renumber. Rebuild the table around an INTEGER PRIMARY KEY
+        # (kept by VACUUM) and point the index at it. Existing rowids carry over.
+        "DROP TRIGGER IF EXISTS trg_articles_fts_insert",
+        "DROP TRIGGER IF EXISTS trg_articles_fts_delete",
+        "DROP TRIGGER IF EXISTS trg_articles_fts_update",
+        "DROP TABLE IF EXISTS articles_fts",
+        """
+        CREATE TABLE articles_v7(
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT,
+            link TEXT,
+            text TEXT,
+            published TEXT,
+            source TEXT,
+            categories TEXT,
+            summary TEXT,
+            cluster_id TEXT,
+            published_ts INTEGER,
+            synced_at REAL
+        )
+        """,
+        """
+        INSERT INTO articles_v7(seq, id, title, link, text, published, source, categories, summary,
+                                cluster_id, published_ts, synced_at)
+        SELECT rowid, id, title, link, text, published, source, categories, summary,
+               cluster_id, published_ts, synced_at
+        FROM articles
+        """,
+        # Foreign keys are off, so this doesn't cascade into article_categories
+        "DROP TABLE articles",
+        "ALTER TABLE articles_v7 RENAME TO articles",
+        "CREATE INDEX idx_articles_published_ts ON articles(published_ts DESC, id DESC)",
+        "CREATE INDEX idx_articles_source ON articles(source)",
+        "CREATE INDEX idx_articles_cluster_id ON articles(cluster_id)",
+        "CREATE INDEX idx_articles_unsynced ON articles(synced_at) WHERE synced_at IS NULL",
+        """
+        CREATE TRIGGER trg_articles_delete_categories AFTER DELETE ON articles
+        BEGIN
+            DELETE FROM article_categories WHERE article_id = OLD.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER trg_articles_dirty
+        AFTER UPDATE OF {', '.join(SYNCED_COLUMNS)} ON articles
+        BEGIN
+            UPDATE articles SET synced_at = NULL WHERE id = NEW.id;
+        END
+        """,
+        """
+        CREATE VIRTUAL TABLE articles_fts USING fts5(
+            title, summary, text,
+            content='articles', content_rowid='seq', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER trg_articles_fts_insert AFTER INSERT ON articles
+        BEGIN
+            INSERT INTO articles_fts(rowid, title, summary, text) VALUES (NEW.seq, NEW.title, NEW.summary, NEW.text);
+        END
+        """,
+        """
+        CREATE TRIGGER trg_articles_fts_delete AFTER DELETE ON articles
+        BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, text)
+            VALUES ('delete', OLD.seq, OLD.title, OLD.summary, OLD.text);
+        END
+        """,
+        """
+        CREATE TRIGGER trg_articles_fts_update AFTER UPDATE OF title, summary, text ON articles
+        BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, title, summary, text)
+            VALUES ('delete', OLD.seq, OLD.title, OLD.summary, OLD.text);
+            INSERT INTO articles_fts(rowid, title, summary, text) VALUES (NEW.seq, NEW.title, NEW.summary, NEW.text);
+        END
+        """,
+        "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+    ]),
+    (8, "sync revision counter", [
+        # Bumped on every change to a synced column; the sync only marks a row
+        # synced if it still has the revision it copied to Postgres
+        "ALTER TABLE articles ADD COLUMN revision INTEGER NOT NULL DEFAULT 0",
+        "DROP TRIGGER IF EXISTS trg_articles_dirty",
+        f"""
+        CREATE TRIGGER trg_articles_dirty
+        AFTER UPDATE OF {', '.join(SYNCED_COLUMNS)} ON articles
+        BEGIN
+            UPDATE articles SET synced_at = NULL, revision = revision + 1 WHERE id = NEW.id;
+        END
+        """,
+    ]),
+]
+
+
+def migrate_sqlite(conn, migrations: List[Migration] = SQLITE_MIGRATIONS) -> int:
+    """
+    Applies pending migrations to a SQLite connection.
+
+    Returns:
+        int: schema version after migrating
+    """
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT, so DDL is transactional too
+    try:
+        for version, description, steps in migrations:
+            if version <= current:
+                continue
+            logger.info("Applying SQLite migration %d: %s", version, description)
+            conn.execute("BEGIN")
+            try:
+                for step in steps:
+                    step(conn) if callable(step) else conn.execute(step)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            current = version
+    finally:
+        conn.isolation_level = isolation_level
+    return current
+
+
+# ---------------------------------------------------------------------
+# Postgres (Supabase)
+# ---------------------------------------------------------------------
+
+def _postgres_backfill_published_ts(cur):
+    from psycopg2.extras import execute_values
+
+    cur.execute("SELECT id, published FROM articles WHERE published_ts IS NULL")
+    updates = [(row[0], published_to_epoch(row[1])) for row in cur.fetchall()]
+    updates = [u for u in updates if u[1] is not None]
+    if updates:
+        execute_values(cur, """
+            UPDATE articles AS a SET published_ts = v.ts
+            FROM (VALUES %s) AS v(id, ts) WHERE a.id = v.id
+        """, updates)
+
+
+POSTGRES_MIGRATIONS: List[Migration] = [
+    (1, "articles table", [
+        """
+        CREATE TABLE IF NOT EXISTS articles(
+            id TEXT PRIMARY KEY,
+            title TEXT,
+            link TEXT,
+            text TEXT,
+            published TEXT,
+            source TEXT,
+            categories TEXT,
+            summary TEXT
+        )
+        """,
+        "ALTER TABLE articles ADD COLUMN IF NOT EXISTS cluster_id TEXT",
+    ]),
+    (2, "published_ts epoch column", [
+        "ALTER TABLE articles ADD COLUMN IF NOT EXISTS published_ts BIGINT",
+        _postgres_backfill_published_ts,
+        "CREATE INDEX IF NOT EXISTS idx_articles_published_ts ON articles(published_ts DESC, id DESC)",
+    ]),
+    (3, "article_categories join table", [
+        """
+        CREATE TABLE IF NOT EXISTS article_categories(
+            article_id TEXT NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+            category TEXT NOT NULL,
+            PRIMARY KEY (article_id, category)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_article_categories_category ON article_categories(category, article_id)",
+        """
+        INSERT INTO article_categories(article_id, category)
+        SELECT id, jsonb_array_elements_text(categories::jsonb) FROM articles
+        WHERE categories LIKE '[%'
+        ON CONFLICT DO NOTHING
+        """,
+    ]),
+    (4, "source and cluster indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_cluster_id ON articles(cluster_id)",
+    ]),
+    (5, "full-text search", [
+        """
+        ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(text, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_articles_search_tsv ON articles USING GIN (search_tsv)",
+        # Called by the API through PostgREST (supabase.rpc); snippets are only built for the returned page
+        """
+        CREATE OR REPLACE FUNCTION search_articles(
+            p_query TEXT, p_category TEXT DEFAULT NULL, p_since BIGINT DEFAULT NULL,
+            p_until BIGINT DEFAULT NULL, p_limit INTEGER DEFAULT 20, p_offset INTEGER DEFAULT 0
+        )
+        RETURNS TABLE(id TEXT, title TEXT, summary TEXT, source TEXT, categories TEXT, link TEXT,
+                      published TEXT, published_ts BIGINT, snippet TEXT, rank REAL)
+        LANGUAGE sql STABLE AS $$
+            WITH q AS (SELECT websearch_to_tsquery('english', p_query) AS tsq),
+            hits AS (
+                SELECT a.*, ts_rank_cd(a.search_tsv, q.tsq) AS rank
+                FROM articles a, q
+                WHERE a.search_tsv @@ q.tsq
+                  AND (p_category IS NULL OR EXISTS (
+                      SELECT 1 FROM article_categories c WHERE c.article_id = a.id AND c.category = p_category))
+                  AND (p_since IS NULL OR a.published_ts >= p_since)
+                  AND (p_until IS NULL OR a.published_ts < p_until)
+                ORDER BY rank DESC, a.published_ts DESC NULLS LAST, a.id DESC
+                LIMIT p_limit OFFSET p_offset
+            )
+            SELECT h.id, h.title, h.summary, h.source, h.categories, h.link, h.published, h.published_ts,
+                   ts_headline('english', coalesce(h.summary, '') || ' ' || coalesce(h.text, ''), q.tsq,
+                               'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10'),
+                   h.rank
+            FROM hits h, q
+            ORDER BY h.rank DESC, h.published_ts DESC NULLS LAST, h.id DESC
+        $$
+        """,
+    ]),
+    (6, "newest-first index with undated articles last", [
+        # Matches ORDER BY published_ts DESC NULLS LAST, id DESC used by the API
+        "DROP INDEX IF EXISTS idx_articles_published_ts",
+        "CREATE INDEX idx_articles_published_ts ON articles(published_ts DESC NULLS LAST, id DESC)",
+    ]),
+]
+
+
+def migrate_postgres(conn, migrations: List[Migration] = POSTGRES_MIGRATIONS) -> int:
+    """
+    Applies pending migrations to a psycopg2 connection.
+
+    Returns:
+        int: schema version after migrating
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations(
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMPTZ DEFAULT now()
+            )
+        """)
+        cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+        current = cur.fetchone()[0]
+    conn.commit()
+
+    for version, description, steps in migrations:
+        if version <= current:
+            continue
+        logger.info("Applying Postgres migration %d: %s", version, description)
+        try:
+            with conn.cursor() as cur:
+                for step in steps:
+                    step(cur) if callable(step) else cur.execute(step)
+                cur.execute("INSERT INTO schema_migrations(version, description) VALUES (%s, %s)",
+                            (version, description))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = version
+    return current
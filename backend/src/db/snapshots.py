@@ -0,0 +1,180 @@
+"""
+snapshots.py
+Precomputed JSON snapshots of the frontend's first views: the newest articles
+overall and per category, a few pages each. Written by sync_to_supabase.py after
+each sync, from rows already in Postgres, so every id they list resolves through
+the API and their keyset cursors continue into the live table. Served by the API
+without touching the database.
+
+Page files are named by content hash (all-p1.3f2a…json, cat-ai-p1.…json), so they
+never change once written and can be cached indefinitely. manifest.json maps
+each view to its current files and is replaced atomically last; readers that
+see the new manifest always find its files in place.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from .db import connect
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR") or os.path.join(os.path.dirname(__file__), "snapshots")
+MANIFEST_NAME = "manifest.json"
+
+# Matches the API's and frontend's default page size
+SNAPSHOT_PAGE_SIZE = 20
+SNAPSHOT_PAGES = 3
+
+CARD_COLUMNS = ["id", "title", "summary", "source", "categories", "link", "published", "published_ts"]
+
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def _slug(category: str) -> str:
+    return _SLUG.sub("-", category.lower()).strip("-") or "uncategorized"
+
+
+def _atomic_write(path: str, data: bytes):
+    """Writes via a temp file in the same directory and renames it over `path`."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _card_pages(conn, category: Optional[str], page_size: int, pages: int) -> List[List[Dict]]:
+    # Synced rows only. SQLite sorts NULLs last under DESC, like the API's
+    # `published_ts DESC NULLS LAST, id DESC`.
+    columns = ", ".join(f"a.{c}" for c in CARD_COLUMNS)
+    if category is None:
+        sql = f"""
+            SELECT {columns} FROM articles a WHERE a.synced_at IS NOT NULL
+            ORDER BY a.published_ts DESC, a.id DESC LIMIT ?
+        """
+        params = (page_size * pages,)
+    else:
+        sql = f"""
+            SELECT {columns} FROM article_categories c JOIN articles a ON a.id = c.article_id
+            WHERE c.category = ? AND a.synced_at IS NOT NULL
+            ORDER BY a.published_ts DESC, a.id DESC LIMIT ?
+        """
+        params = (category, page_size * pages)
+    rows = [dict(zip(CARD_COLUMNS, r)) for r in conn.execute(sql, params)]
+    return [rows[i:i + page_size] for i in range(0, len(rows), page_size)]
+
+
+def read_manifest(directory: str = SNAPSHOT_DIR) -> Optional[Dict]:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshots(db_path: Optional[str] = None, directory: str = SNAPSHOT_DIR,
+                    page_size: int = SNAPSHOT_PAGE_SIZE, pages: int = SNAPSHOT_PAGES) -> Dict:
+    """
+    Materializes the snapshot pages and manifest from the local DB's synced rows.
+
+    Args:
+        db_path (str): SQLite file (default DB_PATH)
+        directory (str): Output directory
+        page_size (int): Articles per page
+        pages (int): Pages per view
+
+    Returns:
+        dict: the manifest (unchanged, with the same version, if no page changed)
+    """
+    os.makedirs(directory, exist_ok=True)
+    conn = connect(db_path)
+    try:
+        categories = [r[0] for r in conn.execute("""
+            SELECT DISTINCT c.category FROM article_categories c JOIN articles a ON a.id = c.article_id
+            WHERE a.synced_at IS NOT NULL ORDER BY c.category
+        """)]
+        views = {"all": (None, "all")}
+        views.update({f"category:{c}": (c, f"cat-{_slug(c)}") for c in categories})
+
+        manifest_views = {}
+        written = 0
+        for view, (category, prefix) in views.items():
+            entries = []
+            for number, page in enumerate(_card_pages(conn, category, page_size, pages), 1):
+                body = json.dumps(page, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+                name = f"{prefix}-p{number}.{hashlib.sha256(body).hexdigest()[:16]}.json"
+                path = os.path.join(directory, name)
+                if not os.path.exists(path):  # content-addressed: an existing file is identical
+                    _atomic_write(path, body)
+                    written += 1
+                last = page[-1]
+                entries.append({
+                    "file": name,
+                    "count": len(page),
+                    # keyset position after this page, for continuing through the API
+                    "last": [last["published_ts"], last["id"]] if len(page) == page_size else None,
+                })
+            manifest_views[view] = entries
+    finally:
+        conn.close()
+
+    previous = read_manifest(directory)
+    if previous and previous.get("views") == manifest_views:
+        return previous
+
+    manifest = {
+        "version": (previous or {}).get("version", 0) + 1,
+        "generated_at": int(time.time()),
+        "page_size": page_size,
+        "views": manifest_views,
+    }
+    _atomic_write(os.path.join(directory, MANIFEST_NAME), json.dumps(manifest, indent=1).encode("utf-8"))
+    _prune(directory, manifest, previous)
+    logger.info("Snapshots v%d written: %d views, %d new files", manifest["version"], len(manifest_views), written)
+    return manifest
+
+
+def _prune(directory: str, manifest: Dict, previous: Optional[Dict]):
+    """Deletes page files referenced by neither the new nor the previous manifest."""
+    keep = {MANIFEST_NAME}
+    for m in (manifest, previous or {}):
+        keep.update(e["file"] for entries in m.get("views", {}).values() for e in entries)
+    for name in os.listdir(directory):
+        if name not in keep and name.endswith(".json"):
+            try:
+                os.unlink(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def snapshot_article_ids(directory: str = SNAPSHOT_DIR) -> List[str]:
+    """Ids of every article in the current snapshot."""
+    manifest = read_manifest(directory)
+    ids = set()
+    for entries in (manifest or {}).get("views", {}).values():
+        for entry in entries:
+            try:
+                with open(os.path.join(directory, entry["file"]), "rb") as f:
+                    ids.update(card["id"] for card in json.load(f))
+            except (OSError, ValueError):
+                continue
+    return sorted(ids)
+
+
+def refresh_snapshots():
+    """write_snapshots() after a sync: failures are logged, never raised."""
+    try:
+        write_snapshots()
+    except Exception:
+        logger.exception("Failed to write feed snapshots")
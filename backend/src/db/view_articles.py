@@ -30,8 +30,19 @@
 #     print_articles(limit=10)
     
     
+"""
+Prints the newest article summaries, or ranked full-text matches for a query.
+
+Usage:
+    python -m src.db.view_articles
+    python -m src.db.view_articles "open source llm" --limit 5
+"""
+import argparse
 import sqlite3
 import os
+
+from .db import search_articles
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "articles.db")
 
 def print_summaries(limit=10):
@@ -41,7 +52,7 @@ def print_summaries(limit=10):
     cursor.execute(f"""
         SELECT title, summary, published, categories
         FROM articles 
-        ORDER BY published DESC
+        ORDER BY published_ts DESC, id DESC
         LIMIT {limit};
     """)
     
@@ -54,5 +65,23 @@ def print_summaries(limit=10):
     
     conn.close()
 
+def print_search_results(query, limit=10):
+    articles = search_articles(query, limit=limit, path=DB_PATH)
+    if not articles:
+        print("No matching articles.")
+        return
+
+    for i, article in enumerate(articles, 1):
+        print(f"{i}. {article['title']} ({article['published']} {article['categories']})\n")
+        print(f"Match: {article['snippet']}\n")
+        print("-" * 80)
+
 if __name__ == "__main__":
-    print_summaries()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", nargs="?", help="full-text query (default: newest articles)")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    if args.query:
+        print_search_results(args.query, args.limit)
+    else:
+        print_summaries(args.limit)
@@ -3,5 +3,6 @@ This package contains the Fetcher agent for retrieving raw news feeds.
 """
 
 from .fetcher import Fetcher
+from .async_fetcher import AsyncFetcher
 
-__all__ = ["Fetcher"]
+__all__ = ["Fetcher", "AsyncFetcher"]
@@ -0,0 +1,114 @@
+"""
+bench_extractors.py
+Compares content extractors on a saved corpus of article pages:
+output parity against the original BeautifulSoup extractor and pages/sec.
+
+Usage (from backend/):
+    python -m src.fetcher.bench_extractors corpus/ --save --per-feed 5   # download pages once
+    python -m src.fetcher.bench_extractors corpus/                       # run the benchmark
+"""
+import argparse
+import difflib
+import hashlib
+import logging
+import os
+import time
+
+from .fetcher import Fetcher
+from .extractors import EXTRACTORS, get_extractor
+
+logger = logging.getLogger(__name__)
+
+
+def save_corpus(corpus_dir: str, per_feed: int = 5):
+    """Downloads article pages from every configured feed into corpus_dir as .html files."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    fetcher = Fetcher(extract_full_content=False, use_http_cache=False, use_feed_state=False)
+    articles = fetcher.fetch(limit=per_feed)
+    saved = 0
+    for art in articles:
+        link = art.get("link")
+        if not link:
+            continue
+        try:
+            response = fetcher.session.get(link, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            logger.debug(f"Skipping {link}: {e}")
+            continue
+        name = hashlib.md5(link.encode()).hexdigest() + ".html"
+        with open(os.path.join(corpus_dir, name), "wb") as f:
+            f.write(response.content)
+        saved += 1
+    logger.info(f"Saved {saved} pages to {corpus_dir}")
+
+
+def load_corpus(corpus_dir: str):
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(".html"):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                pages.append(f.read())
+    return pages
+
+
+def run_benchmark(corpus_dir: str, baseline: str = "soup", repeat: int = 3):
+    """
+    Runs every extractor over the corpus.
+
+    Returns:
+        dict: per extractor pages/sec, plus exact-match rate and mean text
+        similarity against the baseline extractor
+    """
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        raise ValueError(f"No .html pages found in {corpus_dir}")
+
+    outputs = {}
+    report = {}
+    for name in EXTRACTORS:
+        extractor = get_extractor(name)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = []
+            for html in pages:
+                try:
+                    results.append(extractor.extract(html))
+                except Exception:
+                    results.append(None)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        outputs[name] = results
+        report[name] = {"pages": len(pages), "seconds": round(best, 3), "pages_per_sec": round(len(pages) / best, 1)}
+
+    for name, results in outputs.items():
+        if name == baseline:
+            continue
+        exact = 0
+        similarity = 0.0
+        for ours, theirs in zip(results, outputs[baseline]):
+            if ours == theirs:
+                exact += 1
+                similarity += 1.0
+            elif ours and theirs:
+                similarity += difflib.SequenceMatcher(None, ours, theirs).ratio()
+        report[name]["exact_match"] = round(exact / len(pages), 3)
+        report[name]["mean_similarity"] = round(similarity / len(pages), 3)
+        report[name]["speedup"] = round(report[baseline]["seconds"] / report[name]["seconds"], 2)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Benchmark article content extractors")
+    parser.add_argument("corpus", help="Directory of saved .html pages")
+    parser.add_argument("--save", action="store_true", help="Download a fresh corpus into the directory first")
+    parser.add_argument("--per-feed", type=int, default=5, help="Pages per feed when saving")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    if args.save:
+        save_corpus(args.corpus, per_feed=args.per_feed)
+    for name, stats in run_benchmark(args.corpus, repeat=args.repeat).items():
+        print(f"{name}: {stats}")
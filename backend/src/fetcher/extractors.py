@@ -0,0 +1,171 @@
+"""
+extractors.py
+Pluggable main-content extractors for downloaded article pages.
+- SoupExtractor: the original BeautifulSoup/html.parser implementation
+- LxmlExtractor: lxml-based, matches every content selector in one traversal
+  and stops reading text once the length cap is reached
+"""
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Elements whose text never counts as article content
+REMOVED_TAGS = ["script", "style", "nav", "header", "footer", "aside"]
+
+# Try to find main content (common patterns), in priority order
+CONTENT_SELECTORS = [
+    'article',
+    '[role="main"]',
+    '.article-content',
+    '.post-content',
+    '.entry-content',
+    'main',
+    '.content'
+]
+
+MIN_CONTENT_CHARS = 200  # Ensure we got substantial content
+MIN_TEXT_CHARS = 100
+MAX_TEXT_CHARS = 5000  # Limit length to avoid token issues
+
+
+def _finalize(text: Optional[str]) -> Optional[str]:
+    """Normalizes whitespace, applies the length cap and rejects tiny texts."""
+    if text:
+        # Remove excessive whitespace
+        text = ' '.join(text.split())
+        if len(text) > MAX_TEXT_CHARS:
+            text = text[:MAX_TEXT_CHARS] + "..."
+    return text if text and len(text) > MIN_TEXT_CHARS else None
+
+
+class SoupExtractor:
+    """Original extractor: BeautifulSoup with the pure-Python html.parser."""
+
+    name = "soup"
+
+    def extract(self, html) -> Optional[str]:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Remove script and style elements
+        for script in soup(REMOVED_TAGS):
+            script.decompose()
+
+        text = None
+        for selector in CONTENT_SELECTORS:
+            content = soup.select_one(selector)
+            if content:
+                text = content.get_text(separator=' ', strip=True)
+                if len(text) > MIN_CONTENT_CHARS:
+                    break
+
+        # Fallback: get all paragraphs
+        if not text or len(text) < MIN_CONTENT_CHARS:
+            paragraphs = soup.find_all('p')
+            text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+
+        return _finalize(text)
+
+
+class LxmlExtractor:
+    """
+    lxml extractor with the same selection rules as SoupExtractor.
+
+    Unwanted elements are stripped in C, then a single pass over the tree records
+    the first element matching each selector. Text is read from the best candidate
+    only until the cap is exceeded.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._etree = etree
+
+    @staticmethod
+    def _matched_selectors(el):
+        """Indexes into CONTENT_SELECTORS that this element matches."""
+        tag = el.tag
+        classes = el.get("class")
+        classes = classes.split() if classes else ()
+        return [
+            i for i, hit in enumerate((
+                tag == "article",
+                el.get("role") == "main",
+                "article-content" in classes,
+                "post-content" in classes,
+                "entry-content" in classes,
+                tag == "main",
+                "content" in classes,
+            )) if hit
+        ]
+
+    @staticmethod
+    def _capped_text(el, limit: int) -> str:
+        """Whitespace-normalized text of an element, read until `limit` chars are exceeded."""
+        words = []
+        length = 0
+        for chunk in el.itertext():
+            for word in chunk.split():
+                words.append(word)
+                length += len(word) + 1
+            if length > limit:
+                break
+        return ' '.join(words)
+
+    def extract(self, html) -> Optional[str]:
+        etree = self._etree
+        root = self._html.fromstring(html)
+        etree.strip_elements(root, etree.Comment, etree.ProcessingInstruction, *REMOVED_TAGS, with_tail=False)
+
+        # Single traversal: first match for every selector
+        first_match = [None] * len(CONTENT_SELECTORS)
+        remaining = len(CONTENT_SELECTORS)
+        for el in root.iter():
+            if not isinstance(el.tag, str):
+                continue
+            for i in self._matched_selectors(el):
+                if first_match[i] is None:
+                    first_match[i] = el
+                    remaining -= 1
+            if remaining == 0:
+                break
+
+        for candidate in first_match:
+            if candidate is None:
+                continue
+            text = self._capped_text(candidate, MAX_TEXT_CHARS)
+            if len(text) > MIN_CONTENT_CHARS:
+                return _finalize(text)
+
+        # Fallback: get all paragraphs
+        parts = []
+        length = 0
+        for p in root.iter("p"):
+            part = ' '.join(''.join(s.strip() for s in p.itertext()).split())
+            if not part:
+                continue
+            parts.append(part)
+            length += len(part) + 1
+            if length > MAX_TEXT_CHARS + 1:
+                break
+        return _finalize(' '.join(parts))
+
+
+EXTRACTORS = {
+    "soup": SoupExtractor,
+    "lxml": LxmlExtractor,
+}
+
+
+def get_extractor(name: str = "lxml"):
+    """
+    Returns an extractor instance by name ("soup" or "lxml").
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor: {name}. Use one of {list(EXTRACTORS)}")
+    return EXTRACTORS[name]()
@@ -0,0 +1,131 @@
+"""
+feed_state.py
+Persistent per-feed state for incremental fetching.
+For every feed it records a watermark (id of the top entry processed, and the
+newest publish time seen) and an estimate of how often the feed publishes. Fetchers stop
+reading a feed at its watermark, and quiet feeds are polled less often.
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FEED_STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "feed_state.db")
+
+# Adaptive schedule: poll after half the typical gap between entries, clamped
+POLL_FRACTION = 0.5
+MIN_POLL_S = 10 * 60
+MAX_POLL_S = 12 * 3600
+# Each poll that finds nothing new doubles the delay (up to 2**MAX_BACKOFF)
+MAX_BACKOFF = 3
+# Weight of the newest observation in the update-interval estimate
+INTERVAL_ALPHA = 0.3
+
+
+class FeedStateStore:
+    """
+    SQLite-backed watermarks and polling schedule, keyed by feed URL.
+
+    Args:
+        path (str): SQLite file.
+    """
+
+    def __init__(self, path: str = FEED_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS feed_state(
+                feed_url TEXT PRIMARY KEY,
+                last_entry_id TEXT,
+                last_published REAL,
+                interval_s REAL,
+                empty_polls INTEGER DEFAULT 0,
+                last_checked REAL,
+                next_check REAL
+            )
+        """)
+        self._conn.commit()
+
+    def _row(self, feed_url: str):
+        return self._conn.execute(
+            "SELECT last_entry_id, last_published, interval_s, empty_polls, last_checked, next_check "
+            "FROM feed_state WHERE feed_url = ?", (feed_url,)
+        ).fetchone()
+
+    def is_due(self, feed_url: str, now: Optional[float] = None) -> bool:
+        """True if the feed has never been polled or its next check time has passed."""
+        with self._lock:
+            row = self._row(feed_url)
+        return row is None or row[5] is None or row[5] <= (now or time.time())
+
+    def watermark(self, feed_url: str) -> Tuple[Optional[str], Optional[float]]:
+        """(id of the feed's top entry at the last poll, newest publish timestamp processed)."""
+        with self._lock:
+            row = self._row(feed_url)
+        return (row[0], row[1]) if row else (None, None)
+
+    def record_poll(self, feed_url: str, new_entries: List[Tuple[str, Optional[float]]], now: Optional[float] = None):
+        """
+        Records a completed poll and schedules the next one.
+
+        Args:
+            feed_url: Feed that was polled
+            new_entries: (id, publish timestamp) of the entries above the watermark,
+                newest first as listed in the feed. Empty if nothing new (or a 304).
+            now: Poll time (defaults to the current time)
+        """
+        now = now or time.time()
+        with self._lock:
+            row = self._row(feed_url)
+            last_id, last_published, interval, empty_polls = row[:4] if row else (None, None, None, 0)
+
+            if new_entries:
+                # Gaps between consecutive publish times, including the previous watermark
+                stamps = sorted({ts for _, ts in new_entries if ts} | ({last_published} if last_published else set()))
+                if len(stamps) > 1:
+                    observed = (stamps[-1] - stamps[0]) / (len(stamps) - 1)
+                    interval = observed if interval is None else (
+                        INTERVAL_ALPHA * observed + (1 - INTERVAL_ALPHA) * interval
+                    )
+                # Readers stop at the top entry; the time is only a fallback if it drops out of the feed
+                last_id = new_entries[0][0]
+                newest_ts = max((ts for _, ts in new_entries if ts), default=None)
+                if newest_ts and (last_published is None or newest_ts > last_published):
+                    last_published = newest_ts
+                empty_polls = 0
+            else:
+                empty_polls = (empty_polls or 0) + 1
+
+            delay = MIN_POLL_S if interval is None else interval * POLL_FRACTION
+            delay *= 2 ** min(empty_polls, MAX_BACKOFF)
+            delay = min(max(delay, MIN_POLL_S), MAX_POLL_S)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feed_state"
+                "(feed_url, last_entry_id, last_published, interval_s, empty_polls, last_checked, next_check) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (feed_url, last_id, last_published, interval, empty_polls, now, now + delay)
+            )
+            self._conn.commit()
+
+    def schedule(self) -> Dict[str, Dict]:
+        """Per feed: estimated update interval, consecutive empty polls and seconds until the next poll."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT feed_url, interval_s, empty_polls, next_check FROM feed_state"
+            ).fetchall()
+        return {
+            url: {
+                "interval_h": round(interval / 3600, 2) if interval else None,
+                "empty_polls": empty_polls,
+                "next_poll_in_s": max(0, round(next_check - now)) if next_check else 0,
+            }
+            for url, interval, empty_polls, next_check in rows
+        }
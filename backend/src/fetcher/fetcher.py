@@ -3,21 +3,39 @@ fetcher.py
 Enhanced with full article content extraction and parallel fetching
 """
 import feedparser
+import calendar
 import json
 import os
 import hashlib
 from datetime import datetime
 import logging
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
+from queue import Queue, Full
+from threading import Event, Lock
+from typing import Iterator, List, Dict, Optional
 import requests
-from bs4 import BeautifulSoup
 import time
+from .http_cache import HttpCache
+from .feed_state import FeedStateStore
+from .extractors import get_extractor
 
 logger = logging.getLogger(__name__)
 
+
+def _put_unless_stopped(queue: Queue, item, stop_event: Event, timeout: float = 0.5) -> bool:
+    """Blocking put on a bounded queue that gives up once stop_event is set."""
+    while not stop_event.is_set():
+        try:
+            queue.put(item, timeout=timeout)
+            return True
+        except Full:
+            continue
+    return False
+
 class Fetcher:
-    def __init__(self, extract_full_content: bool = True, max_workers: int = 15):
+    def __init__(self, extract_full_content: bool = True, max_workers: int = 15, known_ids=None, use_http_cache: bool = True,
+                 extractor: str = "lxml", use_feed_state: bool = True):
         """
         Initialises the Fetcher Agent.
         Loads feed urls from src/config/feed.json
@@ -25,6 +43,18 @@ class Fetcher:
         Args:
             extract_full_content: If True, fetches full article content from URLs
             max_workers: Number of parallel workers for fetching
+            known_ids: Optional container of already-processed article ids
+                (e.g. db.dedup.SeenIndex). Matching entries are skipped before
+                any content extraction.
+            use_http_cache: If True, feeds and pages are requested conditionally
+                (ETag/Last-Modified) and unchanged feeds are skipped on a 304.
+            extractor: Content extraction backend, "lxml" (fast) or "soup" (original)
+            use_feed_state: If True, each feed is read only down to the newest entry
+                processed last time, and feeds are polled on an adaptive schedule.
+
+        A feed's new watermark and HTTP validators are held back until every article
+        it yielded has been reported through mark_processed(), so articles that fail
+        later in the pipeline are fetched again on the next run.
         """
         # Get base directory from src
         base_dir = os.path.dirname(os.path.dirname(__file__))
@@ -34,10 +64,21 @@ class Fetcher:
         self.feeds = self._load_feed()
         self.extract_full_content = extract_full_content
         self.max_workers = max_workers
+        self.known_ids = known_ids
+        # Per-fetch counters: entries seen, skipped as known, returned
+        self.stats = Counter()
+        self._stats_lock = Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.http_cache = HttpCache() if use_http_cache else None
+        self.extractor = get_extractor(extractor)
+        self.feed_state = FeedStateStore() if use_feed_state else None
+        # feed_url -> poll waiting for its articles to be processed (see _hold_poll)
+        self._pending_polls: Dict[str, Dict] = {}
+        self._processed_ids = set()
+        self._pending_lock = Lock()
         
     def _load_feed(self):
         """
@@ -81,7 +122,49 @@ class Fetcher:
         else:
             logger.info(f"[INFO] feed already exists: {url}")
     
-    def _extract_full_content(self, url: str, timeout: int = 10) -> Optional[str]:
+    def _request(self, url: str, feed_url: str, timeout: int = 10):
+        """
+        GETs a URL, conditionally if the HTTP cache has validators for it.
+        New validators are returned but not stored.
+        
+        Args:
+            url: URL to download
+            feed_url: Feed the request is attributed to in cache stats
+            timeout: Request timeout in seconds
+            
+        Returns:
+            (body, not_modified, headers): body is the cached copy when the server
+            answers 304, headers are the response headers of a 200 (None on a 304)
+        """
+        headers = self.http_cache.request_headers(url) if self.http_cache else {}
+        response = self.session.get(url, timeout=timeout, allow_redirects=True, headers=headers)
+        
+        if response.status_code == 304 and self.http_cache:
+            body = self.http_cache.cached_body(url)
+            if body is not None:
+                self.http_cache.record(feed_url, True, len(body))
+                return body, True, None
+            # Lost the body somehow; ask again unconditionally
+            response = self.session.get(url, timeout=timeout, allow_redirects=True)
+        
+        response.raise_for_status()
+        if self.http_cache:
+            self.http_cache.record(feed_url, False, len(response.content))
+        return response.content, False, response.headers
+    
+    def _get(self, url: str, feed_url: str, timeout: int = 10):
+        """
+        _request() that stores the response's validators right away (for article pages).
+        
+        Returns:
+            (body, not_modified): body is the cached copy when the server answers 304
+        """
+        body, not_modified, headers = self._request(url, feed_url, timeout=timeout)
+        if headers is not None and self.http_cache:
+            self.http_cache.update(url, headers, body)
+        return body, not_modified
+    
+    def _extract_full_content(self, url: str, timeout: int = 10, feed_url: str = None) -> Optional[str]:
         """
         Extracts full article content from URL.
         Falls back to RSS summary if extraction fails.
@@ -89,6 +172,7 @@ class Fetcher:
         Args:
             url: Article URL
             timeout: Request timeout in seconds
+            feed_url: Feed the article came from (for HTTP cache stats)
             
         Returns:
             Full article text or None
@@ -97,101 +181,268 @@ class Fetcher:
             return None
             
         try:
-            response = self.session.get(url, timeout=timeout, allow_redirects=True)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                script.decompose()
-            
-            # Try to find main content (common patterns)
-            content_selectors = [
-                'article',
-                '[role="main"]',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                'main',
-                '.content'
-            ]
-            
-            text = None
-            for selector in content_selectors:
-                content = soup.select_one(selector)
-                if content:
-                    text = content.get_text(separator=' ', strip=True)
-                    if len(text) > 200:  # Ensure we got substantial content
-                        break
-            
-            # Fallback: get all paragraphs
-            if not text or len(text) < 200:
-                paragraphs = soup.find_all('p')
-                text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            
-            # Clean up text
-            if text:
-                # Remove excessive whitespace
-                text = ' '.join(text.split())
-                # Limit length to avoid token issues (keep first 5000 chars)
-                if len(text) > 5000:
-                    text = text[:5000] + "..."
-            
-            return text if text and len(text) > 100 else None
+            body, _ = self._get(url, feed_url or url, timeout=timeout)
+            return self._parse_content(body)
             
         except Exception as e:
             logger.debug(f"Failed to extract content from {url}: {e}")
             return None
     
-    def _fetch_single_feed(self, feed_url: str, limit: int) -> List[Dict]:
+    def _parse_content(self, html) -> Optional[str]:
         """
-        Fetches articles from a single RSS feed.
+        Extracts the main article text from a downloaded HTML page.
+        
+        Args:
+            html: Page body (bytes or str)
+            
+        Returns:
+            Article text (capped at 5000 chars) or None if too short
+        """
+        try:
+            return self.extractor.extract(html)
+        except Exception as e:
+            logger.debug(f"Failed to parse page content: {e}")
+            return None
+    
+    @staticmethod
+    def _entry_id(entry) -> str:
+        """Generate uuid from title + link"""
+        return hashlib.md5((entry.get("title", "") + entry.get("link", "")).encode()).hexdigest()
+    
+    @staticmethod
+    def _build_article(entry, uid: str, source_title: str, full_text: Optional[str]) -> Dict:
+        """Builds the common article dict from an RSS entry and its extracted text."""
+        # Get text from RSS summary first
+        rss_text = entry.get("summary", entry.get("description", ""))
+        
+        # Use full text if available, otherwise use RSS summary
+        article_text = full_text if full_text else rss_text
+        
+        return {
+            "id": uid, 
+            "title": entry.get("title", "No Title"),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", entry.get("updated", datetime.now().isoformat())),
+            "source": source_title,
+            "text": article_text or "No content",
+            "categories": [],
+            "summary": "",
+        }
+    
+    @staticmethod
+    def _entry_timestamp(entry) -> Optional[float]:
+        """Publish (or update) time of an entry as a UTC epoch, None if the feed doesn't give one."""
+        parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+        return float(calendar.timegm(parsed)) if parsed else None
+    
+    def _due_feeds(self) -> List[str]:
+        """Feeds whose adaptive poll interval has elapsed (all feeds without feed state)."""
+        if self.feed_state is None:
+            return list(self.feeds)
+        due = [feed_url for feed_url in self.feeds if self.feed_state.is_due(feed_url)]
+        if len(due) < len(self.feeds):
+            logger.info(f"Polling {len(due)} of {len(self.feeds)} feeds; the rest are not due yet")
+        return due
+    
+    def _entries_above_watermark(self, feed_url: str, entries) -> List:
+        """
+        Entries listed above the last entry processed from the feed.
+
+        Feeds list new entries at the top, so reading stops at the watermark
+        entry regardless of publish times (backdated posts, shared timestamps and
+        unsorted feeds are all kept). Only if that entry is no longer in the feed
+        are entries published before the watermark's time dropped instead.
+        """
+        if self.feed_state is None:
+            return list(entries)
+        entries = list(entries)
+        last_id, last_published = self.feed_state.watermark(feed_url)
+        if last_id is not None:
+            for i, entry in enumerate(entries):
+                if self._entry_id(entry) == last_id:
+                    return entries[:i]
+        if last_published is None:
+            return entries
+        fresh = []
+        for entry in entries:
+            ts = self._entry_timestamp(entry)
+            if ts is None or ts >= last_published:
+                fresh.append(entry)
+        return fresh
+    
+    def _record_poll(self, feed_url: str, entries):
+        """Advances the feed's watermark past `entries` and schedules its next poll."""
+        if self.feed_state is not None:
+            self.feed_state.record_poll(
+                feed_url, [(self._entry_id(entry), self._entry_timestamp(entry)) for entry in entries]
+            )
+    
+    def _clear_pending_polls(self):
+        with self._pending_lock:
+            self._pending_polls.clear()
+            self._processed_ids.clear()
+    
+    def _hold_poll(self, feed_url: str, entries, headers, body: bytes, ids: List[str]):
+        """
+        Defers a fully read feed's watermark (past `entries`) and its HTTP validators
+        until the articles it yielded (`ids`) are processed; commits at once if none are pending.
+        """
+        with self._pending_lock:
+            outstanding = set(ids) - self._processed_ids
+            if outstanding:
+                self._pending_polls[feed_url] = {
+                    "entries": entries, "headers": headers, "body": body, "outstanding": outstanding,
+                }
+                return
+        self._commit_poll(feed_url, entries, headers, body)
+    
+    def _commit_poll(self, feed_url: str, entries, headers, body: bytes):
+        self._record_poll(feed_url, entries)
+        if headers is not None and self.http_cache:
+            self.http_cache.update(feed_url, headers, body)
+    
+    def mark_processed(self, ids):
+        """
+        Reports articles as done (saved, or deliberately dropped such as by the filter).
+        Feeds whose yielded articles are now all done get their watermark and validators saved.
+        """
+        ready = []
+        with self._pending_lock:
+            self._processed_ids.update(ids)
+            for feed_url, poll in list(self._pending_polls.items()):
+                poll["outstanding"].difference_update(ids)
+                if not poll["outstanding"]:
+                    ready.append((feed_url, self._pending_polls.pop(feed_url)))
+        for feed_url, poll in ready:
+            self._commit_poll(feed_url, poll["entries"], poll["headers"], poll["body"])
+    
+    def pending_polls(self) -> List[str]:
+        """Feeds still waiting on unprocessed articles; they are read again next run."""
+        with self._pending_lock:
+            return sorted(self._pending_polls)
+    
+    def _iter_single_feed(self, feed_url: str, limit: int, stop_event: Optional[Event] = None) -> Iterator[Dict]:
+        """
+        Yields articles from a single RSS feed as soon as each one is extracted.
         
         Args:
             feed_url: RSS feed URL
             limit: Maximum articles per feed
+            stop_event: Optional event; when set, the feed stops early
             
-        Returns:
-            List of article dictionaries
+        Yields:
+            Article dictionaries
         """
-        articles = []
         try:
-            parsed_feed = feedparser.parse(feed_url)
+            body, not_modified, headers = self._request(feed_url, feed_url)
+            if not_modified:
+                # Feed unchanged since last run: nothing new to parse
+                with self._stats_lock:
+                    self.stats["feeds_not_modified"] += 1
+                logger.info(f"Feed not modified, skipping: {feed_url}")
+                self._record_poll(feed_url, [])
+                return
+            
+            parsed_feed = feedparser.parse(body)
             source_title = parsed_feed.feed.get("title", "Unknown Source")
             
-            for entry in parsed_feed.entries[:limit]:
-                # Generate uuid from title + link
-                uid = hashlib.md5((entry.get("title", "") + entry.get("link", "")).encode()).hexdigest()
+            entries = self._entries_above_watermark(feed_url, parsed_feed.entries[:limit])
+            with self._stats_lock:
+                self.stats["below_watermark"] += min(limit, len(parsed_feed.entries)) - len(entries)
+                self.stats["entries"] += len(entries)
+            yielded = []
+            for entry in entries:
+                if stop_event is not None and stop_event.is_set():
+                    return
                 
-                # Get text from RSS summary first
-                rss_text = entry.get("summary", entry.get("description", ""))
+                uid = self._entry_id(entry)
+                
+                # Skip articles we already processed before paying for extraction
+                if self.known_ids is not None and uid in self.known_ids:
+                    with self._stats_lock:
+                        self.stats["skipped_known"] += 1
+                    continue
                 
                 # Extract full content if enabled
                 full_text = None
                 if self.extract_full_content and entry.get("link"):
-                    full_text = self._extract_full_content(entry.get("link"))
+                    full_text = self._extract_full_content(entry.get("link"), feed_url=feed_url)
                     time.sleep(0.5)  # Rate limiting
                 
-                # Use full text if available, otherwise use RSS summary
-                article_text = full_text if full_text else rss_text
-                
-                article = {
-                    "id": uid, 
-                    "title": entry.get("title", "No Title"),
-                    "link": entry.get("link", ""),
-                    "published": entry.get("published", entry.get("updated", datetime.now().isoformat())),
-                    "source": source_title,
-                    "text": article_text or "No content",
-                    "categories": [],
-                    "summary": "",
-                }
-                articles.append(article)
+                with self._stats_lock:
+                    self.stats["fetched"] += 1
+                yielded.append(uid)
+                yield self._build_article(entry, uid, source_title, full_text)
+            
+            # Only a fully consumed feed moves its watermark, once its articles are processed
+            self._hold_poll(feed_url, entries, headers, body, yielded)
                 
         except Exception as e:
             logger.error(f"[ERROR] Failed to parse {feed_url}: {e}")
+    
+    def _fetch_single_feed(self, feed_url: str, limit: int) -> List[Dict]:
+        """
+        Fetches articles from a single RSS feed.
         
-        return articles
+        Args:
+            feed_url: RSS feed URL
+            limit: Maximum articles per feed
+            
+        Returns:
+            List of article dictionaries
+        """
+        return list(self._iter_single_feed(feed_url, limit))
+    
+    def iter_fetch(self, limit: int = 30, parallel: bool = True) -> Iterator[Dict]:
+        """
+        Streams articles from all feeds, yielding each one as soon as it is extracted,
+        so downstream stages can start before the whole fetch is done. Feed threads
+        pause when the consumer falls behind (bounded hand-off queue).
+        
+        Args:
+            limit: Number of articles per feed
+            parallel: If True, fetch feeds in parallel
+            
+        Yields:
+            Article dictionaries with the same schema as fetch()
+        """
+        self.stats.clear()
+        self._clear_pending_polls()
+        feeds = self._due_feeds()
+        self.stats["feeds_not_due"] = len(self.feeds) - len(feeds)
+        
+        if not (parallel and len(feeds) > 1):
+            for feed_url in feeds:
+                yield from self._iter_single_feed(feed_url, limit)
+            return
+        
+        out = Queue(maxsize=self.max_workers * 2)
+        done = object()
+        stop_event = Event()
+        
+        def run_feed(feed_url):
+            try:
+                for article in self._iter_single_feed(feed_url, limit, stop_event):
+                    if not _put_unless_stopped(out, article, stop_event):
+                        return
+            finally:
+                _put_unless_stopped(out, done, stop_event)
+        
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(feeds)))
+        try:
+            for feed_url in feeds:
+                executor.submit(run_feed, feed_url)
+            remaining = len(feeds)
+            while remaining:
+                item = out.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            # Consumer may stop early: let in-flight feeds wind down
+            stop_event.set()
+            executor.shutdown(wait=False)
     
     def fetch(self, limit: int = 30, parallel: bool = True):
         """
@@ -205,13 +456,17 @@ class Fetcher:
             List of article dictionaries with consistent schema
         """
         articles = []
+        self.stats.clear()
+        self._clear_pending_polls()
+        feeds = self._due_feeds()
+        self.stats["feeds_not_due"] = len(self.feeds) - len(feeds)
         
-        if parallel and len(self.feeds) > 1:
+        if parallel and len(feeds) > 1:
             # Parallel fetching
-            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.feeds))) as executor:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(feeds))) as executor:
                 future_to_feed = {
                     executor.submit(self._fetch_single_feed, feed_url, limit): feed_url 
-                    for feed_url in self.feeds
+                    for feed_url in feeds
                 }
                 
                 for future in as_completed(future_to_feed):
@@ -224,10 +479,16 @@ class Fetcher:
                         logger.error(f"Error fetching {feed_url}: {e}")
         else:
             # Sequential fetching (original behavior)
-            for feed_url in self.feeds:
+            for feed_url in feeds:
                 feed_articles = self._fetch_single_feed(feed_url, limit)
                 articles.extend(feed_articles)
                 logger.info(f"Fetched {len(feed_articles)} articles from {feed_url}")
         
-        logger.info(f"Total articles fetched: {len(articles)}")
+        logger.info(f"Total articles fetched: {len(articles)} "
+                    f"({self.stats['skipped_known']} of {self.stats['entries']} entries skipped as already processed, "
+                    f"{self.stats['below_watermark']} below feed watermarks, "
+                    f"{self.stats['feeds_not_modified']} feeds not modified, "
+                    f"{self.stats['feeds_not_due']} feeds not due)")
+        if self.http_cache:
+            logger.info(f"HTTP cache: {self.http_cache.totals()}")
         return articles
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+http_cache.py
+Persistent HTTP cache for the fetchers.
+Stores ETag/Last-Modified validators and response bodies on disk so feeds and
+article pages can be re-requested conditionally; a 304 costs a round-trip but
+no download. Hit rates and bytes saved are tracked per feed.
+"""
+import os
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "http_cache.db")
+
+
+class HttpCache:
+    """
+    SQLite-backed store of validators and bodies, keyed by URL.
+
+    Args:
+        path (str): SQLite file.
+        max_age_days (float): Entries not used for this long are pruned on open.
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_age_days: float = 14):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"requests": 0, "not_modified": 0, "bytes_downloaded": 0, "bytes_saved": 0})
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache(
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                last_used REAL
+            )
+        """)
+        self._conn.execute("DELETE FROM http_cache WHERE last_used < ?", (time.time() - max_age_days * 86400,))
+        self._conn.commit()
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a URL, empty if nothing is cached."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def cached_body(self, url: str) -> Optional[bytes]:
+        """Returns the stored body for a URL and marks the entry as used."""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM http_cache WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            self._conn.execute("UPDATE http_cache SET last_used = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return zlib.decompress(row[0])
+
+    def update(self, url: str, headers, body: bytes):
+        """Stores a 200 response. Responses without validators are not worth keeping."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache(url, etag, last_modified, body, last_used) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, zlib.compress(body), time.time())
+            )
+            self._conn.commit()
+
+    def record(self, feed_url: str, not_modified: bool, nbytes: int):
+        """Counts one request against a feed (its own URL or one of its pages)."""
+        with self._lock:
+            stats = self._stats[feed_url]
+            stats["requests"] += 1
+            if not_modified:
+                stats["not_modified"] += 1
+                stats["bytes_saved"] += nbytes
+            else:
+                stats["bytes_downloaded"] += nbytes
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-feed requests, 304 hit rate, bytes downloaded and bytes saved."""
+        with self._lock:
+            result = {}
+            for feed_url, s in self._stats.items():
+                result[feed_url] = dict(s, hit_rate=round(s["not_modified"] / s["requests"], 3) if s["requests"] else 0.0)
+        return result
+
+    def totals(self) -> Dict:
+        per_feed = self.stats().values()
+        requests = sum(s["requests"] for s in per_feed)
+        not_modified = sum(s["not_modified"] for s in per_feed)
+        return {
+            "requests": requests,
+            "not_modified": not_modified,
+            "hit_rate": round(not_modified / requests, 3) if requests else 0.0,
+            "bytes_downloaded": sum(s["bytes_downloaded"] for s in per_feed),
+            "bytes_saved": sum(s["bytes_saved"] for s in per_feed),
+        }
@@ -4,60 +4,390 @@ This file handles all AI models used in the project.
 It includes:
 1. Summarization (LLMs)
 2. Embeddings for filtering/search
-3. Zero-shot classifier for article categorization   
+3. Zero-shot classifier for article categorization
+4. A process-wide registry that loads each model once and shares it across threads
 """
 
 from transformers import pipeline
 # from langchain_huggingface import HuggingFacePipeline
 # from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
 import torch
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SUMMARIZER_MODEL_ID = "facebook/bart-large-cnn"
+CLASSIFIER_MODEL_ID = "facebook/bart-large-mnli"
+EMBEDDING_MODEL_ID = "all-MiniLM-L6-v2"
+
+# Inference backends for the BART models:
+# - pytorch:   the checkpoint as published (fp32 unless a dtype is given)
+# - quantized: CPU, int8 dynamic quantization of the Linear layers
+# - onnx:      CPU, ONNX Runtime graph exported once and cached in ONNX_CACHE_DIR
+BACKENDS = ("pytorch", "quantized", "onnx")
+ONNX_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "onnx_models")
+
+_DTYPES = {
+    "float32": torch.float32,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+}
+
+
+def _resolve_device(device=None) -> int:
+    """Map a device hint (None/"auto", "cpu", "cuda", int) to a pipeline device index."""
+    if device is None or device == "auto":
+        return 0 if torch.cuda.is_available() else -1
+    if device == "cpu":
+        return -1
+    if device == "cuda":
+        return 0
+    return int(device)
+
+
+def _resolve_backend(backend=None) -> str:
+    """Validate an inference backend name. None means plain PyTorch."""
+    backend = backend or "pytorch"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend: {backend}. Use one of {list(BACKENDS)}")
+    return backend
+
+
+def backend_model_id(model_id: str, backend=None) -> str:
+    """Model identifier for cache keys; non-default backends produce slightly different outputs."""
+    backend = _resolve_backend(backend)
+    return model_id if backend == "pytorch" else f"{model_id}@{backend}"
+
+
+def _resolve_dtype(dtype=None):
+    """Map a dtype name to a torch dtype. None keeps the model default (fp32)."""
+    if dtype is None or isinstance(dtype, torch.dtype):
+        return dtype
+    if dtype not in _DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}. Use one of {list(_DTYPES)}")
+    return _DTYPES[dtype]
+
+
+def _process_rss_mb() -> float:
+    """
+    Current resident set size of this process in MB: /proc on Linux, else psutil
+    if installed. Without either, falls back to the peak RSS (or 0 on Windows).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB elsewhere
+
+
+def _model_size_mb(model) -> float:
+    """Bytes held by a model's parameters and buffers, in MB."""
+    module = getattr(model, "model", model)  # pipelines wrap the torch module
+    if not hasattr(module, "parameters"):
+        return 0.0
+    total = sum(p.numel() * p.element_size() for p in module.parameters())
+    total += sum(b.numel() * b.element_size() for b in module.buffers())
+    return total / (1024 * 1024)
+
+
+def _onnx_export_dir(model_id: str) -> str:
+    return os.path.join(ONNX_CACHE_DIR, model_id.replace("/", "--"))
+
+
+def _export_complete(export_dir: str) -> bool:
+    return os.path.isdir(export_dir) and bool(os.listdir(export_dir))
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive lock across processes (flock on `path`); a no-op without fcntl."""
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _export_onnx(model_cls, model_id: str, export_dir: str):
+    """Exports a checkpoint into a private temp dir and renames it to `export_dir`."""
+    from transformers import AutoTokenizer
+    logger.info("Exporting %s to ONNX (one-off, cached in %s)...", model_id, export_dir)
+    model = model_cls.from_pretrained(model_id, export=True, provider="CPUExecutionProvider")
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(export_dir), prefix=".tmp-")
+    try:
+        model.save_pretrained(tmp_dir)
+        tokenizer.save_pretrained(tmp_dir)
+        os.replace(tmp_dir, export_dir)  # an interrupted export never looks complete
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not _export_complete(export_dir):
+            raise
+        # Another process renamed its export into place first; use that one
+        logger.info("ONNX export of %s already completed by another process", model_id)
+
+
+def _load_onnx_model(model_cls, model_id: str):
+    """
+    Loads an ONNX Runtime model, exporting it from the PyTorch checkpoint on first use.
+    The export is cached on disk, so later runs (and every worker process) skip it.
+    Worker processes starting on a cold cache export one at a time (file lock),
+    and the ones that waited load the finished export.
+    """
+    from transformers import AutoTokenizer
+    export_dir = _onnx_export_dir(model_id)
+    if not _export_complete(export_dir):
+        os.makedirs(ONNX_CACHE_DIR, exist_ok=True)
+        with _file_lock(export_dir + ".lock"):
+            if not _export_complete(export_dir):
+                _export_onnx(model_cls, model_id, export_dir)
+
+    logger.info("Using cached ONNX export %s", export_dir)
+    model = model_cls.from_pretrained(export_dir, provider="CPUExecutionProvider")
+    tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    return model, tokenizer
+
+
+def _build_pipeline(task: str, model_id: str, device: int, dtype, backend: str, batch_size: int):
+    """
+    Builds a transformers pipeline on the requested backend.
+
+    "quantized" and "onnx" are CPU backends; they ignore the device and dtype.
+    """
+    if backend == "pytorch":
+        return pipeline(
+            task,
+            model=model_id,
+            device=device,
+            torch_dtype=dtype,
+            batch_size=batch_size if device >= 0 else 1  # Batch size for GPU, 1 for CPU
+        )
+
+    if backend == "quantized":
+        # int8 weights for every Linear layer, activations quantized on the fly
+        pipe = pipeline(task, model=model_id, device=-1, batch_size=batch_size)
+        pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipe
+
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTModelForSequenceClassification
+    model_cls = ORTModelForSeq2SeqLM if task == "summarization" else ORTModelForSequenceClassification
+    model, tokenizer = _load_onnx_model(model_cls, model_id)
+    return pipeline(task, model=model, tokenizer=tokenizer, batch_size=batch_size)
+
+
+def _build_summarizer(device: int, dtype, backend: str = "pytorch"):
+    # Upgraded to bart-large-cnn for better quality summaries
+    # Alternative: "google/pegasus-xsum" for even better quality (slower)
+    # Use device instead of device_map for pipelines to avoid meta tensor issues
+    return _build_pipeline("summarization", SUMMARIZER_MODEL_ID, device, dtype, backend, batch_size=4)
+
+
+def _build_classifier(device: int, dtype, backend: str = "pytorch"):
+    # Using bart-large-mnli (good balance)
+    # Alternative: "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli" for better accuracy
+    return _build_pipeline("zero-shot-classification", CLASSIFIER_MODEL_ID, device, dtype, backend, batch_size=8)
+
+
+def _build_embeddings(device: int, dtype, backend: str = "pytorch"):
+    if backend != "pytorch":
+        raise ValueError("The embedding model only supports the 'pytorch' backend")
+    from sentence_transformers import SentenceTransformer
+    embedder = SentenceTransformer(EMBEDDING_MODEL_ID, device="cpu" if device < 0 else f"cuda:{device}")
+    if dtype is not None:
+        embedder = embedder.to(dtype)
+    return embedder
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+
+    Each (name, device, dtype, backend) combination is built lazily on first use and then
+    shared by every caller and thread. Loading is guarded by a per-key lock, so
+    two threads asking for the summarizer wait for a single load while a thread
+    asking for the classifier proceeds independently.
+    """
+
+    _builders = {
+        "summarizer": _build_summarizer,
+        "classifier": _build_classifier,
+        "embeddings": _build_embeddings,
+    }
+
+    def __init__(self):
+        self._models = {}
+        self._stats = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _key(self, name: str, device=None, dtype=None, backend=None):
+        if name not in self._builders:
+            raise ValueError(f"Unknown model: {name}. Use one of {list(self._builders)}")
+        backend = _resolve_backend(backend)
+        if backend != "pytorch":
+            # CPU-only backends: collapse device/dtype so they share one instance
+            return (name, -1, None, backend)
+        return (name, _resolve_device(device), _resolve_dtype(dtype), backend)
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, name: str, device=None, dtype=None, backend=None):
+        """
+        Returns the named model, loading it on first use.
+
+        Args:
+            name (str): "summarizer", "classifier" or "embeddings".
+            device: None/"auto", "cpu", "cuda" or a CUDA device index.
+            dtype: None, "float32", "float16" or "bfloat16".
+            backend: None/"pytorch", "quantized" or "onnx".
+
+        Returns:
+            The loaded model object.
+        """
+        key = self._key(name, device, dtype, backend)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._key_lock(key):
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            _, device_idx, torch_dtype, backend = key
+            logger.info("Loading %s (device=%s, dtype=%s, backend=%s)...", name, device_idx, torch_dtype, backend)
+            rss_before = _process_rss_mb()
+            start = time.perf_counter()
+            model = self._builders[name](device_idx, torch_dtype, backend)
+            load_seconds = time.perf_counter() - start
+
+            self._stats[key] = {
+                "name": name,
+                "device": device_idx,
+                "dtype": str(torch_dtype) if torch_dtype else "default",
+                "backend": backend,
+                "load_seconds": round(load_seconds, 2),
+                "model_mb": round(_model_size_mb(model), 1),
+                "rss_delta_mb": round(_process_rss_mb() - rss_before, 1),
+                "uses": 0,
+            }
+            self._models[key] = model
+            logger.info("Loaded %s in %.2fs (%.1f MB)", name, load_seconds, self._stats[key]["model_mb"])
+
+        return model
+
+    def acquire(self, name: str, device=None, dtype=None, backend=None):
+        """Same as get(), but also counts the call in the usage stats."""
+        model = self.get(name, device, dtype, backend)
+        key = self._key(name, device, dtype, backend)
+        with self._key_lock(key):
+            stats = self._stats.get(key)
+            if stats is not None:
+                stats["uses"] += 1
+        return model
+
+    def is_loaded(self, name: str, device=None, dtype=None, backend=None) -> bool:
+        return self._key(name, device, dtype, backend) in self._models
+
+    def unload(self, name: str = None):
+        """
+        Drops cached models so their memory can be reclaimed.
+
+        Args:
+            name (str): Model to evict. None evicts everything.
+        """
+        with self._lock:
+            keys = [k for k in self._models if name is None or k[0] == name]
+            for key in keys:
+                del self._models[key]
+                self._stats.pop(key, None)
+                # The per-key lock stays: a thread may hold it, and a fresh lock would let a second load start
+        if keys:
+            import gc
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            logger.info("Unloaded %d model(s): %s (RSS now %.1f MB)",
+                        len(keys), [k[0] for k in keys], _process_rss_mb())
+
+    def stats(self) -> list:
+        """Load time and memory for every resident model."""
+        return [dict(s) for s in self._stats.values()]
+
+
+# Shared registry used by the loaders below
+registry = ModelRegistry()
+
+
 # 1.Summarization Model
-def load_summarizer(model_choice: str = "huggingface"):
+def load_summarizer(model_choice: str = "huggingface", device=None, dtype=None, backend=None):
     """
     Loads a summarization LLM pipeline.
 
     Args:
         model_choice (str): "huggingface" or "openai".
-    
+        device: None/"auto", "cpu", "cuda" or a CUDA device index.
+        dtype: None, "float32", "float16" or "bfloat16".
+        backend: None/"pytorch", "quantized" (int8, CPU) or "onnx" (ONNX Runtime, CPU).
+
     Returns:
         summarizer object
     """
-    
+
     if model_choice == "huggingface":
-        # Upgraded to bart-large-cnn for better quality summaries
-        # Alternative: "google/pegasus-xsum" for even better quality (slower)
-        model_id = "facebook/bart-large-cnn"
-        # Use device instead of device_map for pipelines to avoid meta tensor issues
-        device = 0 if torch.cuda.is_available() else -1
-        # Enable batching for GPU efficiency
-        summarizer = pipeline(
-            "summarization", 
-            model=model_id, 
-            device=device,
-            batch_size=4 if device == 0 else 1  # Batch size for GPU, 1 for CPU
-        )
-        return summarizer
-    
+        return registry.acquire("summarizer", device=device, dtype=dtype, backend=backend)
+
     # elif model_choice=="openai":
     #     return ChatOpenAI(model="gpt-4o-mini")
-    
+
     else:
         raise ValueError(f"Unsupported model choice: {model_choice}")
-    
+
 # 2.Embedding Model
-def load_embeddings(model_choice: str = "huggingface"):
+def load_embeddings(model_choice: str = "huggingface", device=None, dtype=None):
     """
     Load embedding model for similarity search and filtering.
 
     Args:
         model_choice (str): "huggingface" or "openai".
-        
+        device: None/"auto", "cpu", "cuda" or a CUDA device index.
+        dtype: None, "float32", "float16" or "bfloat16".
+
     Returns:
         embeddings object.
     """
-    
+
     # if model_choice == "huggingface":
     #     model_id = "sentence-transformers/all-MiniLM-L6-v2"
     #     embedder = pipeline.from_model_id(
@@ -66,42 +396,30 @@ def load_embeddings(model_choice: str = "huggingface"):
     #     )
     #     return embedder
     if model_choice == "huggingface":
-        from sentence_transformers import SentenceTransformer
-        model_id = "all-MiniLM-L6-v2"
-        embedder = SentenceTransformer(model_id)
-        return embedder
-    
+        return registry.acquire("embeddings", device=device, dtype=dtype)
+
     # elif model_choice == "openai":
     #     return OpenAIEmbeddings(model = "text-embedding-3-small")
-    
+
     else:
         raise ValueError("Invalid model choice. Use 'huggingface' or 'openai'.")
 
 # 3. Zero-shot Classifier
-_zero_shot_classifier = None
-def load_zero_shot_classifier():
+def load_zero_shot_classifier(device=None, dtype=None, backend=None):
     """
     Loads a Hugging Face zero-shot-classifier pipeline.
 
+    Args:
+        device: None/"auto", "cpu", "cuda" or a CUDA device index.
+        dtype: None, "float32", "float16" or "bfloat16".
+        backend: None/"pytorch", "quantized" (int8, CPU) or "onnx" (ONNX Runtime, CPU).
+
     Returns:
         A pipeline object that can classify text with arbitary labels.
     """
-    global _zero_shot_classifier
-    if _zero_shot_classifier is None:
-        # Using bart-large-mnli (good balance)
-        # Alternative: "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli" for better accuracy
-        # Use device instead of device_map for pipelines to avoid meta tensor issues
-        device = 0 if torch.cuda.is_available() else -1
-        # Enable batching for GPU efficiency
-        _zero_shot_classifier = pipeline(
-            "zero-shot-classification",
-            model = "facebook/bart-large-mnli",
-            device = device,
-            batch_size=8 if device == 0 else 1  # Batch size for GPU, 1 for CPU
-        )
-    return _zero_shot_classifier
-   
-    
+    return registry.acquire("classifier", device=device, dtype=dtype, backend=backend)
+
+
 # 4.Helper: Load Both
 def load_models(llm_choice: str = "huggingface", emb_choice: str = "huggingface"):
     """
@@ -110,16 +428,26 @@ def load_models(llm_choice: str = "huggingface", emb_choice: str = "huggingface"
     Args:
         llm_choice (str): "huggingface" or "openai"
         emb_choice (str): "huggingface" or "openai"
-        
+
     Returns:
         dict: {"summarizer": ..., "embeddings": ..., "classifier": ...}
     """
-    
+
     summarizer = load_summarizer(model_choice=llm_choice)
     embeddings = load_embeddings(model_choice=emb_choice)
     classifier  = load_zero_shot_classifier()
     return {
-        "summarizer": summarizer, 
+        "summarizer": summarizer,
         "embeddings": embeddings,
         "classifier": classifier
-        }
\ No newline at end of file
+        }
+
+
+def unload_models(name: str = None):
+    """Evicts one model (or all of them) from the shared registry."""
+    registry.unload(name)
+
+
+def model_stats() -> list:
+    """Returns load time and memory stats for every loaded model."""
+    return registry.stats()
@@ -1,101 +1,270 @@
 """
 sync_to_supabase.py
-Copies all rows from local sqlite articles.db
+Incrementally copies articles from the local sqlite articles.db
 To supabase postgreSQL database.
+
+Rows that are new or changed since the last sync (synced_at IS NULL) are read
+in fixed-size pages, streamed into a staging table with COPY and merged into
+articles/article_categories. Each page is committed in Postgres and then
+marked synced locally, so an interrupted sync resumes where it stopped. Rows
+changed locally while their page was in flight stay unsynced for the next run.
 """
 
+import io
 import sqlite3
+import time
 import psycopg2
-from psycopg2.extras import execute_values
-import os 
+import os
+import argparse
+import urllib.request
 from dotenv import load_dotenv
 import logging
 
+from src.db.db import connect
+from src.db.migrations import SYNCED_COLUMNS, migrate_postgres, migrate_sqlite
+from src.db.snapshots import refresh_snapshots, snapshot_article_ids
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
+# API whose response cache is invalidated after a sync (optional)
+API_URL = os.getenv("API_URL")
+CACHE_INVALIDATE_TOKEN = os.getenv("CACHE_INVALIDATE_TOKEN")
 
 #Local SQLite db path
 SQLITE_DB_PATH = os.path.join(os.path.dirname(__file__), "src", "db", "articles.db")
 
-def fetch_from_sqlite():
-    """Fetch all articles from sqlite database"""
+# Rows per COPY + merge transaction
+PAGE_SIZE = 1000
+
+STAGING_TABLE = "articles_sync_staging"
+
+MERGE_SQL = f"""
+    INSERT INTO articles ({', '.join(SYNCED_COLUMNS)})
+    SELECT {', '.join(SYNCED_COLUMNS)} FROM {STAGING_TABLE}
+    ON CONFLICT (id) DO UPDATE SET
+        {', '.join(f'{c} = EXCLUDED.{c}' for c in SYNCED_COLUMNS if c != 'id')};
+"""
+
+# Category rows of every merged article are replaced from its JSON categories
+MERGE_CATEGORIES_SQL = f"""
+    DELETE FROM article_categories WHERE article_id IN (SELECT id FROM {STAGING_TABLE});
+    INSERT INTO article_categories (article_id, category)
+    SELECT id, jsonb_array_elements_text(categories::jsonb) FROM {STAGING_TABLE}
+    WHERE categories LIKE '[%'
+    ON CONFLICT DO NOTHING;
+"""
+
+
+def iter_unsynced_pages(conn, page_size: int = PAGE_SIZE):
+    """
+    Yields pages of local rows not yet synced, oldest first.
+    Pages are read by seq (the rowid alias) keyset, so no read transaction is held between pages.
+
+    Args:
+        conn: SQLite connection
+        page_size (int): Rows per page
+
+    Yields:
+        list[tuple]: (seq, revision, *SYNCED_COLUMNS) rows
+    """
+    query = f"""
+        SELECT seq, revision, {', '.join(SYNCED_COLUMNS)} FROM articles
+        WHERE synced_at IS NULL AND seq > ?
+        ORDER BY seq LIMIT ?
+    """
+    last_seq = 0
+    while True:
+        rows = conn.execute(query, (last_seq, page_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_seq = rows[-1][0]
+
+
+def _copy_value(value) -> str:
+    """Encodes one field for COPY text format."""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def _copy_buffer(rows) -> io.BytesIO:
+    """COPY text-format payload for rows of (seq, revision, *SYNCED_COLUMNS)."""
+    lines = ("\t".join(_copy_value(v) for v in row[2:]) for row in rows)
+    return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def _create_staging(pg_conn):
+    """Session-local staging table, emptied at every commit."""
+    with pg_conn.cursor() as cur:
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+            f"(LIKE articles INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+    pg_conn.commit()
+
+
+def _merge_page(pg_conn, rows) -> int:
+    """
+    Upserts one page into Postgres in a single transaction.
+
+    Returns:
+        int: bytes sent with COPY
+    """
+    payload = _copy_buffer(rows)
+    with pg_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {STAGING_TABLE} ({', '.join(SYNCED_COLUMNS)}) FROM STDIN",
+            payload
+        )
+        cur.execute(MERGE_SQL)
+        cur.execute(MERGE_CATEGORIES_SQL)
+    pg_conn.commit()  # staging rows are dropped ON COMMIT
+    return payload.getbuffer().nbytes
+
+
+def _mark_synced(conn, rows) -> int:
+    """
+    Marks copied rows synced, skipping any changed since they were read
+    (their revision moved on), so the newer version goes out next sync.
+
+    Returns:
+        int: rows marked
+    """
+    now = time.time()
+    with conn:
+        before = conn.total_changes
+        conn.executemany(
+            "UPDATE articles SET synced_at = ? WHERE seq = ? AND revision = ?",
+            [(now, row[0], row[1]) for row in rows]
+        )
+        return conn.total_changes - before
+
+
+def sync(page_size: int = PAGE_SIZE, sqlite_path: str = SQLITE_DB_PATH, pg_url: str = None) -> dict:
+    """
+    Syncs every new or changed local article to Postgres.
+
+    Args:
+        page_size (int): Rows per COPY + merge transaction
+        sqlite_path (str): Local SQLite file
+        pg_url (str): Postgres connection URL (default SUPABASE_DB_URL)
+
+    Returns:
+        dict: rows, pages, bytes, seconds, rows_per_s, mb_per_s
+    """
+    stats = {"rows": 0, "pages": 0, "bytes": 0}
+    start = time.perf_counter()
+
+    local = connect(sqlite_path)
     try:
-        conn = sqlite3.connect(SQLITE_DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles;")
-        rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        logger.info(f"Fetched {len(rows)} from local sql db.")
-        return rows
-    except Exception as e:
-        logger.exception("Error fetching from SQLite:")
-        raise
+        migrate_sqlite(local)
+        with psycopg2.connect(pg_url or SUPABASE_DB_URL) as pg_conn:
+            migrate_postgres(pg_conn)
+            _create_staging(pg_conn)
 
-def insert_into_supabase(rows):
-    """Insert articles into supabase (PostgreSQL) database."""
-    if not rows:
-        logger.warning("No rows found in local DB.Nothing to upload.")
-        return 
-    
-    columns = [
-        "id", "title", "link", "text", "published",
-        "source", "categories", "summary"
-    ]
-    
-    insert_query = f"""
-        INSERT INTO articles ({', '.join(columns)})
-        VALUES %s
-        ON CONFLICT (id) DO UPDATE SET
-            title = EXCLUDED.title,
-            link = EXCLUDED.link,
-            text = EXCLUDED.text,
-            published = EXCLUDED.published,
-            source = EXCLUDED.source,
-            categories = EXCLUDED.categories,
-            summary = EXCLUDED.summary;
+            for rows in iter_unsynced_pages(local, page_size):
+                stats["bytes"] += _merge_page(pg_conn, rows)
+                changed = len(rows) - _mark_synced(local, rows)
+                if changed:
+                    logger.info("%d rows changed during the sync; they stay queued for the next one", changed)
+                stats["rows"] += len(rows)
+                stats["pages"] += 1
+                elapsed = time.perf_counter() - start
+                logger.info("Synced page %d: %d rows total (%.0f rows/s, %.2f MB sent)",
+                            stats["pages"], stats["rows"], stats["rows"] / elapsed, stats["bytes"] / 1e6)
+    finally:
+        local.close()
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["rows_per_s"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else None
+    stats["mb_per_s"] = round(stats["bytes"] / 1e6 / stats["seconds"], 2) if stats["seconds"] else None
+    return stats
+
+
+def insert_into_supabase(rows, pg_url: str = None) -> int:
+    """
+    Upserts article dicts into supabase (PostgreSQL) database.
+
+    Returns:
+        int: number of rows upserted
     """
-    data = [tuple(row.get(col) for col in columns) for row in rows]
-    
-    logger.info(f"Uploading {len(data)} articles to Supabase...")
-    
+    if not rows:
+        logger.warning("No rows to upload.")
+        return 0
+
+    page = [(None, *(row.get(col) for col in SYNCED_COLUMNS)) for row in rows]
+    with psycopg2.connect(pg_url or SUPABASE_DB_URL) as pg_conn:
+        migrate_postgres(pg_conn)
+        _create_staging(pg_conn)
+        for i in range(0, len(page), PAGE_SIZE):
+            _merge_page(pg_conn, page[i:i + PAGE_SIZE])
+    logger.info("Successfully synced %d articles into Supabase.", len(rows))
+    return len(rows)
+
+
+def invalidate_api_cache():
+    """Tells the API to drop cached responses so synced articles show up immediately."""
+    if not API_URL or not CACHE_INVALIDATE_TOKEN:
+        logger.info("API_URL/CACHE_INVALIDATE_TOKEN not set; API cache expires on its TTL.")
+        return
+    req = urllib.request.Request(
+        f"{API_URL.rstrip('/')}/cache/invalidate", method="POST",
+        headers={"X-Cache-Token": CACHE_INVALIDATE_TOKEN}
+    )
     try:
-        with psycopg2.connect(SUPABASE_DB_URL) as conn:
-            with conn.cursor() as cur:
-                execute_values(cur, insert_query, data)
-                conn.commit()
-        logger.info("Successfully synced data into Supabase.")
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            logger.info("API cache invalidated (HTTP %d).", resp.status)
     except Exception as e:
-        logger.exception("Error inserting into Supabase:")
-        raise
-    
-def clear_local_db():
-    """Delete all rows from articles.db"""
+        # Not fatal: cached responses still expire on their TTL
+        logger.warning("Could not invalidate API cache: %s", e)
+
+
+def clear_local_db(synced_only: bool = True):
+    """
+    Delete rows from articles.db (by default only those already synced).
+    Articles in the current feed snapshots are kept, so later snapshots stay complete.
+    """
     try:
         conn = sqlite3.connect(SQLITE_DB_PATH)
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM articles;")
+        cursor.execute("CREATE TEMP TABLE keep_ids(id TEXT PRIMARY KEY)")
+        cursor.executemany("INSERT INTO keep_ids VALUES (?)", [(i,) for i in snapshot_article_ids()])
+        if synced_only:
+            cursor.execute("DELETE FROM articles WHERE synced_at IS NOT NULL AND id NOT IN (SELECT id FROM keep_ids);")
+        else:
+            cursor.execute("DELETE FROM articles WHERE id NOT IN (SELECT id FROM keep_ids);")
         conn.commit()
+        logger.info("🧹 Cleared %d rows from local SQLite database after sync.", cursor.rowcount)
         conn.close()
-        logger.info("🧹 Cleared local SQLite database after sync.")
     except Exception:
         logger.exception("Error clearing local database:")
         raise
 
-    
+
 def main():
+    parser = argparse.ArgumentParser(description="Sync new and changed local articles to Supabase")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Rows per COPY + merge transaction")
+    parser.add_argument("--clear", action="store_true", help="Delete synced rows from the local DB afterwards")
+    args = parser.parse_args()
+
     logger.info("Sync Started.")
     try:
-        rows = fetch_from_sqlite()
-        if insert_into_supabase(rows):
+        stats = sync(page_size=args.page_size)
+        logger.info("Sync complete: %s", stats)
+        # Snapshots only list synced rows; a no-op when nothing changed
+        refresh_snapshots()
+        if stats["rows"]:
+            invalidate_api_cache()
+        if args.clear:
             clear_local_db()
-        logger.info("Sync complete.")
     except Exception:
-        logger.exception("Sync failed due to an error.")
-        
+        logger.exception("Sync failed due to an error; rerun to resume from the last synced page.")
+
 if __name__ == "__main__":
     if not logging.getLogger().hasHandlers():
         logging.basicConfig(level = logging.INFO)
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,56 @@
+import base64
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+for dependency in ("fastapi", "pydantic", "asyncpg", "orjson", "dotenv"):
+    pytest.importorskip(dependency)
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "api")
+
+
+@pytest.fixture(scope="module")
+def api():
+    # The API imports its modules flat, as uvicorn runs it from src/api
+    sys.path.insert(0, API_DIR)
+    os.environ.setdefault("DATABASE_URL", "postgresql://localhost/devpulse_test")  # the pool is never opened
+    try:
+        spec = importlib.util.spec_from_file_location("devpulse_api_main", os.path.join(API_DIR, "main.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        sys.path.remove(API_DIR)
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("row", [
+    {"published_ts": 1749565800, "id": "3f2a9c"},
+    {"published_ts": None, "id": "undated-id"},
+    {"published_ts": 0, "id": "épique/ünïcode?&="},
+])
+def test_cursor_roundtrip(api, row):
+    cursor = api.encode_cursor(row)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor  # URL-safe, unpadded
+    assert api.decode_cursor(cursor) == (row["published_ts"], row["id"])
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    _raw_cursor("just a string"),
+    _raw_cursor([1749565800]),
+    _raw_cursor([1749565800, 42]),
+    _raw_cursor(["1749565800", "id"]),
+    _raw_cursor([1.5, "id"]),
+    _raw_cursor([True, "id"]),
+])
+def test_malformed_cursor_is_a_400(api, cursor):
+    with pytest.raises(api.HTTPException) as exc:
+        api.decode_cursor(cursor)
+    assert exc.value.status_code == 400
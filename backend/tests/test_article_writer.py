@@ -0,0 +1,81 @@
+import sqlite3
+
+from src.db.db import ArticleWriter, connect, search_articles
+from src.db.migrations import migrate_sqlite
+
+
+def _writer(tmp_path, **kwargs):
+    path = str(tmp_path / "articles.db")
+    conn = connect(path)
+    migrate_sqlite(conn)
+    conn.close()
+    return path, ArticleWriter(path=path, **kwargs)
+
+
+def _categories(path):
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(conn.execute("SELECT article_id, category FROM article_categories"))
+    finally:
+        conn.close()
+
+
+def test_buffers_until_flush_every(tmp_path):
+    path, writer = _writer(tmp_path, flush_every=3)
+    writer.write([{"id": "a", "title": "A"}, {"id": "b", "title": "B"}])
+    assert writer.stats()["written"] == 0
+    writer.write([{"id": "c", "title": "C"}])
+    assert writer.stats()["written"] == 3
+    writer.close()
+
+
+def test_existing_article_keeps_its_categories(tmp_path):
+    path, writer = _writer(tmp_path)
+    writer.write([{"id": "a", "title": "A", "categories": ["Technology"]}])
+    assert writer.flush() == 1
+    writer.write([{"id": "a", "title": "A again", "categories": ["Funding", "Policy"]}])
+    assert writer.flush() == 0
+    writer.close()
+
+    assert _categories(path) == [("a", "Technology")]
+
+
+def test_repeated_id_in_one_chunk_inserts_first_only(tmp_path):
+    path, writer = _writer(tmp_path)
+    writer.write([
+        {"id": "a", "title": "first", "categories": ["Technology"]},
+        {"id": "b", "title": "other", "categories": ["Hardware"]},
+        {"id": "a", "title": "second", "categories": ["Funding"]},
+    ])
+    assert writer.flush() == 2
+    writer.close()
+
+    assert _categories(path) == [("a", "Technology"), ("b", "Hardware")]
+    titles = dict(sqlite3.connect(path).execute("SELECT id, title FROM articles"))
+    assert titles == {"a": "first", "b": "other"}
+
+
+def test_chunks_larger_than_the_lookup_batch(tmp_path):
+    path, writer = _writer(tmp_path, flush_every=10_000, chunk_size=2000)
+    writer.write([{"id": f"id{i}", "title": str(i), "categories": ["Technology"]} for i in range(1200)])
+    assert writer.flush() == 1200
+    writer.write([{"id": f"id{i}", "title": str(i), "categories": ["Policy"]} for i in range(1100, 1300)])
+    assert writer.flush() == 100
+    writer.close()
+
+    assert len(_categories(path)) == 1300
+
+
+def test_search_ranks_title_matches_first(tmp_path):
+    path, writer = _writer(tmp_path)
+    writer.write([
+        {"id": "body", "title": "Weekly roundup", "text": "Also: a new quantum chip.", "categories": ["Hardware"]},
+        {"id": "title", "title": "Quantum chip unveiled", "text": "Details inside.", "categories": ["Research"]},
+        {"id": "other", "title": "Funding news", "text": "Nothing relevant."},
+    ])
+    writer.close()
+
+    assert [r["id"] for r in search_articles("quantum chi", path=path)] == ["title", "body"]
+    assert [r["id"] for r in search_articles("quantum", category="Hardware", path=path)] == ["body"]
+    assert "<mark>" in search_articles("quantum", path=path)[0]["snippet"]
+    assert search_articles("  ", path=path) == []
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("feedparser")
+
+from src.fetcher.async_fetcher import AsyncFetcher
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(self.status)
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def get(self, url, allow_redirects=True, headers=None):
+        return self.responses.pop(0)
+
+
+class RecordingCache:
+    """HttpCache stand-in that records which thread each blocking call ran on."""
+
+    def __init__(self, body=None):
+        self.body = body
+        self.threads = {}
+
+    def _called(self, name):
+        self.threads[name] = threading.get_ident()
+
+    def request_headers(self, url):
+        self._called("request_headers")
+        return {"If-None-Match": '"v1"'} if self.body else {}
+
+    def cached_body(self, url):
+        self._called("cached_body")
+        return self.body
+
+    def update(self, url, headers, body):
+        self._called("update")
+
+    def record(self, feed_url, not_modified, nbytes):
+        pass
+
+
+def _fetcher(cache):
+    fetcher = AsyncFetcher(use_http_cache=False, use_feed_state=False, per_host_rate=1000, per_host_burst=1000)
+    fetcher.http_cache = cache
+    return fetcher
+
+
+def _run(fetcher, session):
+    async def go():
+        loop_thread = threading.get_ident()
+        result = await fetcher._get(session, "https://example.com/feed", "https://example.com/feed")
+        return result, loop_thread
+    return asyncio.run(go())
+
+
+def test_cache_io_runs_off_the_event_loop_on_200():
+    cache = RecordingCache()
+    (body, not_modified), loop_thread = _run(_fetcher(cache), FakeSession(FakeResponse(200, b"<rss/>", {"ETag": '"v2"'})))
+
+    assert (body, not_modified) == (b"<rss/>", False)
+    assert set(cache.threads) == {"request_headers", "update"}
+    assert loop_thread not in cache.threads.values()
+
+
+def test_cache_io_runs_off_the_event_loop_on_304():
+    cache = RecordingCache(body=b"<rss>cached</rss>")
+    (body, not_modified), loop_thread = _run(_fetcher(cache), FakeSession(FakeResponse(304)))
+
+    assert (body, not_modified) == (b"<rss>cached</rss>", True)
+    assert set(cache.threads) == {"request_headers", "cached_body"}
+    assert loop_thread not in cache.threads.values()
@@ -0,0 +1,73 @@
+import time
+from queue import Queue
+from threading import Thread
+
+from src.agents.parallel_pipeline import STOP_SIGNAL, BatchStats, collect_batch
+
+
+def test_collect_batch_fills_to_max_size():
+    queue = Queue()
+    for i in range(10):
+        queue.put(i)
+
+    batch, stopped = collect_batch(queue, max_batch_size=4, max_wait=1.0)
+
+    assert batch == [0, 1, 2, 3]
+    assert not stopped
+    assert queue.qsize() == 6
+
+
+def test_collect_batch_returns_partial_batch_after_max_wait():
+    queue = Queue()
+    queue.put("a")
+    start = time.monotonic()
+
+    batch, stopped = collect_batch(queue, max_batch_size=8, max_wait=0.1)
+
+    assert batch == ["a"]
+    assert not stopped
+    assert 0.08 <= time.monotonic() - start < 1.0
+
+
+def test_collect_batch_waits_for_late_items_within_deadline():
+    queue = Queue()
+    queue.put(1)
+
+    def late():
+        time.sleep(0.05)
+        queue.put(2)
+
+    Thread(target=late).start()
+    batch, _ = collect_batch(queue, max_batch_size=2, max_wait=1.0)
+
+    assert batch == [1, 2]
+
+
+def test_collect_batch_stops_at_stop_signal():
+    queue = Queue()
+    for item in ("a", "b", STOP_SIGNAL, "c"):
+        queue.put(item)
+
+    batch, stopped = collect_batch(queue, max_batch_size=8, max_wait=1.0)
+
+    assert batch == ["a", "b"]
+    assert stopped
+
+
+def test_collect_batch_poll_timeout_on_empty_queue():
+    assert collect_batch(Queue(), max_batch_size=8, max_wait=1.0, poll_timeout=0.01) == ([], False)
+
+
+def test_batch_stats_summary():
+    stats = BatchStats("filter")
+    assert stats.summary() == {"stage": "filter", "batches": 0}
+
+    for size, seconds in ((8, 1.0), (8, 1.0), (4, 2.0)):
+        stats.record(size, seconds)
+    summary = stats.summary()
+
+    assert summary["batches"] == 3
+    assert summary["items"] == 20
+    assert summary["batch_size_histogram"] == {4: 1, 8: 2}
+    assert summary["latency_max_s"] == 2.0
+    assert summary["items_per_s"] == 5.0
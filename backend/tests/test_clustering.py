@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.agents.clustering import StoryClusterer
+
+
+def _unit(*values):
+    v = np.array(values, dtype=float)
+    return v / np.linalg.norm(v)
+
+
+VECTORS = {
+    "rep": _unit(1, 0, 0, 0),
+    "dup": _unit(0.95, 0.1, 0, 0),
+    "other": _unit(0, 0, 1, 0),
+}
+
+
+def _clusterer(monkeypatch):
+    clusterer = StoryClusterer()
+    monkeypatch.setattr(clusterer, "_embed", lambda articles: np.stack([VECTORS[a["id"]] for a in articles]))
+    return clusterer
+
+
+def _article(art_id):
+    # Same shape as Fetcher._build_article
+    return {"id": art_id, "title": art_id, "text": "", "categories": [], "summary": ""}
+
+
+def test_near_duplicates_join_the_representative(monkeypatch):
+    clusterer = _clusterer(monkeypatch)
+    reps = clusterer.add_many([_article("rep"), _article("dup"), _article("other")])
+
+    assert [a["id"] for a in reps] == ["rep", "other"]
+    assert clusterer.stats() == {"articles": 3, "clusters": 2, "duplicates": 1, "largest_cluster": 2}
+
+
+def test_expand_copies_results_to_members(monkeypatch):
+    clusterer = _clusterer(monkeypatch)
+    clusterer.add_many([_article("rep"), _article("dup")])
+    clusterer.record_results([{"id": "rep", "categories": ["Technology"], "summary": "A summary."}])
+
+    [dup] = clusterer.expand()
+    assert dup["id"] == "dup"
+    assert dup["cluster_id"] == "rep"
+    assert (dup["categories"], dup["summary"]) == (["Technology"], "A summary.")
+
+
+def test_expand_skips_clusters_whose_representative_was_not_summarized(monkeypatch):
+    clusterer = _clusterer(monkeypatch)
+    clusterer.add_many([_article("rep"), _article("dup")])
+    # Passed the filter but summarization failed: summary is still the fetcher's ""
+    clusterer.record_results([{"id": "rep", "categories": ["Technology"], "summary": ""}])
+
+    assert clusterer.expand() == []
@@ -0,0 +1,82 @@
+import random
+import sqlite3
+import string
+
+from src.db.db import ArticleWriter, connect
+from src.db.dedup import BloomFilter, SeenIndex
+from src.db.migrations import migrate_sqlite
+
+
+def _ids(n, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.hexdigits, k=32)) for _ in range(n)]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10_000, error_rate=1e-3)
+    ids = _ids(10_000, seed=1)
+    for i in ids:
+        bloom.add(i)
+    assert all(i in bloom for i in ids)
+
+
+def test_bloom_filter_false_positive_rate_at_capacity():
+    bloom = BloomFilter(capacity=20_000, error_rate=1e-3)
+    for i in _ids(20_000, seed=1):
+        bloom.add(i)
+    probes = _ids(100_000, seed=2)
+    false_positives = sum(i in bloom for i in probes)
+    assert false_positives / len(probes) < 2e-3
+
+
+def test_bloom_filter_save_load_roundtrip(tmp_path):
+    bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+    for i in _ids(500, seed=3):
+        bloom.add(i)
+    path = str(tmp_path / "seen.bloom")
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert loaded.count == 500
+    assert loaded.bits == bloom.bits
+    assert all(i in loaded for i in _ids(500, seed=3))
+
+
+def _db(tmp_path):
+    path = str(tmp_path / "articles.db")
+    conn = connect(path)
+    migrate_sqlite(conn)
+    return path, conn
+
+
+def test_seen_index_is_seeded_from_db(tmp_path):
+    db_path, conn = _db(tmp_path)
+    with conn:
+        conn.execute("INSERT INTO articles (id, title) VALUES ('a1', 't')")
+    conn.close()
+
+    seen = SeenIndex(path=str(tmp_path / "seen.bloom"), db_path=db_path, capacity=1000)
+    assert "a1" in seen
+    assert "a2" not in seen
+
+
+def test_writer_reports_only_committed_ids(tmp_path):
+    db_path, conn = _db(tmp_path)
+    with conn:
+        conn.execute("""
+            CREATE TRIGGER reject_bad BEFORE INSERT ON articles WHEN NEW.title = 'bad'
+            BEGIN SELECT RAISE(ABORT, 'rejected'); END
+        """)
+    conn.close()
+
+    saved = []
+    writer = ArticleWriter(path=db_path, flush_every=100)
+    writer.on_saved = saved.extend
+    writer.write([{"id": "ok1", "title": "good"}, {"id": "bad1", "title": "bad"}, {"id": "ok2", "title": "good"}])
+    assert saved == []  # still buffered
+    writer.close()
+
+    assert sorted(saved) == ["ok1", "ok2"]
+    assert writer.stats()["failed"] == 1
+    ids = [r[0] for r in sqlite3.connect(db_path).execute("SELECT id FROM articles ORDER BY id")]
+    assert ids == ["ok1", "ok2"]
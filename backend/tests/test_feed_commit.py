@@ -0,0 +1,102 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("feedparser")
+
+from src.agents import agents
+from src.db import db
+from src.db.db import ArticleWriter, connect
+from src.db.migrations import migrate_sqlite
+from src.fetcher.feed_state import FeedStateStore
+from src.fetcher.fetcher import Fetcher
+from src.fetcher.http_cache import HttpCache
+
+FEED = "https://example.com/feed"
+
+
+def _entry(name, ts):
+    return {"title": name, "link": f"https://example.com/{name}", "published_parsed": time.gmtime(ts)}
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.headers = {"ETag": '"v1"'}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    entries = [_entry("b", 2000), _entry("a", 1000)]
+    monkeypatch.setattr("src.fetcher.fetcher.feedparser.parse",
+                        lambda body: SimpleNamespace(feed={"title": "Example"}, entries=entries), raising=False)
+    fetcher = Fetcher(extract_full_content=False, use_http_cache=False, use_feed_state=False)
+    fetcher.feeds = [FEED]
+    fetcher.feed_state = FeedStateStore(str(tmp_path / "feed_state.db"))
+    fetcher.http_cache = HttpCache(str(tmp_path / "http_cache.db"))
+    fetcher.session = SimpleNamespace(get=lambda url, **kwargs: FakeResponse(b"<rss/>"))
+    return fetcher
+
+
+def _committed(fetcher):
+    return fetcher.feed_state.watermark(FEED)[0] is not None
+
+
+def test_feed_commits_once_every_article_is_processed(fetcher):
+    ids = [a["id"] for a in fetcher.fetch(parallel=False)]
+    assert len(ids) == 2
+    assert fetcher.pending_polls() == [FEED]
+    assert fetcher.http_cache.request_headers(FEED) == {}
+
+    fetcher.mark_processed(ids[:1])
+    assert not _committed(fetcher)
+    fetcher.mark_processed(ids[1:])
+    assert fetcher.pending_polls() == []
+    assert fetcher.feed_state.watermark(FEED)[0] == ids[0]
+    assert fetcher.http_cache.request_headers(FEED) == {"If-None-Match": '"v1"'}
+
+
+def test_articles_processed_while_the_feed_is_read_count(fetcher):
+    for article in fetcher.iter_fetch(parallel=False):
+        fetcher.mark_processed([article["id"]])  # e.g. saved before the feed is fully read
+    assert fetcher.pending_polls() == []
+    assert _committed(fetcher)
+
+
+def test_failed_summarization_keeps_the_watermark(fetcher, tmp_path, monkeypatch):
+    path = str(tmp_path / "articles.db")
+    conn = connect(path)
+    migrate_sqlite(conn)
+    conn.close()
+    writer = ArticleWriter(path=path)
+    monkeypatch.setattr(db, "_article_writer", writer)
+    monkeypatch.setattr(agents, "init_db", lambda: None)
+    monkeypatch.setattr(agents, "Fetcher", lambda known_ids=None: fetcher)
+    monkeypatch.setattr(agents, "filter_articles_batch",
+                        lambda articles, **kwargs: [dict(a, categories=["AI"]) for a in articles])
+
+    def broken(articles, **kwargs):
+        raise RuntimeError("summarizer crashed")
+
+    monkeypatch.setattr(agents, "summarize_articles_batch", broken)
+    with pytest.raises(RuntimeError):
+        agents.run_sequential_pipeline(skip_known=False, cluster_stories=False)
+
+    # Nothing saved: the feed is due, fetched unconditionally and read from the top again
+    assert not _committed(fetcher)
+    assert fetcher.feed_state.is_due(FEED)
+    assert fetcher.http_cache.request_headers(FEED) == {}
+
+    monkeypatch.setattr(agents, "summarize_articles_batch",
+                        lambda articles, **kwargs: [dict(a, summary="Summary.") for a in articles])
+    agents.run_sequential_pipeline(skip_known=False, cluster_stories=False)
+    writer.close()
+
+    assert _committed(fetcher)
+    assert fetcher.http_cache.request_headers(FEED) == {"If-None-Match": '"v1"'}
+    assert connect(path).execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
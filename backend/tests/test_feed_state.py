@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+pytest.importorskip("feedparser")
+
+from src.fetcher.feed_state import FeedStateStore, MAX_POLL_S, MIN_POLL_S
+from src.fetcher.fetcher import Fetcher
+
+FEED = "https://example.com/feed"
+DAY = 86400
+
+
+def _entry(name, ts=None):
+    entry = {"title": name, "link": f"https://example.com/{name}"}
+    if ts is not None:
+        entry["published_parsed"] = time.gmtime(ts)
+    return entry
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    fetcher = Fetcher(use_http_cache=False, use_feed_state=False)
+    fetcher.feed_state = FeedStateStore(str(tmp_path / "feed_state.db"))
+    return fetcher
+
+
+def _titles(entries):
+    return [e["title"] for e in entries]
+
+
+def test_first_poll_keeps_every_entry(fetcher):
+    entries = [_entry("b", 2 * DAY), _entry("a", DAY)]
+    assert _titles(fetcher._entries_above_watermark(FEED, entries)) == ["b", "a"]
+
+
+def test_reading_stops_at_the_last_processed_entry(fetcher):
+    fetcher._record_poll(FEED, [_entry("b", 2 * DAY), _entry("a", DAY)])
+    entries = [_entry("d", 4 * DAY), _entry("c", 3 * DAY), _entry("b", 2 * DAY), _entry("a", DAY)]
+    assert _titles(fetcher._entries_above_watermark(FEED, entries)) == ["d", "c"]
+
+
+def test_backdated_and_same_time_entries_are_kept(fetcher):
+    fetcher._record_poll(FEED, [_entry("b", 2 * DAY)])
+    entries = [_entry("backdated", DAY), _entry("same-time", 2 * DAY), _entry("undated"), _entry("b", 2 * DAY)]
+    assert _titles(fetcher._entries_above_watermark(FEED, entries)) == ["backdated", "same-time", "undated"]
+
+
+def test_unsorted_feed_stops_at_its_previous_top_entry(fetcher):
+    # The newest entry isn't listed first; the watermark is still the top entry
+    fetcher._record_poll(FEED, [_entry("b", DAY), _entry("a", 3 * DAY)])
+    entries = [_entry("c", 2 * DAY), _entry("b", DAY), _entry("a", 3 * DAY)]
+    assert _titles(fetcher._entries_above_watermark(FEED, entries)) == ["c"]
+
+
+def test_falls_back_to_publish_time_when_watermark_entry_is_gone(fetcher):
+    fetcher._record_poll(FEED, [_entry("b", 2 * DAY)])
+    entries = [_entry("d", 3 * DAY), _entry("tie", 2 * DAY), _entry("old", DAY), _entry("undated")]
+    assert _titles(fetcher._entries_above_watermark(FEED, entries)) == ["d", "tie", "undated"]
+
+
+def test_poll_schedule_backs_off_when_nothing_is_new(tmp_path):
+    store = FeedStateStore(str(tmp_path / "feed_state.db"))
+    now = 100 * DAY
+    store.record_poll(FEED, [("c", now - 2 * 3600), ("b", now - 4 * 3600), ("a", now - 6 * 3600)], now=now)
+    assert not store.is_due(FEED, now=now + 3599)
+    assert store.is_due(FEED, now=now + 3600)  # half the 2h gap, floored at MIN_POLL_S
+
+    for _ in range(10):
+        store.record_poll(FEED, [], now=now)
+    delay = store._row(FEED)[5] - now
+    assert MIN_POLL_S <= delay <= MAX_POLL_S
+    assert delay == 8 * 3600
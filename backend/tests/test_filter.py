@@ -0,0 +1,76 @@
+import pytest
+
+from src.agents import filter as flt
+
+
+class FakeClassifier:
+    """Scores a label 0.9 when its name appears in the text, else 0.1."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, candidate_labels, multi_label=False):
+        self.calls.append({"labels": list(candidate_labels), "multi_label": multi_label})
+        results = []
+        for text in texts:
+            scores = [0.9 if label in text else 0.1 for label in candidate_labels]
+            if not multi_label:
+                total = sum(scores)
+                scores = [s / total for s in scores]
+            ranked = sorted(zip(candidate_labels, scores), key=lambda p: -p[1])
+            results.append({"labels": [l for l, _ in ranked], "scores": [s for _, s in ranked]})
+        return results
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    fake = FakeClassifier()
+    monkeypatch.setattr(flt, "load_zero_shot_classifier", lambda backend=None: fake)
+    monkeypatch.setattr(flt, "shortlist_labels", lambda texts, labels, top_k: [labels[:top_k] for _ in texts])
+    return fake
+
+
+LABELS = ["Funding", "Hardware", "Policy", "Education"]
+
+
+def test_fast_mode_scores_labels_independently(classifier):
+    text = "Funding and Hardware news " * 5
+    result = flt._classify_texts([text], LABELS, mode="fast", top_k=3)[0]
+
+    assert classifier.calls == [{"labels": sorted(LABELS[:3]), "multi_label": True}]
+    # Independent scores: pruning Education doesn't inflate the others
+    assert dict(zip(result["labels"], result["scores"])) == {"Funding": 0.9, "Hardware": 0.9, "Policy": 0.1}
+
+
+def test_fast_mode_classifies_a_batch_in_one_call(classifier, monkeypatch):
+    shortlists = [["Funding", "Hardware"], ["Policy", "Funding"], ["Hardware", "Education"], ["Policy", "Hardware"]]
+    monkeypatch.setattr(flt, "shortlist_labels", lambda texts, labels, top_k: shortlists[:len(texts)])
+    texts = ["Funding round", "Policy update", "Education tech", "Hardware policy"]
+
+    results = flt._classify_texts(texts, LABELS, mode="fast", top_k=2)
+
+    assert classifier.calls == [{"labels": LABELS, "multi_label": True}]
+    assert [sorted(r["labels"]) for r in results] == [sorted(s) for s in shortlists]
+    assert dict(zip(results[2]["labels"], results[2]["scores"])) == {"Education": 0.9, "Hardware": 0.1}
+
+
+def test_exhaustive_mode_uses_single_label_softmax(classifier):
+    flt._classify_texts(["Funding " * 20], LABELS, mode="exhaustive")
+    assert classifier.calls[0]["multi_label"] is False
+
+
+def test_default_threshold_follows_mode(classifier):
+    articles = [{"title": "t", "text": "Funding and Hardware news " * 5}]
+    fast = flt.filter_articles_batch([dict(a) for a in articles], candidate_labels=LABELS, mode="fast", top_k=3,
+                                     use_cache=False)
+    assert fast[0]["categories"] == ["Funding", "Hardware"]
+
+    # Softmax over all four labels gives Funding and Hardware 0.45 each, under 0.5
+    exhaustive = flt.filter_articles_batch([dict(a) for a in articles], candidate_labels=LABELS, mode="exhaustive",
+                                           use_cache=False)
+    assert exhaustive == []
+
+
+def test_default_threshold_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        flt.default_threshold("approximate")
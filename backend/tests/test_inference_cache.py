@@ -0,0 +1,45 @@
+import sqlite3
+
+from src.db import cache as cache_module
+from src.db.cache import InferenceCache, make_cache_key
+
+
+def test_cache_key_depends_on_text_model_and_params():
+    key = make_cache_key("summary", "text", "bart", {"max_length": 150})
+    assert key == make_cache_key("summary", "text", "bart", {"max_length": 150})
+    assert key != make_cache_key("summary", "text!", "bart", {"max_length": 150})
+    assert key != make_cache_key("summary", "text", "bart@onnx", {"max_length": 150})
+    assert key != make_cache_key("summary", "text", "bart", {"max_length": 130})
+
+
+def test_put_get_and_lru_eviction(tmp_path):
+    cache = InferenceCache(path=str(tmp_path / "cache.db"), max_entries=2)
+    cache.put("summary", "a", "A")
+    cache.put("summary", "b", "B")
+    assert cache.get("summary", "a") == "A"  # a is now the most recently used
+    cache.put("summary", "c", "C")
+
+    assert cache.get_many("summary", ["a", "b", "c"]) == {"a": "A", "c": "C"}
+    assert cache.evictions == 1
+
+
+def test_locked_database_degrades_to_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "BUSY_TIMEOUT_S", 0.05)
+    path = str(tmp_path / "cache.db")
+    cache = InferenceCache(path=path)
+    cache.put("summary", "a", "A")
+
+    # Another worker process holding the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        cache.put("summary", "b", "B")  # does not raise
+        assert cache.get("summary", "a") == "A"  # reads still work in WAL mode
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert cache.errors == 2
+    assert cache.get("summary", "b") is None
+    cache.put("summary", "b", "B")
+    assert cache.get("summary", "b") == "B"
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+
+import pytest
+
+from src.db.migrations import SQLITE_MIGRATIONS, migrate_sqlite, published_to_epoch
+
+LATEST = max(version for version, _, _ in SQLITE_MIGRATIONS)
+
+# articles as created by the original init_db, before any migration
+BASELINE_SCHEMA = """
+    CREATE TABLE articles(
+        id TEXT PRIMARY KEY,
+        title TEXT,
+        link TEXT,
+        text TEXT,
+        published TEXT,
+        source TEXT,
+        categories TEXT,
+        summary TEXT
+    )
+"""
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Tue, 10 Jun 2025 14:30:00 GMT", 1749565800),
+    ("Tue, 10 Jun 2025 16:30:00 +0200", 1749565800),
+    ("2025-06-10T14:30:00Z", 1749565800),
+    ("2025-06-10T16:30:00+02:00", 1749565800),
+    ("2025-06-10T14:30:00", 1749565800),  # naive = UTC
+    ("2025-06-10", 1749513600),
+    ("not a date", None),
+    ("", None),
+    (None, None),
+])
+def test_published_to_epoch(value, expected):
+    assert published_to_epoch(value) == expected
+
+
+@pytest.fixture
+def baseline_db(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "articles.db"))
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+        ("a1", "Chip startup raises funding", "l1", "A hardware company closed a round.",
+         "Tue, 10 Jun 2025 14:30:00 GMT", "Wire", json.dumps(["Hardware", "Funding"]), "Funding news."),
+        ("a2", "New policy on models", "l2", "Regulators published guidance.",
+         "2025-06-11T09:00:00Z", "Paper", json.dumps(["Policy"]), ""),
+        ("a3", "Undated", "l3", "Body", "yesterday", "Wire", "not json", None),
+    ])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_migrates_baseline_schema_to_latest(baseline_db):
+    assert migrate_sqlite(baseline_db) == LATEST
+    assert baseline_db.execute("PRAGMA user_version").fetchone()[0] == LATEST
+
+    columns = {row[1] for row in baseline_db.execute("PRAGMA table_info(articles)")}
+    assert {"cluster_id", "published_ts", "synced_at"} <= columns
+
+    ts = dict(baseline_db.execute("SELECT id, published_ts FROM articles"))
+    assert ts == {"a1": 1749565800, "a2": 1749632400, "a3": None}
+
+    categories = sorted(baseline_db.execute("SELECT article_id, category FROM article_categories"))
+    assert categories == [("a1", "Funding"), ("a1", "Hardware"), ("a2", "Policy")]
+
+    # Existing rows have never been synced
+    assert baseline_db.execute("SELECT COUNT(*) FROM articles WHERE synced_at IS NULL").fetchone()[0] == 3
+
+    # Existing rows are in the full-text index
+    hits = [r[0] for r in baseline_db.execute(
+        "SELECT a.id FROM articles_fts f JOIN articles a ON a.seq = f.rowid WHERE articles_fts MATCH 'regulator*'")]
+    assert hits == ["a2"]
+
+
+def test_migrating_twice_is_a_no_op(baseline_db):
+    migrate_sqlite(baseline_db)
+    assert migrate_sqlite(baseline_db) == LATEST
+    assert baseline_db.execute("SELECT COUNT(*) FROM article_categories").fetchone()[0] == 3
+
+
+def test_fresh_database(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "fresh.db"))
+    assert migrate_sqlite(conn) == LATEST
+    assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 0
+    conn.close()
+
+
+def test_triggers_track_changes(baseline_db):
+    migrate_sqlite(baseline_db)
+    with baseline_db:
+        baseline_db.execute("UPDATE articles SET synced_at = 1")
+        baseline_db.execute("UPDATE articles SET title = 'Quantum chip startup' WHERE id = 'a1'")
+        baseline_db.execute("DELETE FROM articles WHERE id = 'a2'")
+
+    unsynced = [r[0] for r in baseline_db.execute("SELECT id FROM articles WHERE synced_at IS NULL")]
+    assert unsynced == ["a1"]
+    assert baseline_db.execute(
+        "SELECT COUNT(*) FROM article_categories WHERE article_id = 'a2'").fetchone()[0] == 0
+    assert baseline_db.execute(
+        "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'quantum'").fetchone()[0] == 1
+    assert baseline_db.execute(
+        "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'regulators'").fetchone()[0] == 0
+
+
+def test_full_text_index_survives_vacuum(baseline_db):
+    migrate_sqlite(baseline_db)
+    with baseline_db:
+        # Leave a gap in the rowids, which VACUUM may close for tables without an alias
+        baseline_db.execute("DELETE FROM articles WHERE id = 'a1'")
+        baseline_db.execute("INSERT INTO articles(id, title, text) VALUES ('a4', 'Quantum networking', 'Body')")
+    baseline_db.execute("VACUUM")
+
+    def match(query):
+        return [r[0] for r in baseline_db.execute(
+            "SELECT a.id FROM articles_fts f JOIN articles a ON a.seq = f.rowid WHERE articles_fts MATCH ?",
+            (query,))]
+
+    assert match("quantum") == ["a4"]
+    assert match("regulator*") == ["a2"]
+    baseline_db.execute("INSERT INTO articles_fts(articles_fts) VALUES ('integrity-check')")
+
+
+def test_failed_migration_rolls_back(baseline_db):
+    def boom(conn):
+        raise RuntimeError("boom")
+
+    migrations = SQLITE_MIGRATIONS[:1] + [(2, "broken", ["ALTER TABLE articles ADD COLUMN extra TEXT", boom])]
+    with pytest.raises(RuntimeError):
+        migrate_sqlite(baseline_db, migrations)
+
+    assert baseline_db.execute("PRAGMA user_version").fetchone()[0] == 1
+    columns = {row[1] for row in baseline_db.execute("PRAGMA table_info(articles)")}
+    assert "extra" not in columns
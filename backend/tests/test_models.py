@@ -0,0 +1,155 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from src import models
+from src.models import ModelRegistry, _process_rss_mb
+
+
+def _registry(builds):
+    def build(device, dtype, backend):
+        builds.append((device, dtype, backend))
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry()
+    registry._builders = {"summarizer": build}
+    return registry
+
+
+def test_concurrent_get_loads_once():
+    builds = []
+    registry = _registry(builds)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("summarizer", device="cpu")))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(builds) == 1
+    assert len({id(m) for m in results}) == 1
+
+
+def test_acquire_counts_uses_across_threads():
+    registry = _registry([])
+    threads = [threading.Thread(target=lambda: [registry.acquire("summarizer", device="cpu") for _ in range(50)])
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert registry.stats()[0]["uses"] == 200
+
+
+def test_unload_evicts_model_and_stats():
+    builds = []
+    registry = _registry(builds)
+    registry.get("summarizer", device="cpu")
+    registry.unload("summarizer")
+
+    assert not registry.is_loaded("summarizer", device="cpu")
+    assert registry.stats() == []
+    registry.get("summarizer", device="cpu")
+    assert len(builds) == 2
+
+
+def test_unload_keeps_key_locks():
+    builds = []
+    registry = _registry(builds)
+    registry.get("summarizer", device="cpu")
+    key = registry._key("summarizer", device="cpu")
+    lock = registry._key_lock(key)
+
+    with lock:  # e.g. acquire() counting a use while another thread unloads
+        registry.unload("summarizer")
+        assert registry._key_lock(key) is lock
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("summarizer", device="cpu")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(builds) == 2
+    assert len({id(m) for m in results}) == 1
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_process_rss_is_current_not_peak():
+    before = _process_rss_mb()
+    block = bytearray(64 * 1024 * 1024)
+    block[::4096] = b"x" * len(block[::4096])  # touch every page
+    during = _process_rss_mb()
+    del block
+    after = _process_rss_mb()
+
+    assert during - before > 32
+    assert after < during
+
+
+class FakeOnnxModel:
+    exports = []
+
+    def __init__(self, source):
+        self.source = source
+
+    @classmethod
+    def from_pretrained(cls, model_id, export=False, provider=None):
+        if export:
+            cls.exports.append(model_id)
+            time.sleep(0.05)
+        return cls(model_id)
+
+    def save_pretrained(self, directory):
+        with open(os.path.join(directory, "model.onnx"), "w") as f:
+            f.write(self.source)
+
+
+class FakeTokenizer(FakeOnnxModel):
+    def save_pretrained(self, directory):
+        with open(os.path.join(directory, "tokenizer.json"), "w") as f:
+            f.write("{}")
+
+
+@pytest.fixture
+def onnx_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, "ONNX_CACHE_DIR", str(tmp_path / "onnx"))
+    monkeypatch.setattr("transformers.AutoTokenizer", FakeTokenizer, raising=False)
+    FakeOnnxModel.exports = []
+    return tmp_path / "onnx"
+
+
+def test_concurrent_onnx_loads_export_once(onnx_cache):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(models._load_onnx_model(FakeOnnxModel, "org/model")))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    export_dir = models._onnx_export_dir("org/model")
+    assert FakeOnnxModel.exports == ["org/model"]
+    assert [model.source for model, _ in results] == [export_dir] * 4
+    assert sorted(os.listdir(export_dir)) == ["model.onnx", "tokenizer.json"]
+    assert not [n for n in os.listdir(onnx_cache) if n.startswith(".tmp-")]
+
+
+def test_onnx_export_that_loses_the_rename_race_uses_the_winner(onnx_cache):
+    export_dir = models._onnx_export_dir("org/model")
+    os.makedirs(export_dir)
+    with open(os.path.join(export_dir, "model.onnx"), "w") as f:
+        f.write("winner")
+
+    models._export_onnx(FakeOnnxModel, "org/model", export_dir)
+
+    with open(os.path.join(export_dir, "model.onnx")) as f:
+        assert f.read() == "winner"
+    assert not [n for n in os.listdir(onnx_cache) if n.startswith(".tmp-")]
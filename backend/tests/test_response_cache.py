@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "api")
+sys.path.insert(0, API_DIR)
+try:
+    from response_cache import CachedResponse, ResponseCache
+finally:
+    sys.path.remove(API_DIR)
+
+
+def test_concurrent_misses_share_one_load():
+    async def go():
+        cache = ResponseCache()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return CachedResponse(b"[]")
+
+        results = await asyncio.gather(*(cache.get_or_load("articles", loader) for _ in range(5)))
+        return calls, results, cache.stats()
+
+    calls, results, stats = asyncio.run(go())
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
+    assert (stats["misses"], stats["coalesced"]) == (1, 4)
+
+
+def test_request_after_invalidate_does_not_join_an_older_load():
+    async def go():
+        cache = ResponseCache()
+        release = asyncio.Event()
+        versions = iter([b"before sync", b"after sync"])
+
+        async def loader():
+            body = next(versions)
+            if body == b"before sync":
+                await release.wait()
+            return CachedResponse(body)
+
+        early = asyncio.ensure_future(cache.get_or_load("articles", loader))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        # Joining the older load would block until `release`
+        late = await asyncio.wait_for(cache.get_or_load("articles", loader), timeout=1)
+        release.set()
+        stale = await early
+        cached = await cache.get_or_load("articles", loader)
+        return stale.body, late.body, cached.body
+
+    assert asyncio.run(go()) == (b"before sync", b"after sync", b"after sync")
@@ -0,0 +1,84 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from src.db.db import ArticleWriter, connect
+from src.db.migrations import migrate_sqlite
+from src.db.snapshots import read_manifest, snapshot_article_ids, write_snapshots
+
+
+def _db(tmp_path, articles):
+    path = str(tmp_path / "articles.db")
+    conn = connect(path)
+    migrate_sqlite(conn)
+    conn.close()
+    with ArticleWriter(path=path) as writer:
+        writer.write(articles)
+    return path
+
+
+def _mark_synced(path, ids=None):
+    conn = connect(path)
+    with conn:
+        if ids is None:
+            conn.execute("UPDATE articles SET synced_at = 1")
+        else:
+            conn.executemany("UPDATE articles SET synced_at = 1 WHERE id = ?", [(i,) for i in ids])
+    conn.close()
+
+
+def _page(directory, manifest, view, number=1):
+    with open(os.path.join(directory, manifest["views"][view][number - 1]["file"]), "rb") as f:
+        return json.load(f)
+
+
+def _article(i, published_ts, categories=("AI",)):
+    published = datetime.fromtimestamp(published_ts, timezone.utc).isoformat() if published_ts is not None else ""
+    return {"id": f"a{i}", "title": f"Article {i}", "published": published, "categories": list(categories)}
+
+
+def test_only_synced_articles_are_listed(tmp_path):
+    path = _db(tmp_path, [_article(1, 100), _article(2, 200, ["Policy"]), _article(3, 300)])
+    _mark_synced(path, ["a1", "a2"])
+    out = str(tmp_path / "snapshots")
+
+    manifest = write_snapshots(path, out, page_size=2, pages=2)
+
+    assert [c["id"] for c in _page(out, manifest, "all")] == ["a2", "a1"]
+    assert set(manifest["views"]) == {"all", "category:AI", "category:Policy"}
+    assert [c["id"] for c in _page(out, manifest, "category:AI")] == ["a1"]
+    assert snapshot_article_ids(out) == ["a1", "a2"]
+
+
+def test_pages_match_api_order_and_cursor(tmp_path):
+    path = _db(tmp_path, [_article(1, None), _article(2, 200), _article(3, 200), _article(4, 100)])
+    _mark_synced(path)
+    out = str(tmp_path / "snapshots")
+
+    manifest = write_snapshots(path, out, page_size=2, pages=2)
+
+    # published_ts DESC NULLS LAST, id DESC
+    assert [c["id"] for c in _page(out, manifest, "all", 1)] == ["a3", "a2"]
+    assert [c["id"] for c in _page(out, manifest, "all", 2)] == ["a4", "a1"]
+    assert manifest["views"]["all"][0]["last"] == [200, "a2"]
+
+
+def test_version_bumps_only_on_change_and_old_files_are_pruned(tmp_path):
+    path = _db(tmp_path, [_article(1, 100)])
+    _mark_synced(path)
+    out = str(tmp_path / "snapshots")
+
+    first = write_snapshots(path, out)
+    assert write_snapshots(path, out)["version"] == first["version"]
+
+    for i, ts in ((2, 200), (3, 300)):
+        with ArticleWriter(path=path) as writer:
+            writer.write([_article(i, ts)])
+        _mark_synced(path)
+        latest = write_snapshots(path, out)
+
+    assert latest["version"] == first["version"] + 2
+    assert read_manifest(out) == latest
+    # Files of the current and previous manifest survive, older ones are pruned
+    first_files = {e["file"] for entries in first["views"].values() for e in entries}
+    assert not first_files & set(os.listdir(out))
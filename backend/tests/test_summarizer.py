@@ -0,0 +1,63 @@
+import re
+
+from src.agents.summarizer import _length_buckets, _truncate_to_tokens
+
+
+class WhitespaceTokenizer:
+    """One token per whitespace-separated word, with character offsets."""
+
+    def __call__(self, texts, add_special_tokens=False, return_offsets_mapping=True, verbose=False):
+        offsets = [[m.span() for m in re.finditer(r"\S+", t)] for t in texts]
+        return {"input_ids": [list(range(len(o))) for o in offsets], "offset_mapping": offsets}
+
+
+def _truncate(text, max_tokens):
+    texts, counts = _truncate_to_tokens(WhitespaceTokenizer(), [text], max_tokens)
+    return texts[0], counts[0]
+
+
+def test_short_text_is_untouched():
+    assert _truncate("One. Two three.", 10) == ("One. Two three.", 3)
+
+
+def test_cuts_at_sentence_end_in_the_tail_of_the_budget():
+    text = "word " * 90 + "End. " + "more " * 50
+    out, count = _truncate(text, 100)
+    assert out.endswith("End.")
+    assert count == 91
+
+
+def test_early_sentence_end_is_not_used():
+    # Regression: the only sentence end is at token 1 of 1022
+    text = "Hello. " + "word " * 2000
+    out, count = _truncate(text, 1022)
+    assert count == 1022
+    assert len(out.split()) == 1022
+
+
+def test_truncation_never_exceeds_budget():
+    text = " ".join(f"w{i}." if i % 7 == 0 else f"w{i}" for i in range(500))
+    for budget in (10, 64, 255):
+        out, count = _truncate(text, budget)
+        assert count <= budget
+        assert len(out.split()) == count
+
+
+def test_length_buckets_cover_every_index_once():
+    counts = [5, 900, 30, 400, 1000, 64, 70, 300]
+    batches = _length_buckets(counts, tokens_per_batch=2048, max_batch_size=4)
+    assert sorted(i for b in batches for i in b) == list(range(len(counts)))
+
+
+def test_length_buckets_respect_padded_budget_and_ratio():
+    counts = [10, 20, 60, 100, 130, 250, 500, 510, 1000, 1020]
+    batches = _length_buckets(counts, tokens_per_batch=1024, max_batch_size=16)
+    for batch in batches:
+        lengths = [counts[i] for i in batch]
+        assert len(batch) == 1 or len(batch) * max(lengths) <= 1024
+        assert max(lengths) <= 2.0 * max(min(lengths), 64)
+
+
+def test_length_buckets_cap_batch_size():
+    batches = _length_buckets([10] * 40, tokens_per_batch=100_000, max_batch_size=16)
+    assert [len(b) for b in batches] == [16, 16, 8]
@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("dotenv")
+
+from sync_to_supabase import _mark_synced, iter_unsynced_pages
+from src.db.migrations import migrate_sqlite
+
+
+@pytest.fixture
+def local_db(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "articles.db"))
+    migrate_sqlite(conn)
+    with conn:
+        conn.executemany("INSERT INTO articles(id, title, text) VALUES (?, ?, ?)",
+                         [(f"a{i}", f"Title {i}", "Body") for i in range(3)])
+    yield conn
+    conn.close()
+
+
+def unsynced(conn):
+    return [r[0] for r in conn.execute("SELECT id FROM articles WHERE synced_at IS NULL ORDER BY seq")]
+
+
+def test_marks_copied_rows_synced(local_db):
+    pages = list(iter_unsynced_pages(local_db, page_size=2))
+    assert [len(rows) for rows in pages] == [2, 1]
+    for rows in pages:
+        assert _mark_synced(local_db, rows) == len(rows)
+    assert unsynced(local_db) == []
+
+
+def test_row_changed_during_sync_stays_unsynced(local_db):
+    rows = next(iter_unsynced_pages(local_db))
+    # The pipeline rewrites a row after its page was copied to Postgres
+    with local_db:
+        local_db.execute("UPDATE articles SET title = 'Updated title' WHERE id = 'a1'")
+
+    assert _mark_synced(local_db, rows) == 2
+    assert unsynced(local_db) == ["a1"]
+
+    rows = next(iter_unsynced_pages(local_db))
+    assert [row[2:4] for row in rows] == [("a1", "Updated title")]
+    _mark_synced(local_db, rows)
+    assert unsynced(local_db) == []
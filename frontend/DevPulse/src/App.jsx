@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useMemo, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { ThemeProvider } from './context/ThemeContext';
-import { fetchArticles } from './api/articles';
+import { fetchArticles, fetchArticle, searchArticles } from './api/articles';
 import Header from './components/Header';
 import HomeHero from './components/HomeHero';
 import FeaturesSection from './components/FeaturesSection';
@@ -19,6 +19,10 @@ const CATEGORY_MAP = {
   'Patents': ['Patent']
 };
 
+// Wait for typing to pause before querying /search
+const SEARCH_DEBOUNCE_MS = 300;
+const SEARCH_LIMIT = 50;
+
 function App() {
   console.log('App component rendering...');
   
@@ -27,6 +31,7 @@ function App() {
   const [error, setError] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('All');
   const [searchTerm, setSearchTerm] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
   const [isMenuOpen, setIsMenuOpen] = useState(false);
   const [selectedArticle, setSelectedArticle] = useState(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
@@ -49,7 +54,7 @@ function App() {
       console.log('Loading articles...');
       setLoading(true);
       setError(null);
-      const data = await fetchArticles(50); // Fetch more for filtering
+      const data = await fetchArticles(1, 50); // Fetch more for filtering
       console.log('Articles loaded:', data?.length || 0);
       setArticles(data || []); // Ensure it's always an array
     } catch (err) {
@@ -62,9 +67,25 @@ function App() {
     }
   };
 
+  // Ranked full-text search (title, summary and body) on the server
+  useEffect(() => {
+    const term = searchTerm.trim();
+    setSearchResults(null);
+    if (!term) return;
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      const results = await searchArticles(term, { limit: SEARCH_LIMIT });
+      if (!cancelled) setSearchResults(results);
+    }, SEARCH_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm]);
+
   // Filter articles based on category and search
   const filteredArticles = useMemo(() => {
-    let filtered = [...articles];
+    let filtered = searchTerm && searchResults ? [...searchResults] : [...articles];
 
     // Filter by category
     if (selectedCategory !== 'All') {
@@ -88,27 +109,33 @@ function App() {
       });
     }
 
-    // Filter by search term
-    if (searchTerm) {
+    // Until the server results arrive, narrow the loaded cards locally
+    if (searchTerm && !searchResults) {
       const term = searchTerm.toLowerCase();
       filtered = filtered.filter(article => 
         article.title?.toLowerCase().includes(term) ||
         article.summary?.toLowerCase().includes(term) ||
-        article.text?.toLowerCase().includes(term) ||
         article.source?.toLowerCase().includes(term)
       );
     }
 
     return filtered;
-  }, [articles, selectedCategory, searchTerm]);
+  }, [articles, searchResults, selectedCategory, searchTerm]);
 
-  // Separate hero articles from grid articles
+  // Separate hero articles from grid articles; search results skip the hero
   const heroArticles = filteredArticles.slice(0, 4);
-  const gridArticles = filteredArticles.slice(4);
+  const gridArticles = searchTerm ? filteredArticles : filteredArticles.slice(4);
 
-  const handleCardClick = (article) => {
+  const handleCardClick = async (article) => {
     setSelectedArticle(article);
     setIsModalOpen(true);
+    // /articles returns cards without the body text; load the full article for the modal
+    if (article.text === undefined && article.id) {
+      const full = await fetchArticle(article.id);
+      if (full) {
+        setSelectedArticle(current => (current && current.id === article.id ? { ...current, ...full } : current));
+      }
+    }
   };
 
   const handleCloseModal = () => {
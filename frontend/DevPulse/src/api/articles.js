@@ -91,3 +91,78 @@ export async function fetchArticles(page = 1, limit = 20) {
     return [];
   }
 }
+
+/**
+ * Fetch one page of article cards using keyset pagination
+ * @param {string|null} cursor - Cursor from the previous page (null for the first page)
+ * @param {number} limit - Number of articles per page
+ * @returns {Promise<{articles: Array, nextCursor: string|null}>} - Cards and the cursor of the next page (null on the last page)
+ */
+export async function fetchArticlesPage(cursor = null, limit = 20) {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  const url = `${BASE_URL}/articles?${params}`;
+
+  try {
+    const res = await fetch(url, {
+      method: "GET",
+      headers: { "Content-Type": "application/json" },
+    });
+
+    if (!res.ok) {
+      const errorText = await res.text();
+      throw new Error(
+        `HTTP ${res.status} ${res.statusText}: ${errorText.slice(0, 200)}`
+      );
+    }
+
+    const data = await res.json();
+    return {
+      articles: Array.isArray(data) ? data : [],
+      nextCursor: res.headers.get("X-Next-Cursor"),
+    };
+  } catch (err) {
+    console.error("fetchArticlesPage error:", err.message || err);
+    return { articles: [], nextCursor: null };
+  }
+}
+
+/**
+ * Fetch a single article with its full text
+ * @param {string} id - Article id
+ * @returns {Promise<Object|null>} - Article, or null if not found
+ */
+export async function fetchArticle(id) {
+  try {
+    const res = await fetch(`${BASE_URL}/articles/${encodeURIComponent(id)}`);
+    if (res.status === 404) return null;
+    if (!res.ok) throw new Error(`HTTP ${res.status} ${res.statusText}`);
+    return await res.json();
+  } catch (err) {
+    console.error("fetchArticle error:", err.message || err);
+    return null;
+  }
+}
+
+/**
+ * Full-text search over title, summary and text
+ * @param {string} q - Search query
+ * @param {Object} options - { category, since, until (YYYY-MM-DD), page, limit }
+ * @returns {Promise<Array>} - Ranked results with a highlighted `snippet`
+ */
+export async function searchArticles(q, { category, since, until, page = 1, limit = 20 } = {}) {
+  const params = new URLSearchParams({ q, page: String(page), limit: String(limit) });
+  if (category && category !== "All") params.set("category", category);
+  if (since) params.set("since", since);
+  if (until) params.set("until", until);
+
+  try {
+    const res = await fetch(`${BASE_URL}/search?${params}`);
+    if (!res.ok) throw new Error(`HTTP ${res.status} ${res.statusText}`);
+    const data = await res.json();
+    return Array.isArray(data) ? data : [];
+  } catch (err) {
+    console.error("searchArticles error:", err.message || err);
+    return [];
+  }
+}
@@ -76,13 +76,13 @@
 
 import React, { useEffect, useState, useRef } from "react";
 import NewsCard from "./NewsCard";
-import { fetchArticles } from "../api/articles";
+import { fetchArticlesPage } from "../api/articles";
 
 const PAGE_SIZE = 20;
 
 const Articles = () => {
   const [articles, setArticles] = useState([]);
-  const [page, setPage] = useState(1);
+  const [cursor, setCursor] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [hasMore, setHasMore] = useState(true);
@@ -100,22 +100,22 @@ const Articles = () => {
     if (initialized.current) return;
     initialized.current = true;
 
-    console.log("🔹 Mounting fresh page=1");
-    loadArticles(1, true);
+    console.log("🔹 Mounting fresh first page");
+    loadArticles(null, true);
   }, []);
 
-  const loadArticles = async (currentPage, reset = false) => {
+  const loadArticles = async (pageCursor, reset = false) => {
     try {
       setLoading(true);
       setError(null);
 
-      const data = await fetchArticles(currentPage, PAGE_SIZE);
+      const { articles: data, nextCursor } = await fetchArticlesPage(pageCursor, PAGE_SIZE);
       if (reset) setArticles(data);
       else setArticles(prev => [...prev, ...data]);
 
-      if (!data || data.length < PAGE_SIZE) setHasMore(false);
-      else setHasMore(true);
-      setPage(currentPage);
+      // The API omits the cursor on the last page
+      setHasMore(Boolean(nextCursor));
+      setCursor(nextCursor);
     } catch (err) {
       console.error("Error loading articles:", err);
       setError("Failed to load articles.");
@@ -127,9 +127,8 @@ const Articles = () => {
 
   const handleLoadMore = () => {
     if (loading || !hasMore) return;
-    const nextPage = page + 1;
-    console.log("🔹 Loading next page:", nextPage);
-    loadArticles(nextPage);
+    console.log("🔹 Loading next page after:", cursor);
+    loadArticles(cursor);
   };
 
   if (loading && articles.length === 0)
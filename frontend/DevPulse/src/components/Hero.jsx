@@ -55,7 +55,7 @@ function Hero({ articles, onCardClick }) {
               <div className="hero-card-content">
                 <h3 className="hero-card-title">{article.title}</h3>
                 <p className="hero-card-summary">
-                  {article.summary || article.text?.substring(0, 150) + '...'}
+                  {article.summary || (article.text ? article.text.substring(0, 150) + '...' : '')}
                 </p>
                 <div className="hero-card-meta">
                   <span className="hero-card-source">{article.source}</span>
@@ -79,7 +79,7 @@ function NewsCard({ article, index, onCardClick }) {
       </div>
 
       <p className="news-card-summary">
-        {article.summary || article.text?.substring(0, 200) + '...'}
+        {article.summary || (article.text ? article.text.substring(0, 200) + '...' : '')}
       </p>
         
       <div className="news-card-footer">
@@ -123,7 +123,7 @@ function NewsCard({ article, index, onCardClick }) {
 
 {/* Summary */}
 <p className="news-card-summary">
-  {article.summary || article.text?.substring(0, 200) + "..."}
+  {article.summary || (article.text ? article.text.substring(0, 200) + "..." : "")}
 </p>
 
 {/* Footer */}